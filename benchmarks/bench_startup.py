@@ -0,0 +1,90 @@
+"""启动耗时：导入时间和第一道题出现在屏幕上的时间
+
+用法: python -m benchmarks.bench_startup [重复次数]
+每项测量都在新的子进程中进行（避免模块缓存），取最小值；超出预算时返回非零退出码。
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 预算（毫秒），不含解释器本身的启动时间
+BUDGET_MS = {
+    'import core': 80,
+    'import main': 100,
+    'first question': 800,
+}
+
+# 这些模块不能在导入 main 时被加载：界面和批量接口用到时才导入
+LAZY_MODULES = ('tkinter', 'PIL', 'numpy', 'ui.tkinter_ui')
+
+_IMPORT_CORE = """
+import time
+start = time.perf_counter()
+import core.generator, core.evaluator, core.adaptive, core.data_handler
+print((time.perf_counter() - start) * 1000)
+"""
+
+_IMPORT_MAIN = """
+import sys, time
+start = time.perf_counter()
+import main
+print((time.perf_counter() - start) * 1000)
+print(','.join(m for m in %r if m in sys.modules))
+""" % (LAZY_MODULES,)
+
+# 数据写到临时目录，不改动开发者本地 config/ 中的记录库、排行榜和作答记录
+_FIRST_QUESTION = """
+import shutil, tempfile, time
+config_dir = tempfile.mkdtemp(prefix='rjgc-bench-')
+try:
+    start = time.perf_counter()
+    import main
+    app = main.MathTrainerApp(config_dir=config_dir)
+    app.ui._start_practice()
+    app.ui.window.update()
+    print((time.perf_counter() - start) * 1000)
+    app.ui._on_close()
+finally:
+    shutil.rmtree(config_dir, ignore_errors=True)
+"""
+
+
+def _run(code):
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    # 界面会打印调试信息，测量结果在最后几行
+    return [line for line in result.stdout.splitlines() if not line.startswith('[')]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    repeat = int(argv[0]) if argv else 5
+    over_budget = False
+
+    timings = {}
+    timings['import core'] = min(float(_run(_IMPORT_CORE)[0]) for _ in range(repeat))
+    samples = [_run(_IMPORT_MAIN) for _ in range(repeat)]
+    timings['import main'] = min(float(lines[0]) for lines in samples)
+    loaded = samples[0][1] if len(samples[0]) > 1 else ''
+    if loaded:
+        print(f"[错误] 导入 main 时加载了: {loaded}")
+        over_budget = True
+    try:
+        timings['first question'] = min(float(_run(_FIRST_QUESTION)[-1]) for _ in range(repeat))
+    except RuntimeError as e:
+        print(f"[警告] 无法启动界面，跳过首题测量: {e}")
+
+    for name, elapsed in timings.items():
+        budget = BUDGET_MS[name]
+        status = "OK" if elapsed <= budget else "超出预算"
+        over_budget |= elapsed > budget
+        print(f"{name:<16} {elapsed:>8.1f} ms   预算 {budget} ms   {status}")
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""性能基准测试集：与仓库中保存的基线对比，发现性能回退
+
+用法:
+    python -m benchmarks.suite                 # 运行全部基准并与基线对比
+    python -m benchmarks.suite -k save_score   # 只运行 bench_save_score 这一组
+    python -m benchmarks.suite --update        # 把本次结果写入基线
+
+基线保存在 benchmarks/baseline.json。共享的测试机器速度会整体波动（同一段代码
+前后相差一倍也很常见），所以每轮测量前都紧挨着测一次固定的参考循环，对比的是
+「耗时 / 参考耗时」比值的中位数；耗时本身只用于显示。
+比值比基线大 threshold（默认 25%）以上时标记为回退，退出码为 1。
+换了测试机器或 Python 版本需要先用 --update 重新生成基线。
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from fractions import Fraction
+
+from core.data_handler import DataHandler
+from core.evaluator import Evaluator
+from core.generator import MathGenerator, OPERATORS
+from core.journal import Journal
+from core.leaderboard import Leaderboard
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+HISTORY_SIZES = (10, 1_000, 10_000, 100_000)
+# 这些项的耗时主要是 fsync，受磁盘影响波动大，回退阈值加倍
+IO_BOUND = ('save_score/', 'leaderboard_add/')
+
+
+def _reference():
+    """固定的纯 Python 参考循环，返回每次的耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(20):
+        sum(i * i for i in range(1000))
+    return (time.perf_counter() - start) / 20
+
+
+def _summarize(samples):
+    """samples 为 [(每次耗时, 参考耗时)]，返回 (最快耗时, 耗时/参考耗时 的中位数)"""
+    return min(t for t, _ in samples), statistics.median(t / ref for t, ref in samples)
+
+
+def _time(func, number, repeat=7):
+    """重复 repeat 轮、每轮调用 number 次，返回 (每次调用的最快耗时, 与参考循环的耗时比)"""
+    samples = []
+    for _ in range(repeat):
+        reference = _reference()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append(((time.perf_counter() - start) / number, reference))
+    return _summarize(samples)
+
+
+def bench_generate_question():
+    results = {}
+    for difficulty in (1, 2, 3):
+        for operator in OPERATORS:
+            generator = MathGenerator(difficulty=difficulty, seed=0)
+            generator.divisor_index  # 约数索引只在第一次用到时构建，不计入
+            results[f"generate_question/d{difficulty}/{operator}"] = _time(
+                lambda: generator.generate_question(operator), 500)
+    return results
+
+
+def bench_check_answer():
+    evaluator = Evaluator()
+    return {
+        'check_answer/int': _time(lambda: evaluator.check_answer("56", 56), 5000),
+        'check_answer/fraction': _time(lambda: evaluator.check_answer("3/4", Fraction(3, 4)), 5000),
+        'grade_batch/100k': _time(lambda: evaluator.grade_batch(['56'] * 100_000, [56] * 100_000), 1),
+    }
+
+
+def bench_save_score():
+    results = {}
+    record = {'date': '2024-03-04', 'user': '', 'difficulty': 1, 'total': 10, 'correct': 8, 'time_used': 50}
+    for size in HISTORY_SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            config_path = os.path.join(directory, 'settings.json')
+            Journal(os.path.join(directory, 'practice_history.jsonl')).extend([record] * size)
+            handler = DataHandler(config_path)  # 从日志建立 SQLite 记录库，不计入
+            results[f"save_score/history={size}"] = _time(lambda: handler.save_score(10, 8, 50), 10)
+            handler.store.close()
+    return results
+
+
+def bench_leaderboard():
+    results = {}
+    for size in (0, 10_000):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'leaderboard.jsonl')
+            Journal(path).extend(
+                [{'name': f"p{i}", 'score': i % 500, 'difficulty': "中等", 'date': '2024-03-04'}
+                 for i in range(size)])
+            board = Leaderboard(path)
+            results[f"leaderboard_add/entries={size}"] = _time(
+                lambda: board.add(250, name="p", difficulty="中等", date='2024-03-04'), 10)
+    return results
+
+
+def bench_startup():
+    from benchmarks import bench_startup as startup
+
+    def measure(code, line, repeat):
+        # 每次都在新的子进程中运行，取子进程打印的耗时（毫秒）
+        return _summarize([(float(startup._run(code)[line]) / 1000, _reference()) for _ in range(repeat)])
+
+    results = {
+        'startup/import_core': measure(startup._IMPORT_CORE, 0, 5),
+        'startup/import_main': measure(startup._IMPORT_MAIN, 0, 5),
+    }
+    try:
+        results['startup/first_question'] = measure(startup._FIRST_QUESTION, -1, 3)
+    except RuntimeError as e:
+        print(f"[警告] 无法启动界面，跳过首题测量: {e}")
+    return results
+
+
+BENCHMARKS = (bench_generate_question, bench_check_answer, bench_save_score,
+              bench_leaderboard, bench_startup)
+
+
+def compare(results, baseline, threshold):
+    """与基线对比，返回 [(名称, 耗时, 耗时比相对基线的变化或 None, 是否回退)]"""
+    base_ratios = baseline.get('ratios', {})
+    rows = []
+    for name, (elapsed, ratio) in results.items():
+        base = base_ratios.get(name)
+        change = None if base is None else ratio / base - 1
+        limit = threshold * 2 if name.startswith(IO_BOUND) else threshold
+        rows.append((name, elapsed, change, change is not None and change > limit))
+    return rows
+
+
+def _format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds * 1e6:9.2f} µs"
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'seconds': {}, 'ratios': {}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="性能基准测试")
+    parser.add_argument('-k', dest='pattern', default='', help="只运行函数名包含该字符串的基准组")
+    parser.add_argument('--threshold', type=float, default=0.25, help="判定为回退的变慢比例")
+    parser.add_argument('--update', action='store_true', help="把本次结果写入基线")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="基线文件路径")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for bench in BENCHMARKS:
+        if args.pattern and args.pattern not in bench.__name__:
+            continue
+        results.update(bench())
+
+    baseline = load_baseline(args.baseline)
+    rows = compare(results, baseline, args.threshold)
+    for name, elapsed, change, regressed in rows:
+        change = "     (无基线)" if change is None else f"{change * 100:+8.1f}%"
+        note = "  <-- 回退" if regressed else ""
+        if name == 'generate_question/d3//':
+            note += "  (困难除法：约数抽取路径)"
+        print(f"{name:<34} {_format_time(elapsed)} {change}{note}")
+
+    if args.update:
+        baseline.setdefault('seconds', {}).update({name: value[0] for name, value in results.items()})
+        baseline.setdefault('ratios', {}).update({name: value[1] for name, value in results.items()})
+        baseline['machine'] = f"{platform.system()} {platform.machine()}, Python {platform.python_version()}"
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"已更新基线: {args.baseline}")
+        return 0
+
+    regressions = [row[0] for row in rows if row[3]]
+    if regressions:
+        print(f"[警告] {len(regressions)} 项比基线慢 {args.threshold:.0%} 以上: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import random
+import threading
+from array import array
+
+from core.facts import get_space
+from core.expression import apply_operator
+
+
+class FenwickTree:
+    """树状数组：单点修改和按前缀和抽样都是 O(log n)"""
+
+    def __init__(self, size, initial=0.0):
+        self.size = size
+        # 所有元素相同时可直接 O(n) 建树：tree[i] 覆盖 lowbit(i) 个元素
+        self.tree = array('d', (initial * (i & -i) for i in range(size + 1)))
+        self.tree[0] = 0.0
+        self.total = initial * size
+        self._top = 1 << size.bit_length()
+
+    def add(self, index, delta):
+        """第 index 个元素（从 0 开始）加上 delta"""
+        tree = self.tree
+        i = index + 1
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+        self.total += delta
+
+    def find(self, target):
+        """返回前缀和首次超过 target 的元素下标，用于按权重抽样"""
+        tree = self.tree
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return min(pos, self.size - 1)
+
+
+class _OperatorStats:
+    """单个运算符的题目空间、作答统计和抽样权重"""
+
+    def __init__(self, space, initial_weight):
+        self.space = space
+        size = self.space.size
+        self.tree = FenwickTree(size, initial_weight)
+        self.attempts = array('H', bytes(2 * size))
+        self.errors = array('H', bytes(2 * size))
+        self.latency = array('f', bytes(4 * size))  # 用时的指数滑动平均（秒）
+
+
+class AdaptiveSelector:
+    """按掌握程度自适应出题
+
+    为每道题 (a, op, b) 记录作答次数、错误次数和平均用时，按"需要练习的程度"
+    作为权重抽题：错得多、答得慢的题出现得更频繁。权重保存在树状数组中，
+    记录一次作答和抽一道题都是 O(log n)，统计数据全部存放在定长 array 中。
+    """
+
+    def __init__(self, number_range=None, target_latency=5.0, seed=None, spaces=None):
+        # spaces 为 {运算符: 题目空间}（例如难度配置编译出的空间），不提供时按 number_range 建立
+        self.number_range = number_range
+        self.spaces = spaces
+        self.target_latency = target_latency  # 期望的单题用时（秒）
+        self.rng = random.Random(seed)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def weight(self, attempts, errors, latency):
+        """题目的练习需求：平滑后的错误率 x 用时因子"""
+        error_rate = (errors + 1) / (attempts + 2)
+        slowness = min(latency / self.target_latency, 4.0) if attempts else 1.0
+        return error_rate * (0.5 + slowness)
+
+    def _get_stats(self, operator):
+        stats = self._stats.get(operator)
+        if stats is None:
+            # 首次用到某个运算符时才建立它的题目空间
+            stats = _OperatorStats(get_space(operator, self.number_range, self.spaces), self.weight(0, 0, 0.0))
+            self._stats[operator] = stats
+        return stats
+
+    def next_question(self, operator='+'):
+        """按练习需求抽取一道 operator 的题目"""
+        with self._lock:
+            stats = self._get_stats(operator)
+            index = stats.tree.find(self.rng.random() * stats.tree.total)
+        a, b = stats.space.fact(index)
+        return {
+            'question': f"{a} {operator} {b} = ?",
+            'answer': apply_operator(operator, a, b),
+            'a': a,
+            'operator': operator,
+            'b': b
+        }
+
+    def record(self, a, operator, b, correct, latency):
+        """记录一次作答并更新该题的权重"""
+        with self._lock:
+            stats = self._get_stats(operator)
+            try:
+                index = stats.space.index(a, b)
+            except ValueError:
+                return  # 不在当前题目空间内（例如切换了难度）
+            attempts, errors = stats.attempts[index], stats.errors[index]
+            old_weight = self.weight(attempts, errors, stats.latency[index])
+
+            if attempts < 0xFFFF:
+                stats.attempts[index] = attempts + 1
+                if not correct:
+                    stats.errors[index] = errors + 1
+            previous = stats.latency[index]
+            stats.latency[index] = latency if attempts == 0 else 0.7 * previous + 0.3 * latency
+
+            new_weight = self.weight(stats.attempts[index], stats.errors[index], stats.latency[index])
+            stats.tree.add(index, new_weight - old_weight)
+
+    def mastery(self, a, operator, b):
+        """返回 (作答次数, 错误次数, 平均用时)"""
+        stats = self._get_stats(operator)
+        index = stats.space.index(a, b)
+        return stats.attempts[index], stats.errors[index], stats.latency[index]
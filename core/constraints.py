@@ -0,0 +1,149 @@
+"""按条件出题：进位、退位、答案范围、操作数位数等，不靠反复重试
+
+每个条件（谓词）在某个运算符的 FactSpace 上预先算出一张 0/1 掩码（每道题一个字节），
+条件组合的掩码按位与之后压缩成满足条件的题目编号数组，按组合缓存。
+之后每次出题只是从编号数组中随机取一个，耗时与条件的稀有程度无关。
+
+    generator = ConstrainedGenerator(difficulty=2)
+    generator.generate_question('+', [digits(2), CARRY])        # 两位数进位加法
+    generator.generate_question('-', [BORROW])                  # 退位减法
+    generator.generate_question('*', [answer_between(0, 99)])   # 积小于 100
+"""
+import threading
+from array import array
+from collections import namedtuple
+from itertools import compress
+
+from core.expression import apply_operator
+from core.facts import get_space
+from core.generator import MathGenerator
+
+# name 用作缓存键，operators 为适用的运算符（None 表示全部），test(a, b, 答案) 返回是否满足
+Predicate = namedtuple('Predicate', 'name operators test')
+
+
+_DIGIT_SUMS = array('H', [0])  # 数字和查表，按需扩展
+
+
+def _digit_sum(n):
+    global _DIGIT_SUMS
+    table = _DIGIT_SUMS
+    if n >= len(table):
+        # 建一张更大的新表再替换，其他线程读到的旧表仍然完整
+        table = array('H', table)
+        for i in range(len(table), 2 * n + 1):
+            table.append(table[i // 10] + i % 10)
+        _DIGIT_SUMS = table
+    return table[n]
+
+
+def carries(a, b):
+    """a + b 竖式计算中的进位次数：每次进位让数字和减少 9"""
+    return (_digit_sum(a) + _digit_sum(b) - _digit_sum(a + b)) // 9
+
+
+def borrows(a, b):
+    """a - b（a >= b）竖式计算中的退位次数，等于 b + (a - b) 的进位次数"""
+    return carries(b, a - b)
+
+
+CARRY = Predicate('carry', ('+',), lambda a, b, answer: carries(a, b) > 0)
+NO_CARRY = Predicate('no_carry', ('+',), lambda a, b, answer: carries(a, b) == 0)
+BORROW = Predicate('borrow', ('-',), lambda a, b, answer: borrows(a, b) > 0)
+NO_BORROW = Predicate('no_borrow', ('-',), lambda a, b, answer: borrows(a, b) == 0)
+
+
+def answer_between(low, high):
+    """答案在 [low, high] 之间"""
+    return Predicate(f"answer[{low},{high}]", None, lambda a, b, answer: low <= answer <= high)
+
+
+def digits(count):
+    """两个操作数都是 count 位数（0 算一位数）"""
+    low, high = (0 if count == 1 else 10 ** (count - 1)), 10 ** count - 1
+    return Predicate(f"digits={count}", None, lambda a, b, answer: low <= a <= high and low <= b <= high)
+
+
+class ConstraintIndex:
+    """一个运算符在给定数值范围（或题目空间 spaces）内的条件索引"""
+
+    def __init__(self, operator, number_range=None, spaces=None):
+        self.space = get_space(operator, number_range, spaces)
+        self.operator = operator
+        self._masks = {}    # 谓词名称 -> 掩码 (bytes)
+        self._indices = {}  # 谓词名称集合 -> 满足全部条件的题目编号 (array)
+        self._lock = threading.Lock()
+
+    def _mask(self, predicate):
+        mask = self._masks.get(predicate.name)
+        if mask is None:
+            if predicate.operators is not None and self.operator not in predicate.operators:
+                raise ValueError(f"条件 {predicate.name!r} 不适用于运算符 {self.operator!r}")
+            test, operator = predicate.test, self.operator
+            mask = self._masks[predicate.name] = bytes(
+                test(a, b, apply_operator(operator, a, b)) for a, b in self.space)
+        return mask
+
+    def indices(self, predicates):
+        """满足全部条件的题目编号数组"""
+        key = frozenset(predicate.name for predicate in predicates)
+        indices = self._indices.get(key)
+        if indices is None:
+            with self._lock:
+                indices = self._indices.get(key)
+                if indices is None:
+                    indices = self._indices[key] = self._build(predicates)
+        return indices
+
+    def _build(self, predicates):
+        size = self.space.size
+        if not predicates:
+            return range(size)
+        # 掩码每个字节是 0 或 1，转成大整数按位与就是逐字节的与运算
+        combined = -1
+        for predicate in predicates:
+            combined &= int.from_bytes(self._mask(predicate), 'little')
+        mask = combined.to_bytes(size, 'little')
+        return array('I' if size < 1 << 32 else 'Q', compress(range(size), mask))
+
+    def count(self, predicates):
+        return len(self.indices(predicates))
+
+    def sample(self, rng, predicates):
+        """O(1) 抽取一道满足全部条件的题目 (a, b)"""
+        indices = self.indices(predicates)
+        if not indices:
+            names = ', '.join(sorted(predicate.name for predicate in predicates))
+            raise ValueError(f"当前范围内没有满足条件的 {self.operator!r} 题目: {names}")
+        return self.space.fact(indices[int(rng.random() * len(indices))])
+
+
+class ConstrainedGenerator(MathGenerator):
+    """支持按条件出题的 MathGenerator，没有条件时与 MathGenerator 相同"""
+
+    def __init__(self, difficulty=1, number_range=None, seed=None):
+        super().__init__(difficulty, number_range, seed)
+        self._constraint_indexes = {}
+
+    def constraint_index(self, operator):
+        index = self._constraint_indexes.get(operator)
+        if index is None:
+            index = self._constraint_indexes[operator] = ConstraintIndex(
+                operator, self.number_range, self.spaces)
+        return index
+
+    def count(self, operator, constraints=()):
+        """满足条件的题目总数"""
+        return self.constraint_index(operator).count(constraints)
+
+    def generate_question(self, operator='+', constraints=()):
+        if not constraints:
+            return super().generate_question(operator)
+        a, b = self.constraint_index(operator).sample(self.rng, constraints)
+        return {
+            'question': f"{a} {operator} {b} = ?",
+            'answer': apply_operator(operator, a, b),
+            'a': a,
+            'operator': operator,
+            'b': b
+        }
@@ -1,10 +1,27 @@
 import json
 import os
 
+from core.history_store import HistoryStore
+from core.journal import Journal, atomic_write
+
 class DataHandler:
-    def __init__(self, config_path='config/settings.json'):
+    def __init__(self, config_path='config/settings.json', history_path=None, store_path=None):
         self.config_path = config_path
+        # 练习记录单独存放在只追加的日志中，settings.json 只保存少量设置
+        self.history_path = history_path or os.path.join(
+            os.path.dirname(config_path), 'practice_history.jsonl')
+        # 日志是原始数据，SQLite 库是带索引和汇总的查询副本
+        self.store_path = store_path or os.path.join(
+            os.path.dirname(config_path), 'history.db')
         self.data = self._load_config()
+        self.history = Journal(self.history_path)
+        self._migrate_history()
+        self.store = HistoryStore(self.store_path)
+        with self.history.lock:
+            self._sync_store()
+            # 只在启动时、且确实读到损坏的行时整理日志；整理不改变记录，只改变文件长度
+            if self.history.compact_if_corrupt():
+                self.store.set_journal_offset(self._journal_size())
 
     def _load_config(self):
         """加载配置文件"""
@@ -15,28 +32,81 @@ class DataHandler:
             # 如果文件不存在或格式错误，返回默认配置
             return {
                 "current_user": "",
-                "difficulty_level": 1,
-                "practice_history": []
+                "difficulty_level": 1
             }
 
-    def save_score(self, total, correct, time_used):
+    def _migrate_history(self):
+        """把旧版 settings.json 中的 practice_history 迁移到日志文件"""
+        records = self.data.pop('practice_history', None)
+        if records is None:
+            return
+        # 日志已存在说明上次迁移在改写 settings.json 之前中断，不能重复写入
+        if records and not os.path.exists(self.history_path):
+            atomic_write(self.history_path, ''.join(
+                json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                for record in records
+            ))
+        self._save_config()
+
+    @property
+    def practice_history(self):
+        """全部练习记录（需要读取整个日志）"""
+        return list(self.history)
+
+    def save_score(self, total, correct, time_used, user=None, difficulty=None):
         """保存练习记录"""
         record = {
             "date": self._get_current_date(),
+            "user": self.data.get('current_user', '') if user is None else user,
+            "difficulty": self.data.get('difficulty_level', 1) if difficulty is None else difficulty,
             "total": total,
             "correct": correct,
             "time_used": time_used
         }
-        self.data['practice_history'].append(record)
-        self._save_config()
+        # 持锁追加并导入，其他实例的追加不会夹在中间；
+        # 追加后、导入前崩溃时，日志中多出的记录在下次启动或保存时补上
+        with self.history.lock:
+            self.history.append(record)
+            self._sync_store()
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self.history_path)
+        except FileNotFoundError:
+            return 0
+
+    def _sync_store(self):
+        """把记录库中还没有的日志记录导入（需持有日志锁）
+
+        记录库保存已导入的日志字节数：比文件短就只导入多出的部分，
+        没有记录或比文件长（日志被替换过）就整体重建。
+        """
+        offset = self.store.journal_offset()
+        size = self._journal_size()
+        if offset is None or offset > size:
+            self.rebuild_store()
+        elif offset < size:
+            records, offset = self.history.read_from(offset)
+            self.store.add_sessions(records, journal_offset=offset)
+
+    def rebuild_store(self):
+        """根据日志重建 SQLite 记录库"""
+        with self.history.lock:
+            self.store.rebuild(self.history, journal_offset=self._journal_size())
+
+    def daily_stats(self, user=None, since=None, until=None, difficulty=None):
+        """按天统计练习情况，见 HistoryStore.daily_stats"""
+        return self.store.daily_stats(user, since, until, difficulty)
+
+    def weekly_stats(self, user=None, since=None, until=None, difficulty=None):
+        """按周统计练习情况，见 HistoryStore.weekly_stats"""
+        return self.store.weekly_stats(user, since, until, difficulty)
 
     def _save_config(self):
         """保存配置到文件"""
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=4, ensure_ascii=False)
+        atomic_write(self.config_path, json.dumps(self.data, indent=4, ensure_ascii=False))
 
     def _get_current_date(self):
         """获取当前日期"""
         from datetime import datetime
-        return datetime.now().strftime('%Y-%m-%d')
\ No newline at end of file
+        return datetime.now().strftime('%Y-%m-%d')
@@ -0,0 +1,107 @@
+import math
+import random
+from array import array
+
+
+class DivisorIndex:
+    """基于最小质因子 (SPF) 筛的约数索引
+
+    建表一次后，分解 a 只需 O(log a) 步；对每个质因子独立均匀地选取指数，
+    就能均匀地抽取 a 的一个约数，而不必列出全部约数。
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        spf = array('I', range(limit + 1))
+        root = math.isqrt(limit)
+        # 先筛出 sqrt(limit) 以内的质数，再从大到小整段覆盖，
+        # 这样每个合数最后留下的就是它的最小质因子
+        is_prime = bytearray([1]) * (root + 1)
+        primes = []
+        for p in range(2, root + 1):
+            if is_prime[p]:
+                primes.append(p)
+                is_prime[p * p::p] = bytes(len(range(p * p, root + 1, p)))
+        for p in reversed(primes):
+            spf[p * p::p] = array('I', [p]) * len(range(p * p, limit + 1, p))
+        self.spf = spf
+        self._spf_array = None
+
+    def factorize(self, n):
+        """返回 n 的质因数分解 [(p, e), ...]"""
+        spf = self.spf
+        factors = []
+        while n > 1:
+            p = spf[n]
+            e = 0
+            while n % p == 0:
+                n //= p
+                e += 1
+            factors.append((p, e))
+        return factors
+
+    def divisor_count(self, n):
+        """n 的约数个数"""
+        count = 1
+        for _, e in self.factorize(n):
+            count *= e + 1
+        return count
+
+    def divisors(self, n):
+        """n 的全部约数（升序）"""
+        result = [1]
+        for p, e in self.factorize(n):
+            result = [d * p ** k for d in result for k in range(e + 1)]
+        return sorted(result)
+
+    def random_divisor(self, n, rng=random):
+        """均匀随机地返回 n (n >= 1) 的一个约数"""
+        spf = self.spf
+        divisor = 1
+        while n > 1:
+            p = spf[n]
+            e = 0
+            while n % p == 0:
+                n //= p
+                e += 1
+            divisor *= p ** rng.randint(0, e)
+        return divisor
+
+    def random_divisors(self, values, rng):
+        """random_divisor 的 NumPy 向量化版本，values 中的元素须 >= 1"""
+        import numpy as np
+
+        if self._spf_array is None:
+            self._spf_array = np.asarray(self.spf, dtype=np.int64)
+        spf = self._spf_array
+        rest = np.array(values, dtype=np.int64)
+        result = np.ones(len(rest), dtype=np.int64)
+        # 每轮剥离一个不同的质因子，最多只需十几轮
+        idx = np.nonzero(rest > 1)[0]
+        while len(idx):
+            r = rest[idx]
+            p = spf[r]
+            e = np.zeros(len(idx), dtype=np.int64)
+            hit = np.ones(len(idx), dtype=bool)
+            while hit.any():
+                hit = r % p == 0
+                r[hit] //= p[hit]
+                e[hit] += 1
+            k = (rng.random(len(idx)) * (e + 1)).astype(np.int64)
+            result[idx] *= p ** k
+            rest[idx] = r
+            idx = idx[r > 1]
+        return result
+
+
+_INDEXES = {}
+
+
+def get_divisor_index(limit):
+    """获取覆盖 [0, limit] 的约数索引，已建好的更大表会被直接复用"""
+    for size, index in _INDEXES.items():
+        if size >= limit:
+            return index
+    index = DivisorIndex(limit)
+    _INDEXES[limit] = index
+    return index
@@ -1,10 +1,140 @@
+import math
+import numbers
+from collections import namedtuple
+from fractions import Fraction
+
+# correct 为每道题是否答对；errors 为 {下标: 无法解析的原因}，这些题算作答错
+GradeResult = namedtuple('GradeResult', 'correct errors')
+
+
+def parse_answer(value):
+    """把作答解析成 int、Fraction（精确值）或 float（小数，按容差比较）
+
+    字符串支持整数 "12"、分数 "3/4" 和小数 "0.75"；无法解析时抛出 ValueError 或 TypeError。
+    """
+    if isinstance(value, bool):
+        raise TypeError("答案不能是布尔值")
+    if isinstance(value, (int, Fraction)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            if '/' in text:
+                numerator, _, denominator = text.partition('/')
+                return Fraction(int(numerator), int(denominator))
+            value = float(text)
+        except ZeroDivisionError:
+            raise ValueError(f"分母不能为 0: {value!r}") from None
+        except ValueError:
+            raise ValueError(f"不是有效的数字: {value!r}") from None
+    elif isinstance(value, numbers.Integral):  # NumPy 整数等
+        return int(value)
+    elif isinstance(value, numbers.Rational):
+        return Fraction(value.numerator, value.denominator)
+    elif isinstance(value, numbers.Real):
+        value = float(value)
+    else:
+        raise TypeError(f"无法识别的答案类型: {type(value).__name__}")
+    if not math.isfinite(value):
+        raise ValueError(f"不是有效的数字: {value!r}")
+    return value
+
+
 class Evaluator:
-    def __init__(self):
-        pass
+    """判题：整数和分数精确比较，只要有一方是小数就按 tolerance（绝对误差）比较"""
+
+    def __init__(self, tolerance=1e-9):
+        self.tolerance = tolerance
 
     def check_answer(self, user_answer, correct_answer):
         """检查用户答案是否正确"""
         try:
-            return float(user_answer) == float(correct_answer)
-        except ValueError:
-            return False
\ No newline at end of file
+            return self._equal(parse_answer(user_answer), parse_answer(correct_answer))
+        except (TypeError, ValueError):
+            return False
+
+    def _equal(self, answer, expected):
+        if isinstance(answer, float) or isinstance(expected, float):
+            return abs(answer - expected) <= self.tolerance
+        return answer == expected
+
+    def grade_batch(self, submitted, expected):
+        """批量判题，返回 GradeResult
+
+        传入 NumPy 数组时走向量化路径，correct 是布尔数组；
+        否则逐个解析，correct 是 bool 列表。
+        """
+        if len(submitted) != len(expected):
+            raise ValueError(f"作答数 {len(submitted)} 与答案数 {len(expected)} 不一致")
+        if type(submitted).__module__ == 'numpy' or type(expected).__module__ == 'numpy':
+            return self._grade_numpy(submitted, expected)
+        return self._grade_python(submitted, expected)
+
+    def _grade_python(self, submitted, expected):
+        correct, errors = [], {}
+        append, equal = correct.append, self._equal
+        for i, (answer, target) in enumerate(zip(submitted, expected)):
+            # 最常见的情况：两边都是整数，或者作答是整数字符串
+            if type(target) is int:
+                if type(answer) is int:
+                    append(answer == target)
+                    continue
+                if type(answer) is str:
+                    try:
+                        append(int(answer) == target)
+                        continue
+                    except ValueError:
+                        pass
+            elif type(target) is Fraction and type(answer) is str and '/' in answer:
+                # 分数交叉相乘比较，不需要先约分构造 Fraction
+                numerator, _, denominator = answer.partition('/')
+                try:
+                    numerator, denominator = int(numerator), int(denominator)
+                    if denominator:
+                        append(numerator * target.denominator == denominator * target.numerator)
+                        continue
+                except ValueError:
+                    pass
+            try:
+                answer = parse_answer(answer)
+            except (TypeError, ValueError) as e:
+                errors[i] = str(e)
+                append(False)
+                continue
+            try:
+                target = parse_answer(target)
+            except (TypeError, ValueError) as e:
+                errors[i] = f"标准答案无效: {e}"
+                append(False)
+                continue
+            append(equal(answer, target))
+        return GradeResult(correct, errors)
+
+    def _grade_numpy(self, submitted, expected):
+        import numpy as np
+
+        submitted = np.asarray(submitted)
+        expected = np.asarray(expected)
+        s_kind, e_kind = submitted.dtype.kind, expected.dtype.kind
+        if s_kind in 'US' and e_kind in 'iuf':
+            # 导入的作答通常是字符串：先尝试整体转换成数字，失败再逐个解析
+            try:
+                submitted = submitted.astype(np.int64 if e_kind in 'iu' else np.float64)
+                s_kind = submitted.dtype.kind
+            except (ValueError, OverflowError):
+                pass
+        if s_kind in 'iu' and e_kind in 'iu':
+            return GradeResult(submitted == expected, {})
+        if s_kind in 'iuf' and e_kind in 'iuf':
+            finite = np.isfinite(submitted)
+            with np.errstate(invalid='ignore'):
+                correct = np.abs(submitted.astype(np.float64) - expected.astype(np.float64)) <= self.tolerance
+            correct &= finite
+            errors = {int(i): f"不是有效的数字: {submitted[i]!r}" for i in np.nonzero(~finite)[0]}
+            return GradeResult(correct, errors)
+        correct, errors = self._grade_python(submitted.tolist(), expected.tolist())
+        return GradeResult(np.array(correct, dtype=bool), errors)
@@ -0,0 +1,128 @@
+import html
+import secrets
+
+from core.expression import DISPLAY_SYMBOLS
+from core.generator import OPERATORS, NUMPY_AVAILABLE
+from core.profiles import get_profiles
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# 每块生成和写出的题目数；内存占用只与块大小有关，与导出总数无关
+CHUNK_SIZE = 65536
+# 写文件的缓冲区大小
+BUFFER_SIZE = 1 << 20
+
+FORMATS = ('csv', 'jsonl', 'html')
+
+
+def iter_batches(sections, seed):
+    """按块流式生成题目
+
+    sections 是 [(difficulty, operators, count), ...]，difficulty 为难度配置中的等级，
+    数值范围与界面中同等级的难度相同；每个分段由 seed 派生出
+    独立的随机流，所以同一个 seed 可以重放出完全相同的题目序列。
+    逐块 yield (difficulty, QuestionBatch)。
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("导出题目需要安装 NumPy: pip install numpy")
+    streams = np.random.SeedSequence(seed).spawn(len(sections))
+    for (difficulty, operators, count), stream in zip(sections, streams):
+        profile = get_profiles().for_level(difficulty)
+        rng = np.random.default_rng(stream)
+        done = 0
+        while done < count:
+            n = min(CHUNK_SIZE, count - done)
+            yield difficulty, profile.generate_batch(n, operators, seed=rng)
+            done += n
+
+
+def _iter_rows(sections, seed):
+    """逐块 yield 行数据列表 [(index, difficulty, a, operator, b, answer), ...]"""
+    index = 1
+    for difficulty, batch in iter_batches(sections, seed):
+        ops = [OPERATORS[code] for code in batch.op.tolist()]
+        rows = list(zip(range(index, index + len(batch)), [difficulty] * len(batch),
+                        batch.a.tolist(), ops, batch.b.tolist(), batch.answer.tolist()))
+        index += len(batch)
+        yield rows
+
+
+def write_csv(path, sections, seed=None):
+    with open(path, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE) as f:
+        f.write("index,difficulty,a,operator,b,question,answer\r\n")
+        total = 0
+        for rows in _iter_rows(sections, seed):
+            f.write(''.join(
+                f"{i},{d},{a},{op},{b},{a} {op} {b} = ?,{ans}\r\n"
+                for i, d, a, op, b, ans in rows
+            ))
+            total += len(rows)
+    return total
+
+
+def write_jsonl(path, sections, seed=None):
+    with open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        total = 0
+        for rows in _iter_rows(sections, seed):
+            # 字段都是数字或运算符，直接拼接比 json.dumps 快得多
+            f.write(''.join(
+                f'{{"index": {i}, "difficulty": {d}, "a": {a}, "operator": "{op}", "b": {b}, '
+                f'"question": "{a} {op} {b} = ?", "answer": {ans}}}\n'
+                for i, d, a, op, b, ans in rows
+            ))
+            total += len(rows)
+    return total
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: "Segoe UI", sans-serif; margin: 2em; }}
+h1 {{ text-align: center; }}
+ol {{ columns: 3; column-gap: 3em; font-size: 16pt; line-height: 2.2; }}
+ol.answers {{ columns: 5; font-size: 12pt; line-height: 1.6; }}
+.answer-key {{ page-break-before: always; break-before: page; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>姓名：__________　　日期：__________　　得分：__________</p>
+<ol>
+"""
+
+
+def write_html(path, sections, seed=None, title="口算练习"):
+    """导出可打印的练习单，末尾附答案页
+
+    为保持内存恒定，答案页用同一个 seed 重放一遍题目生成，而不是缓存所有答案。
+    """
+    if seed is None:
+        seed = secrets.randbits(64)
+    with open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        f.write(_HTML_HEAD.format(title=html.escape(title)))
+        total = 0
+        for rows in _iter_rows(sections, seed):
+            f.write(''.join(
+                f"<li>{a} {DISPLAY_SYMBOLS[op]} {b} = ______</li>\n"
+                for _, _, a, op, b, _ in rows
+            ))
+            total += len(rows)
+        f.write('</ol>\n<div class="answer-key">\n<h1>答案</h1>\n<ol class="answers">\n')
+        for rows in _iter_rows(sections, seed):
+            f.write(''.join(f"<li>{ans}</li>\n" for *_, ans in rows))
+        f.write("</ol>\n</div>\n</body>\n</html>\n")
+    return total
+
+
+def export_questions(path, sections, fmt=None, seed=None):
+    """按 fmt（默认取文件扩展名）导出题目，返回导出的题目数"""
+    if fmt is None:
+        fmt = path.rsplit('.', 1)[-1].lower()
+    writer = {'csv': write_csv, 'jsonl': write_jsonl, 'html': write_html}.get(fmt)
+    if writer is None:
+        raise ValueError(f"不支持的导出格式: {fmt}，可选 {', '.join(FORMATS)}")
+    return writer(path, sections, seed)
@@ -0,0 +1,135 @@
+import operator as _operator
+import random
+from fractions import Fraction
+
+
+def _divide(a, b):
+    """精确除法：能整除时返回整数，否则返回 Fraction"""
+    if isinstance(a, int) and isinstance(b, int):
+        q, r = divmod(a, b)
+        return q if r == 0 else Fraction(a, b)
+    result = Fraction(a) / b
+    return result.numerator if result.denominator == 1 else result
+
+
+class Operator:
+    """二元运算符：符号、预编译的计算函数和优先级"""
+    __slots__ = ('symbol', 'func', 'precedence', 'associative')
+
+    def __init__(self, symbol, func, precedence, associative):
+        self.symbol = symbol
+        self.func = func
+        self.precedence = precedence
+        self.associative = associative  # 右侧同级运算可以省略括号
+
+    def __repr__(self):
+        return f"Operator({self.symbol!r})"
+
+
+OPERATORS = {
+    '+': Operator('+', _operator.add, 1, True),
+    '-': Operator('-', _operator.sub, 1, False),
+    '*': Operator('*', _operator.mul, 2, True),
+    '/': Operator('/', _divide, 2, False),
+}
+
+# 面向小学生的显示符号
+DISPLAY_SYMBOLS = {'+': '+', '-': '-', '*': '×', '/': '÷'}
+
+
+def apply_operator(symbol, a, b):
+    """计算 a <symbol> b，整数运算结果保持精确"""
+    return OPERATORS[symbol].func(a, b)
+
+
+class Number:
+    __slots__ = ('value',)
+    precedence = 3
+
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self):
+        return self.value
+
+    def render(self, symbols=None):
+        return str(self.value)
+
+    def __repr__(self):
+        return f"Number({self.value!r})"
+
+
+class BinaryOp:
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right):
+        self.op = OPERATORS[op] if isinstance(op, str) else op
+        self.left = left
+        self.right = right
+
+    @property
+    def precedence(self):
+        return self.op.precedence
+
+    def evaluate(self):
+        return self.op.func(self.left.evaluate(), self.right.evaluate())
+
+    def render(self, symbols=None):
+        """按优先级渲染，只在必要时加括号；symbols 可替换运算符显示符号"""
+        op = self.op
+        left = self.left.render(symbols)
+        if self.left.precedence < op.precedence:
+            left = f"({left})"
+        right = self.right.render(symbols)
+        if (self.right.precedence < op.precedence or
+                (self.right.precedence == op.precedence and not op.associative)):
+            right = f"({right})"
+        symbol = symbols[op.symbol] if symbols else op.symbol
+        return f"{left} {symbol} {right}"
+
+    def __repr__(self):
+        return f"BinaryOp({self.op.symbol!r}, {self.left!r}, {self.right!r})"
+
+
+def build_expression(operand_count, operators, number_range, rng=random, divisor_index=None):
+    """随机生成一棵含 operand_count 个操作数的表达式树
+
+    保证所有中间结果非负；提供 divisor_index 时除法一定整除，
+    否则除法结果可能是 Fraction。
+    """
+    low, high = number_range
+    symbols = list(operators)
+
+    def leaf():
+        return Number(rng.randint(low, high))
+
+    def build(count):
+        if count == 1:
+            return leaf()
+        symbol = rng.choice(symbols)
+        if symbol == '/':
+            # 除数固定为单个数字，从被除数的约数中选取
+            left = build(count - 1)
+            value = left.evaluate()
+            if divisor_index is None or value == 0:
+                divisor = rng.randint(max(low, 1), high)
+            elif isinstance(value, int) and value <= divisor_index.limit:
+                divisor = divisor_index.random_divisor(value, rng)
+            else:
+                # 被除数超出约数表范围时改做加法
+                return BinaryOp('+', left, leaf())
+            return BinaryOp('/', left, Number(divisor))
+        split = rng.randint(1, count - 1)
+        left, right = build(split), build(count - split)
+        if symbol == '-':
+            return _subtract(left, right)
+        return BinaryOp(symbol, left, right)
+
+    return build(operand_count)
+
+
+def _subtract(left, right):
+    """构造减法节点，必要时交换左右两侧以避免负数"""
+    if left.evaluate() < right.evaluate():
+        left, right = right, left
+    return BinaryOp('-', left, right)
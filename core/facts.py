@@ -0,0 +1,117 @@
+import math
+from array import array
+from bisect import bisect_right
+
+from core.divisors import get_divisor_index
+
+
+class FactSpace:
+    """某个运算符在给定数值范围内所有合法题目 (a, b) 的紧凑编号
+
+    编号是 [0, size) 内的连续整数，与 (a, b) 一一对应，不需要存储题目本身：
+      +  *  全部 (a, b)，size = R^2
+      -     a >= b 的三角区域，size = R(R+1)/2
+      /     b 整除 a，按 a 的前缀计数定位；0 ÷ b 只算一道题 (0, high)，
+            否则 0 会占去大量编号，均匀抽题时偏向这类最简单的题目
+    """
+
+    def __init__(self, operator, number_range):
+        if operator not in ('+', '-', '*', '/'):
+            raise ValueError(f"不支持的运算符: {operator!r}")
+        self.operator = operator
+        self.low, self.high = number_range
+        self.width = self.high - self.low + 1
+        self._offsets = None
+        if operator in ('+', '*'):
+            self.size = self.width * self.width
+        elif operator == '-':
+            self.size = self.width * (self.width + 1) // 2
+        else:
+            self._divisors = get_divisor_index(self.high)
+            self._build_division_offsets()
+
+    def _build_division_offsets(self):
+        # offsets[i] 是被除数 low + i 之前的题目数
+        low, high = self.low, self.high
+        zero_count = 1 if high >= 1 else 0
+        offsets = array('q', [0])
+        total = 0
+        for a in range(low, high + 1):
+            total += zero_count if a == 0 else self._divisors.divisor_count(a)
+            offsets.append(total)
+        self._offsets = offsets
+        self.size = total
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """按编号顺序列出全部 (a, b)，比逐个调用 fact() 快得多"""
+        low, high = self.low, self.high
+        if self.operator in ('+', '*'):
+            for a in range(low, high + 1):
+                for b in range(low, high + 1):
+                    yield a, b
+        elif self.operator == '-':
+            for a in range(low, high + 1):
+                for b in range(low, a + 1):
+                    yield a, b
+        else:
+            for a in range(low, high + 1):
+                if a == 0:
+                    if high >= 1:
+                        yield 0, high
+                    continue
+                for b in self._divisors.divisors(a):
+                    yield a, b
+
+    def fact(self, index):
+        """编号 -> (a, b)"""
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        low = self.low
+        if self.operator in ('+', '*'):
+            i, j = divmod(index, self.width)
+            return low + i, low + j
+        if self.operator == '-':
+            i = (math.isqrt(8 * index + 1) - 1) // 2
+            return low + i, low + index - i * (i + 1) // 2
+        i = bisect_right(self._offsets, index) - 1
+        a = low + i
+        k = index - self._offsets[i]
+        if a == 0:
+            return 0, self.high
+        return a, self._divisors.divisors(a)[k]
+
+    def index(self, a, b):
+        """(a, b) -> 编号；不是合法题目时抛出 ValueError"""
+        low, high = self.low, self.high
+        # 除法的除数取被除数的全部约数，不受 low 限制
+        b_low = 1 if self.operator == '/' else low
+        if not (low <= a <= high and b_low <= b <= high):
+            raise ValueError(f"超出数值范围: {a}, {b}")
+        i, j = a - low, b - low
+        if self.operator in ('+', '*'):
+            return i * self.width + j
+        if self.operator == '-':
+            if j > i:
+                raise ValueError(f"减法结果为负: {a} - {b}")
+            return i * (i + 1) // 2 + j
+        if a == 0:
+            # 任意除数的 0 ÷ b 都对应同一道题
+            return self._offsets[i]
+        divisors = self._divisors.divisors(a)
+        k = bisect_right(divisors, b) - 1
+        if k < 0 or divisors[k] != b:
+            raise ValueError(f"不能整除: {a} / {b}")
+        return self._offsets[i] + k
+
+
+def get_space(operator, number_range=None, spaces=None):
+    """取 operator 的题目空间：spaces 为 {运算符: 题目空间} 时从中查找，否则按 number_range 建立 FactSpace"""
+    if spaces is None:
+        return FactSpace(operator, number_range)
+    try:
+        return spaces[operator]
+    except KeyError:
+        raise ValueError(f"没有 {operator!r} 的题目空间") from None
@@ -1,26 +1,181 @@
 import random
+from importlib.util import find_spec
+
+from core.divisors import get_divisor_index
+from core.expression import apply_operator, build_expression
+from core.facts import get_space
+
+# NumPy 只有批量接口需要，导入很慢（约 0.15 秒），所以只检查是否安装，用到时再导入
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+
+# 批量生成时运算符按下标编码，存放在 uint8 列中
+OPERATORS = ('+', '-', '*', '/')
+
+
+class QuestionBatch:
+    """列式存储的一批题目，题干文本只在需要时才生成"""
+
+    def __init__(self, a, op, b, answer):
+        self.a = a            # 第一个操作数 (int64)
+        self.op = op          # 运算符编码 (uint8)，对应 OPERATORS 下标
+        self.b = b            # 第二个操作数 (int64)
+        self.answer = answer  # 答案 (int64)，除法保证整除
+
+    def __len__(self):
+        return len(self.a)
+
+    def question(self, index):
+        """渲染第 index 道题的题干"""
+        return f"{self.a[index]} {OPERATORS[self.op[index]]} {self.b[index]} = ?"
+
+    def __getitem__(self, index):
+        return {
+            'question': self.question(index),
+            'answer': int(self.answer[index])
+        }
+
+    @classmethod
+    def concatenate(cls, batches):
+        """按顺序拼接多批题目"""
+        import numpy as np
+
+        batches = list(batches)
+        return cls(*(np.concatenate([getattr(batch, name) for batch in batches])
+                     for name in ('a', 'op', 'b', 'answer')))
+
+    def __iter__(self):
+        # 先整体转成 Python 列表，避免逐个访问 NumPy 标量的开销
+        columns = zip(self.a.tolist(), self.op.tolist(), self.b.tolist(), self.answer.tolist())
+        for a, op, b, answer in columns:
+            yield {'question': f"{a} {OPERATORS[op]} {b} = ?", 'answer': answer}
+
 
 class MathGenerator:
-    def __init__(self, difficulty=1):
-        self.number_range = {
-            1: (0, 10),   # 初级难度
-            2: (0, 100),  # 中级难度
-            3: (0, 1000)  # 高级难度
-        }[difficulty]
-        
+    def __init__(self, difficulty=1, number_range=None, seed=None):
+        # difficulty 为整数等级，各运算符的题目范围取自难度配置文件 (core.profiles)，
+        # 与界面、课堂服务器和导出相同；number_range 可以自定义单一数值范围，覆盖难度配置
+        # seed 固定后 generate_question / generate_expression 的结果可以复现
+        self.rng = random.Random(seed)
+        if number_range is None:
+            from core.profiles import get_profiles  # core.profiles 导入了本模块，只能在这里导入
+            self.profile = get_profiles().for_level(difficulty)
+            self.spaces = self.profile.spaces
+            self.number_range = self.profile.number_range
+        else:
+            self.profile = None
+            self.spaces = None
+            self.number_range = tuple(number_range)
+        self._divisor_index = None
+
+    @property
+    def divisor_index(self):
+        """当前数值范围的约数索引，首次做除法时才建表"""
+        if self._divisor_index is None:
+            self._divisor_index = get_divisor_index(self.number_range[1])
+        return self._divisor_index
+
     def generate_question(self, operator='+'):
-        a = random.randint(*self.number_range)
-        b = random.randint(*self.number_range)
-        
+        rng = self.rng
+        if self.spaces is not None:
+            # 难度配置：在该运算符的题目空间中均匀抽取
+            space = get_space(operator, spaces=self.spaces)
+            a, b = space.fact(int(rng.random() * space.size))
+            return {
+                'question': f"{a} {operator} {b} = ?",
+                'answer': apply_operator(operator, a, b),
+                'a': a,
+                'operator': operator,
+                'b': b
+            }
+        a = rng.randint(*self.number_range)
+        b = rng.randint(*self.number_range)
+
         # 处理减法避免负数结果
         if operator == '-' and a < b:
             a, b = b, a
         # 处理除法保证能整除
         elif operator == '/':
             if a > 0:
-                b = random.choice([i for i in range(1, a+1) if a % i == 0])
-            
+                b = self.divisor_index.random_divisor(a, rng)
+            else:
+                # 0 能被任何正整数整除
+                b = rng.randint(max(self.number_range[0], 1), self.number_range[1])
+
         return {
             'question': f"{a} {operator} {b} = ?",
-            'answer': eval(f"{a}{operator}{b}")
-        }
\ No newline at end of file
+            'answer': apply_operator(operator, a, b),
+            'a': a,
+            'operator': operator,
+            'b': b
+        }
+
+    def no_repeat_session(self, seed=None):
+        """返回一个在当前数值范围内不重复出题的 NoRepeatSession"""
+        from core.permutation import NoRepeatSession
+        return NoRepeatSession(self.number_range, seed=seed, spaces=self.spaces)
+
+    def generate_expression(self, operand_count=3, operators=('+', '-', '*', '/'), symbols=None):
+        """生成多步运算题，例如 3 + 4 * 5 或 (12 - 4) / 2
+
+        symbols 可传入 core.expression.DISPLAY_SYMBOLS 以 × ÷ 显示。
+        """
+        if '/' in operators:
+            divisor_index = self.divisor_index
+        else:
+            divisor_index = None
+        expression = build_expression(operand_count, operators, self.number_range,
+                                      rng=self.rng, divisor_index=divisor_index)
+        return {
+            'question': f"{expression.render(symbols)} = ?",
+            'answer': expression.evaluate(),
+            'expression': expression
+        }
+
+    def generate_batch(self, n, operators=('+',), seed=None):
+        """一次性生成 n 道题，返回列式的 QuestionBatch
+
+        operators 中的运算符均匀混合；seed 可以是整数或 numpy.random.Generator，
+        传入同一个 Generator 可以分块连续生成。
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("generate_batch 需要安装 NumPy: pip install numpy")
+        if self.profile is not None:
+            return self.profile.generate_batch(n, operators, seed)
+        import numpy as np
+
+        try:
+            codes = np.array([OPERATORS.index(o) for o in operators], dtype=np.uint8)
+        except ValueError:
+            raise ValueError(f"不支持的运算符: {operators!r}") from None
+        if len(codes) == 0:
+            raise ValueError("operators 不能为空")
+
+        rng = np.random.default_rng(seed)
+        low, high = self.number_range
+        if len(codes) == 1:
+            op = np.full(n, codes[0], dtype=np.uint8)
+        else:
+            op = codes[rng.integers(0, len(codes), n)]
+        a = rng.integers(low, high, n, endpoint=True)
+        b = rng.integers(low, high, n, endpoint=True)
+
+        # 处理减法避免负数结果
+        swap = (op == 1) & (a < b)
+        a[swap], b[swap] = b[swap], a[swap]
+
+        answer = np.empty(n, dtype=np.int64)
+        for code, func in ((0, np.add), (1, np.subtract), (2, np.multiply)):
+            mask = op == code
+            answer[mask] = func(a[mask], b[mask])
+
+        # 处理除法保证能整除：与 generate_question 一样，从被除数的约数中均匀抽取除数
+        div = np.nonzero(op == 3)[0]
+        if len(div):
+            dividend = a[div]
+            divisor = rng.integers(max(low, 1), high, len(div), endpoint=True)
+            positive = dividend > 0
+            divisor[positive] = self.divisor_index.random_divisors(dividend[positive], rng)
+            b[div] = divisor
+            answer[div] = dividend // divisor
+
+        return QuestionBatch(a, op, b, answer)
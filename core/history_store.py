@@ -0,0 +1,233 @@
+import os
+import sqlite3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL,
+    difficulty INTEGER NOT NULL DEFAULT 1,
+    total INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    time_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_date ON sessions (user, date);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions (date);
+CREATE INDEX IF NOT EXISTS idx_sessions_difficulty_date ON sessions (difficulty, date);
+
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    user TEXT NOT NULL,
+    period TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    sessions INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    time_used REAL NOT NULL,
+    PRIMARY KEY (user, period, difficulty)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS weekly_rollup (
+    user TEXT NOT NULL,
+    period TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    sessions INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    time_used REAL NOT NULL,
+    PRIMARY KEY (user, period, difficulty)
+) WITHOUT ROWID;
+
+-- journal_offset: 已导入的日志字节数，与记录在同一事务中更新
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+) WITHOUT ROWID;
+"""
+
+# 汇总表由触发器增量维护；周以周一的日期作为标识
+_ROLLUPS = {
+    'daily_rollup': "NEW.date",
+    'weekly_rollup': "date(NEW.date, 'weekday 0', '-6 days')",
+}
+
+_INSERT_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON sessions BEGIN
+    INSERT INTO {table} (user, period, difficulty, sessions, total, correct, time_used)
+    VALUES (NEW.user, {period}, NEW.difficulty, 1, NEW.total, NEW.correct, NEW.time_used)
+    ON CONFLICT (user, period, difficulty) DO UPDATE SET
+        sessions = sessions + 1,
+        total = total + excluded.total,
+        correct = correct + excluded.correct,
+        time_used = time_used + excluded.time_used;
+END;
+"""
+
+_DELETE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON sessions BEGIN
+    UPDATE {table} SET
+        sessions = sessions - 1,
+        total = total - OLD.total,
+        correct = correct - OLD.correct,
+        time_used = time_used - OLD.time_used
+    WHERE user = OLD.user AND period = {period} AND difficulty = OLD.difficulty;
+    DELETE FROM {table}
+    WHERE user = OLD.user AND period = {period} AND difficulty = OLD.difficulty AND sessions <= 0;
+END;
+"""
+
+
+class HistoryStore:
+    """基于 SQLite 的练习记录库
+
+    sessions 表按用户/日期/难度建索引；daily_rollup 和 weekly_rollup 在插入时由
+    触发器增量更新，统计查询只读汇总表，不随记录总数变慢。
+    """
+
+    def __init__(self, path='config/history.db'):
+        self.path = path
+        if path != ':memory:':
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        with self.conn:
+            self._create_triggers()
+
+    def _create_triggers(self):
+        for table, period in _ROLLUPS.items():
+            self.conn.execute(_INSERT_TRIGGER.format(table=table, period=period))
+            self.conn.execute(_DELETE_TRIGGER.format(table=table, period=period.replace('NEW.', 'OLD.')))
+
+    def add_session(self, date, total, correct, time_used, user='', difficulty=1):
+        self.add_sessions([{
+            'user': user, 'date': date, 'difficulty': difficulty,
+            'total': total, 'correct': correct, 'time_used': time_used
+        }])
+
+    def add_sessions(self, records, journal_offset=None):
+        """在一个事务中批量写入练习记录（字典，字段同 DataHandler 的记录）
+
+        给出 journal_offset 时同一事务中记下已导入的日志位置。
+        """
+        with self.conn:
+            self._insert(records)
+            if journal_offset is not None:
+                self._set_journal_offset(journal_offset)
+
+    def journal_offset(self):
+        """已导入的日志字节数，从未记录过时为 None"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'journal_offset'").fetchone()
+        return None if row is None else row[0]
+
+    def set_journal_offset(self, offset):
+        with self.conn:
+            self._set_journal_offset(offset)
+
+    def _set_journal_offset(self, offset):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('journal_offset', ?)", (offset,))
+
+    def rebuild(self, records, journal_offset=None):
+        """清空后重新导入全部记录
+
+        导入期间先去掉触发器，最后用一次 GROUP BY 重算汇总表，
+        比逐条触发更新快得多。
+        """
+        with self.conn:
+            if journal_offset is not None:
+                self._set_journal_offset(journal_offset)
+            for table in _ROLLUPS:
+                self.conn.execute(f"DROP TRIGGER IF EXISTS {table}_insert")
+                self.conn.execute(f"DROP TRIGGER IF EXISTS {table}_delete")
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.execute("DELETE FROM sessions")
+            self._insert(records)
+            for table, period in _ROLLUPS.items():
+                period = period.replace('NEW.', '')
+                self.conn.execute(
+                    f"INSERT INTO {table} (user, period, difficulty, sessions, total, correct, time_used) "
+                    f"SELECT user, {period}, difficulty, COUNT(*), SUM(total), SUM(correct), SUM(time_used) "
+                    f"FROM sessions GROUP BY 1, 2, 3")
+            self._create_triggers()
+
+    def _insert(self, records):
+        self.conn.executemany(
+            "INSERT INTO sessions (user, date, difficulty, total, correct, time_used) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((r.get('user', ''), r['date'], r.get('difficulty', 1),
+              r['total'], r['correct'], r['time_used']) for r in records)
+        )
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def clear(self):
+        """删除全部记录；已导入的日志位置同时归零，下次同步时从头导入日志"""
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions")
+            self._set_journal_offset(0)
+
+    def sessions(self, user=None, since=None, until=None, difficulty=None, limit=None,
+                 offset=0, newest_first=False):
+        """按条件查询原始练习记录，默认按日期升序；limit/offset 用于分页"""
+        where, params = self._filters(user, since, until, difficulty, column='date')
+        order = "date DESC, id DESC" if newest_first else "date, id"
+        sql = f"SELECT user, date, difficulty, total, correct, time_used FROM sessions{where} ORDER BY {order}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def daily_stats(self, user=None, since=None, until=None, difficulty=None):
+        """按天统计：练习次数、正确率、平均每题用时"""
+        return self._rollup('daily_rollup', user, since, until, difficulty)
+
+    def weekly_stats(self, user=None, since=None, until=None, difficulty=None):
+        """按周统计，period 为该周周一的日期
+
+        汇总表按整周保存，since 落在周中时包含 since 所在的整周。
+        """
+        if since is not None:
+            # 与汇总表使用同一个表达式换算成该周周一
+            period = _ROLLUPS['weekly_rollup'].replace('NEW.date', '?')
+            since = self.conn.execute(f"SELECT {period}", (since,)).fetchone()[0] or since
+        return self._rollup('weekly_rollup', user, since, until, difficulty)
+
+    def close(self):
+        self.conn.close()
+
+    def _rollup(self, table, user, since, until, difficulty):
+        where, params = self._filters(user, since, until, difficulty, column='period')
+        rows = self.conn.execute(
+            f"SELECT period, SUM(sessions) AS sessions, SUM(total) AS total, "
+            f"SUM(correct) AS correct, SUM(time_used) AS time_used "
+            f"FROM {table}{where} GROUP BY period ORDER BY period", params)
+        result = []
+        for row in rows:
+            stats = dict(row)
+            total = stats['total']
+            stats['accuracy'] = stats['correct'] / total if total else 0.0
+            stats['avg_time'] = stats['time_used'] / total if total else 0.0
+            result.append(stats)
+        return result
+
+    @staticmethod
+    def _filters(user, since, until, difficulty, column):
+        clauses, params = [], []
+        if user is not None:
+            clauses.append("user = ?")
+            params.append(user)
+        if since is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append(f"{column} <= ?")
+            params.append(until)
+        if difficulty is not None:
+            clauses.append("difficulty = ?")
+            params.append(difficulty)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
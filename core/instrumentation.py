@@ -0,0 +1,189 @@
+"""可选的运行时统计：调用次数、耗时直方图和 Tk 事件循环延迟
+
+默认不启用；启用时（main.py --metrics 路径，或环境变量 RJGC_METRICS）才给方法套上计时包装，
+未启用时被统计的方法保持原样，没有任何额外开销。
+统计结果在程序退出时，或收到 SIGUSR1 信号时写入文件：扩展名为 .prom / .txt 时写
+Prometheus 文本格式，否则写 JSON。
+"""
+import atexit
+import functools
+import json
+import math
+import signal
+import threading
+import time
+from bisect import bisect_left
+
+from core.journal import atomic_write
+
+# 默认的直方图分桶上界（秒）：50 微秒到 10 秒，大约每档 2.5 倍
+DEFAULT_BUCKETS = (5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2,
+                   5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """固定分桶的直方图，observe 为 O(log 桶数)；分位数按桶内线性插值估算"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # 最后一个桶是 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q):
+        """估算第 q 分位数 (0 <= q <= 1)，没有数据时返回 0"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = self.bounds[index - 1] if index else 0.0
+                high = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(low + (high - low) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max,
+            'p50': self.percentile(0.50),
+            'p90': self.percentile(0.90),
+            'p99': self.percentile(0.99),
+            'buckets': [[bound, count] for bound, count in zip(self.bounds + (math.inf,), self.counts)],
+        }
+
+
+class Metrics:
+    """计数器和直方图的注册表"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def snapshot(self):
+        return {
+            'timestamp': time.time(),
+            'counters': dict(self.counters),
+            'histograms': {name: h.snapshot() for name, h in self.histograms.items()},
+        }
+
+    def to_json(self):
+        # JSON 不支持 Infinity，+Inf 桶的上界写成 null
+        snapshot = self.snapshot()
+        for histogram in snapshot['histograms'].values():
+            histogram['buckets'][-1][0] = None
+        return json.dumps(snapshot, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+        for name, histogram in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + (math.inf,), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum {histogram.sum!r}")
+            lines.append(f"{name}_count {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """写入统计快照，格式由扩展名决定"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        atomic_write(path, text)
+
+
+def instrument(obj, method_names, prefix, metrics):
+    """给 obj 的实例方法套上计时包装
+
+    每个方法记录 {prefix}_{方法}_seconds 耗时直方图，抛出异常时累加
+    {prefix}_{方法}_errors_total。包装只设置在这个实例上，不影响类和其他实例。
+    """
+    for method_name in method_names:
+        method = getattr(obj, method_name)
+        histogram = metrics.histogram(f"{prefix}_{method_name}_seconds")
+        errors = f"{prefix}_{method_name}_errors_total"
+
+        @functools.wraps(method)
+        def wrapper(*args, _method=method, _histogram=histogram, _errors=errors, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _method(*args, **kwargs)
+            except Exception:
+                metrics.inc(_errors)
+                raise
+            finally:
+                _histogram.observe(time.perf_counter() - start)
+
+        setattr(obj, method_name, wrapper)
+
+
+def watch_event_loop(master, metrics, interval=0.1):
+    """每 interval 秒用 after() 探测一次 Tk 事件循环，记录实际到达比预定晚了多久
+
+    master 只需要提供 after(ms, callback)。返回停止探测的函数。
+    """
+    histogram = metrics.histogram('tk_event_loop_lag_seconds')
+    delay = max(1, round(interval * 1000))
+    state = {'due': time.monotonic() + interval, 'running': True}
+
+    def probe():
+        if not state['running']:
+            return
+        now = time.monotonic()
+        histogram.observe(max(0.0, now - state['due']))
+        state['due'] = now + interval
+        try:
+            master.after(delay, probe)
+        except Exception:  # 窗口已经销毁（Tk 抛出 TclError）
+            state['running'] = False
+
+    master.after(delay, probe)
+
+    def stop():
+        state['running'] = False
+    return stop
+
+
+def install_dump(metrics, path):
+    """程序退出时写入统计；支持 SIGUSR1 的系统上收到该信号时也写入一次"""
+    def dump(*_):
+        try:
+            metrics.dump(path)
+        except OSError as e:
+            print(f"[错误] 写入统计数据失败: {e}")
+
+    atexit.register(dump)
+    if hasattr(signal, 'SIGUSR1') and threading.current_thread() is threading.main_thread():
+        # Tk 主循环中信号处理函数要等解释器拿回控制权才执行，事件循环探测会定期让出控制权
+        signal.signal(signal.SIGUSR1, dump)
+    return dump
@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Windows 下 os.open 默认是文本模式，需要显式指定二进制
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+
+class FileLock:
+    """基于锁文件的跨进程互斥锁，用于多个程序实例共享同一份数据文件
+
+    同一个 FileLock 对象可以在同一线程内重复进入（例如持锁时调用 Journal.append）。
+    Windows 下等待超过 timeout 秒抛出 TimeoutError；POSIX 下 flock 由内核排队，一直等待。
+    """
+
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.timeout = timeout
+        self._fd = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth > 1:
+            return self
+        try:
+            self._acquire()
+        except BaseException:
+            self._depth -= 1
+            self._thread_lock.release()
+            raise
+        return self
+
+    def _acquire(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | _O_BINARY, 0o644)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            # 锁住第一个字节即可；每次 msvcrt.LK_LOCK 最多重试 10 秒，超过 timeout 后放弃
+            deadline = time.monotonic() + self.timeout
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        os.close(fd)
+                        raise TimeoutError(f"等待文件锁超时 ({self.timeout} 秒): {self.path}") from None
+        self._fd = fd
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                fd, self._fd = self._fd, None
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    else:
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                finally:
+                    os.close(fd)
+        finally:
+            self._thread_lock.release()
+
+
+def atomic_write(path, text):
+    """先写临时文件并落盘，再用 os.replace 原子替换，写到一半崩溃也不会损坏原文件"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Journal:
+    """只追加的 JSONL 日志，每条记录一行
+
+    每次追加都以 O_APPEND 一次写入并 fsync；启动时只检查文件末尾，
+    截掉崩溃时写了一半的最后一行，不需要解析全部记录。
+    追加和整理都持有锁文件 lock（默认 path + '.lock'），整理时不会丢失其他实例的追加。
+    读取时跳过的损坏行数记在 corrupt_lines 中，由调用方在启动时决定是否 compact_if_corrupt()。
+    """
+
+    def __init__(self, path, lock=None):
+        self.path = path
+        self.lock = lock or FileLock(f"{path}.lock")
+        self.corrupt_lines = 0
+        with self.lock:
+            self._repair_tail()
+
+    def append(self, record):
+        self.extend([record])
+
+    def extend(self, records):
+        """批量追加记录，一次写入、一次 fsync"""
+        data = ''.join(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                       for record in records).encode('utf-8')
+        if not data:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_BINARY, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def __iter__(self):
+        """逐条读取记录，跳过损坏的行"""
+        try:
+            f = open(self.path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    self.corrupt_lines += 1
+
+    def read_from(self, offset):
+        """从字节偏移 offset 开始读取完整的行，返回 (记录列表, 新的偏移)"""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return [], offset
+        with f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                self.corrupt_lines += 1
+        return records, offset + end
+
+    def compact(self):
+        """重写日志，只保留能解析的记录
+
+        持锁后重新读取整个文件，其他实例此时无法追加，写入的记录不会被覆盖丢失。
+        """
+        with self.lock:
+            self.corrupt_lines = 0
+            if not os.path.exists(self.path):
+                return
+            atomic_write(self.path, ''.join(
+                json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                for record in self
+            ))
+            self.corrupt_lines = 0
+
+    def compact_if_corrupt(self):
+        """读取时遇到过损坏的行才整理，返回是否整理过"""
+        if not self.corrupt_lines:
+            return False
+        self.compact()
+        return True
+
+    def _repair_tail(self):
+        """截掉末尾不完整的一行（上次追加时崩溃留下的）"""
+        try:
+            f = open(self.path, 'r+b')
+        except FileNotFoundError:
+            return
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b'\n':
+                return
+            # 从后向前按块查找最后一个换行符
+            position = end
+            while position > 0:
+                size = min(4096, position)
+                position -= size
+                f.seek(position)
+                chunk = f.read(size)
+                newline = chunk.rfind(b'\n')
+                if newline != -1:
+                    f.truncate(position + newline + 1)
+                    return
+            f.truncate(0)
@@ -0,0 +1,160 @@
+import heapq
+import json
+import os
+from bisect import bisect_right, insort
+from datetime import date as _date, timedelta
+from functools import lru_cache
+
+from core.journal import FileLock, Journal
+
+PERIODS = ('all', 'week', 'day')
+
+
+@lru_cache(maxsize=4096)
+def _week_of(day):
+    """周榜以该周周一的日期作为标识"""
+    d = _date.fromisoformat(day)
+    return (d - timedelta(days=d.weekday())).isoformat()
+
+
+def _period_keys(day):
+    """一条成绩所属的全部榜单周期；没有日期的旧记录只进入总榜"""
+    if day is None:
+        return (('all', None),)
+    return (('all', None), ('week', _week_of(day)), ('day', day))
+
+
+class Leaderboard:
+    """多榜单排行榜
+
+    每条成绩（名字、分数、难度、日期）以只追加日志的形式保存在共享文件中，
+    写入时持有文件锁并 fsync，多个程序实例可以共用同一个榜单。内存中：
+      - 每个 (难度, 周期) 榜单用大小为 top_k 的最小堆保存前 K 名；
+      - 每个难度保存全部历史分数的有序列表，用二分查找 O(log n) 计算名次；
+      - 完整榜单 (ranked) 在第一次查看时筛选并排序，有新成绩前一直复用。
+    difficulty 为 None 表示不分难度的总榜。
+    """
+
+    def __init__(self, path='config/leaderboard.jsonl', top_k=10, legacy_path=None):
+        self.path = path
+        self.top_k = top_k
+        self._lock = FileLock(f"{path}.lock")
+        with self._lock:
+            self.journal = Journal(path, lock=self._lock)
+            if legacy_path and not os.path.exists(path):
+                self._migrate_legacy(legacy_path)
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self._offset = 0
+        self._seq = 0
+        self._boards = {}   # (difficulty, period, period_key) -> [(score, seq, entry), ...] 最小堆
+        self._scores = {}   # difficulty -> 升序分数列表
+        self._entries = []  # 全部成绩，按写入顺序
+        self._ranked = {}   # (difficulty, period, period_key) -> 完整榜单缓存
+
+    def _migrate_legacy(self, legacy_path):
+        """导入旧版 leaderboard.json（只有分数的列表）"""
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                scores = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if isinstance(scores, list):
+            self.journal.extend([{'name': '', 'score': score, 'difficulty': None, 'date': None}
+                                 for score in scores if isinstance(score, (int, float))])
+
+    def refresh(self):
+        """读入其他实例新写入的成绩"""
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        if size < self._offset:
+            # 文件被整理或替换过，重新加载
+            self._reset()
+        records, self._offset = self.journal.read_from(self._offset)
+        if records:
+            self._ranked.clear()
+            self._entries.extend(records)
+        new_scores = {}
+        for entry in records:
+            for difficulty in {None, entry.get('difficulty')}:
+                new_scores.setdefault(difficulty, []).append(entry['score'])
+            self._index(entry)
+        for difficulty, scores in new_scores.items():
+            ordered = self._scores.setdefault(difficulty, [])
+            if len(scores) < 64:
+                for score in scores:
+                    insort(ordered, score)
+            else:
+                # 批量载入时整体排序一次，比逐个插入快得多
+                ordered.extend(scores)
+                ordered.sort()
+
+    def _index(self, entry):
+        self._seq += 1
+        # 同分时先上榜的排在前面；seq 唯一，比较不会进行到 entry
+        item = (entry['score'], -self._seq, entry)
+        boards, top_k = self._boards, self.top_k
+        keys = _period_keys(entry.get('date'))
+        for difficulty in {None, entry.get('difficulty')}:
+            for period, key in keys:
+                heap = boards.get((difficulty, period, key))
+                if heap is None:
+                    boards[(difficulty, period, key)] = [item]
+                elif len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+    def add(self, score, name='', difficulty=None, date=None):
+        """记录一条成绩，返回它在该难度全部历史成绩中的名次"""
+        if not isinstance(score, (int, float)):
+            raise TypeError(f"无效的分数类型: {score!r}")
+        entry = {
+            'name': name,
+            'score': score,
+            'difficulty': difficulty,
+            'date': date or _date.today().isoformat()
+        }
+        with self._lock:
+            self.journal.append(entry)
+            self.refresh()
+        return self.rank(score, difficulty)
+
+    def top(self, difficulty=None, period='all', day=None, k=None):
+        """返回榜单前 k 名（默认 top_k），分数从高到低
+
+        period 为 'all'、'week' 或 'day'；day 指定日期（默认今天）。
+        """
+        if period not in PERIODS:
+            raise ValueError(f"未知的榜单周期: {period!r}")
+        key = dict(_period_keys(day or _date.today().isoformat()))[period]
+        heap = self._boards.get((difficulty, period, key), [])
+        return [entry for _, _, entry in heapq.nlargest(k or self.top_k, heap)]
+
+    def ranked(self, difficulty=None, period='all', day=None):
+        """返回榜单的全部成绩，分数从高到低（同分先上榜的在前），用于完整榜单的分页显示"""
+        if period not in PERIODS:
+            raise ValueError(f"未知的榜单周期: {period!r}")
+        key = dict(_period_keys(day or _date.today().isoformat()))[period]
+        board = (difficulty, period, key)
+        entries = self._ranked.get(board)
+        if entries is None:
+            entries = [entry for entry in self._entries
+                       if (difficulty is None or entry.get('difficulty') == difficulty)
+                       and dict(_period_keys(entry.get('date'))).get(period) == key]
+            # sort 是稳定的，同分时保持写入顺序
+            entries.sort(key=lambda entry: entry['score'], reverse=True)
+            self._ranked[board] = entries
+        return entries
+
+    def rank(self, score, difficulty=None):
+        """score 在该难度全部历史成绩中的名次（比它高的成绩数 + 1）"""
+        scores = self._scores.get(difficulty, [])
+        return len(scores) - bisect_right(scores, score) + 1
+
+    def count(self, difficulty=None):
+        return len(self._scores.get(difficulty, []))
@@ -0,0 +1,44 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from core.generator import MathGenerator, QuestionBatch, NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# 分片大小固定，与进程数无关，保证任意进程数下结果逐位相同
+SHARD_SIZE = 1 << 18
+
+
+def split_seed(seed, count):
+    """把主种子拆分成 count 个互相独立的随机流 (numpy SeedSequence)"""
+    return np.random.SeedSequence(seed).spawn(count)
+
+
+def _generate_shard(task):
+    difficulty, number_range, operators, size, stream = task
+    generator = MathGenerator(difficulty, number_range=number_range)
+    return generator.generate_batch(size, operators, seed=np.random.default_rng(stream))
+
+
+def generate_pool(count, difficulty=1, operators=('+', '-', '*', '/'), seed=None,
+                  workers=None, number_range=None, shard_size=SHARD_SIZE):
+    """用进程池生成大题库，返回按分片顺序拼接的 QuestionBatch
+
+    题库被切成固定大小的分片，每个分片使用由 seed 派生的独立随机流，
+    所以对同一个 seed，workers=1 与多进程生成的结果完全一致。
+    workers 默认为 CPU 核数。
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("generate_pool 需要安装 NumPy: pip install numpy")
+    shards = max(1, -(-count // shard_size))
+    sizes = [shard_size] * (shards - 1) + [count - shard_size * (shards - 1)]
+    tasks = [(difficulty, number_range, tuple(operators), size, stream)
+             for size, stream in zip(sizes, split_seed(seed, shards))]
+
+    workers = min(workers or os.cpu_count() or 1, shards)
+    if workers == 1:
+        batches = map(_generate_shard, tasks)
+        return QuestionBatch.concatenate(batches)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return QuestionBatch.concatenate(pool.map(_generate_shard, tasks))
@@ -0,0 +1,106 @@
+import random
+import threading
+
+from core.facts import get_space
+from core.expression import apply_operator
+
+_MASK64 = (1 << 64) - 1
+
+
+class IndexPermutation:
+    """[0, size) 上的伪随机置换，不需要存储任何表
+
+    用 4 轮 Feistel 网络在不小于 size 的 2^2k 范围内构造置换，
+    再用循环游走 (cycle walking) 把结果限制在 [0, size) 内；
+    因为 2^2k < 4 * size，平均不到 4 次映射就能落入范围。
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size, seed=None):
+        if size <= 0:
+            raise ValueError("size 必须为正数")
+        self.size = size
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        rng = random.Random(seed)
+        self._keys = [rng.getrandbits(64) | 1 for _ in range(self.ROUNDS)]
+
+    def _round(self, value, key):
+        # 乘法 + 移位异或的简单混合函数
+        value = (value * 0x9E3779B97F4A7C15 + key) & _MASK64
+        value ^= value >> 29
+        value = (value * key) & _MASK64
+        return (value >> 32) & self._half_mask
+
+    def _encrypt(self, value):
+        bits, mask = self._half_bits, self._half_mask
+        left, right = value >> bits, value & mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << bits) | right
+
+    def __getitem__(self, position):
+        """第 position 个位置上的元素"""
+        if not 0 <= position < self.size:
+            raise IndexError(position)
+        value = self._encrypt(position)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def __len__(self):
+        return self.size
+
+
+class NoRepeatSession:
+    """不重复出题：按每个运算符题目空间的伪随机置换依次出题
+
+    每次出题 O(1)，除了当前位置外不占额外内存；一个运算符的题目全部出完后，
+    换一个新的置换开始下一轮。
+    """
+
+    def __init__(self, number_range=None, seed=None, spaces=None):
+        # spaces 为 {运算符: 题目空间}，不提供时按 number_range 建立
+        self.number_range = number_range
+        self.spaces = spaces
+        self.rng = random.Random(seed)
+        self._walks = {}  # operator -> [题目空间, IndexPermutation, 下一个位置, 已完成轮数]
+        self._lock = threading.Lock()  # 预生成线程和主线程可能同时取题
+
+    def _walk(self, operator):
+        walk = self._walks.get(operator)
+        if walk is None:
+            space = get_space(operator, self.number_range, self.spaces)
+            walk = [space, IndexPermutation(space.size, self.rng.getrandbits(64)), 0, 0]
+            self._walks[operator] = walk
+        return walk
+
+    def remaining(self, operator):
+        """本轮中 operator 还没出过的题目数"""
+        space, _, position, _ = self._walk(operator)
+        return space.size - position
+
+    def rounds(self, operator):
+        """operator 的题目已经完整出过几轮"""
+        return self._walk(operator)[3]
+
+    def next_question(self, operator='+'):
+        with self._lock:
+            walk = self._walk(operator)
+            space, permutation, position, _ = walk
+            if position >= space.size:
+                # 本轮出完，换新的置换重新开始
+                walk[1] = permutation = IndexPermutation(space.size, self.rng.getrandbits(64))
+                walk[3] += 1
+                position = 0
+            walk[2] = position + 1
+        a, b = space.fact(permutation[position])
+        return {
+            'question': f"{a} {operator} {b} = ?",
+            'answer': apply_operator(operator, a, b),
+            'a': a,
+            'operator': operator,
+            'b': b
+        }
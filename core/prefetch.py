@@ -0,0 +1,87 @@
+import threading
+from collections import deque
+
+
+class QuestionPrefetcher:
+    """后台线程按难度预先生成题目，取题时无需等待生成
+
+    factory(key) 负责生成一道题，key 一般是难度。每个 key 的队列最多缓存
+    depth 道题；工作线程只为最近一次请求的 key 补货。
+    """
+
+    def __init__(self, factory, depth=3):
+        self.factory = factory
+        self.depth = depth
+        self._queues = {}
+        self._wanted = None   # 工作线程当前补货的 key
+        self._epoch = 0       # 每次 flush 加一，丢弃旧批次中正在生成的题目
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="question-prefetch", daemon=True)
+        self._thread.start()
+
+    def get(self, key):
+        """取出一道 key 对应的题；队列为空时在调用线程中直接生成"""
+        with self._cond:
+            queue = self._queues.get(key)
+            item = queue.popleft() if queue else None
+            self._wanted = key
+            self._cond.notify()
+        if item is None:
+            item = self.factory(key)
+        return item
+
+    def prime(self, key):
+        """开始为 key 预先生成题目"""
+        with self._cond:
+            self._wanted = key
+            self._cond.notify()
+
+    def flush(self, key=None):
+        """清空所有队列并作废正在生成的题目，随后为 key 重新补货"""
+        with self._cond:
+            self._queues.clear()
+            self._epoch += 1
+            self._wanted = key
+            self._cond.notify()
+
+    def pending(self, key):
+        """key 队列中已就绪的题目数"""
+        with self._cond:
+            return len(self._queues.get(key, ()))
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=1)
+
+    def _needs_fill(self):
+        if self._wanted is None:
+            return False
+        return len(self._queues.get(self._wanted, ())) < self.depth
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._needs_fill():
+                    self._cond.wait()
+                if self._closed:
+                    return
+                key, epoch = self._wanted, self._epoch
+
+            try:
+                item = self.factory(key)
+            except Exception as e:
+                print(f"[错误] 预生成题目失败: {e}")
+                with self._cond:
+                    # 等下一次取题时再重试，避免反复报错
+                    if epoch == self._epoch and self._wanted == key:
+                        self._wanted = None
+                continue
+
+            with self._cond:
+                if epoch == self._epoch:
+                    queue = self._queues.setdefault(key, deque())
+                    if len(queue) < self.depth:
+                        queue.append(item)
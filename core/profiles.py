@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from core.expression import apply_operator
+from core.facts import FactSpace
+from core.generator import NUMPY_AVAILABLE, QuestionBatch
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'difficulty_profiles.json')
+OPERATORS = ('+', '-', '*', '/')
+
+
+class DivisionPairs:
+    """除法题的题目空间：除数和商各取一个范围，被除数 = 除数 x 商
+
+    接口与 FactSpace 相同（size / fact / index），全部 (被除数, 除数) 在编译时列出。
+    """
+
+    def __init__(self, divisor_range, quotient_range):
+        self.operator = '/'
+        self.a = array('q')
+        self.b = array('q')
+        pairs = sorted((d * q, d) for d in range(divisor_range[0], divisor_range[1] + 1)
+                       for q in range(quotient_range[0], quotient_range[1] + 1))
+        for a, b in pairs:
+            self.a.append(a)
+            self.b.append(b)
+        self._index = {pair: i for i, pair in enumerate(pairs)}
+        self.size = len(pairs)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return zip(self.a, self.b)
+
+    def fact(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return self.a[index], self.b[index]
+
+    def index(self, a, b):
+        try:
+            return self._index[(a, b)]
+        except KeyError:
+            raise ValueError(f"不在除法题目范围内: {a} / {b}") from None
+
+
+class DifficultyProfile:
+    """编译后的难度配置
+
+    每个运算符的合法题目编译成一个题目空间 (spaces)，运算符权重编译成累计权重表，
+    抽一道题只需两次随机数和一次 O(1) 的编号换算。spaces 也可以直接交给
+    AdaptiveSelector 和 NoRepeatSession 使用。
+    """
+
+    def __init__(self, name, config):
+        self.name = name
+        self.level = int(config.get('level', 1))
+        weights = config.get('operators') or {}
+        ranges = config.get('ranges') or {}
+        division = config.get('division')
+
+        self.spaces = {}
+        for operator in ('+', '-', '*'):
+            if operator in ranges:
+                self.spaces[operator] = FactSpace(operator, _range(name, operator, ranges[operator]))
+        if division:
+            divisor = _range(name, '/', division.get('divisor'))
+            if divisor[0] < 1:
+                raise ValueError(f"难度 {name!r} 中除数的最小值必须至少为 1: {division.get('divisor')!r}")
+            self.spaces['/'] = DivisionPairs(divisor, _range(name, '/', division.get('quotient')))
+        if self.spaces.get('/') is not None and not self.spaces['/'].size:
+            raise ValueError(f"难度 {name!r} 的除法范围为空")
+        if not self.spaces:
+            raise ValueError(f"难度 {name!r} 没有设置任何数值范围")
+        # 整体数值范围，供多步运算题等只能使用单一范围的场合
+        bounds = [(space.low, space.high) for space in self.spaces.values() if isinstance(space, FactSpace)]
+        if not bounds:
+            division = self.spaces['/']
+            bounds = [(min(division.a), max(division.a))]
+        self.number_range = (min(low for low, _ in bounds), max(high for _, high in bounds))
+
+        self.operators = tuple(op for op, weight in weights.items() if weight > 0)
+        for operator in self.operators:
+            if operator not in OPERATORS:
+                raise ValueError(f"难度 {name!r} 中不支持的运算符: {operator!r}")
+            if operator not in self.spaces:
+                raise ValueError(f"难度 {name!r} 没有设置 {operator!r} 的数值范围")
+        if not self.operators:
+            raise ValueError(f"难度 {name!r} 至少需要一个运算符")
+        self._cumulative = list(accumulate(weights[op] for op in self.operators))
+
+    def pick_operator(self, rng):
+        """按权重抽取一个运算符"""
+        return self.operators[bisect_right(self._cumulative, rng.random() * self._cumulative[-1])]
+
+    def sample(self, rng, operator=None):
+        """抽一道题；operator 为 None 时按权重选择运算符"""
+        operator = operator or self.pick_operator(rng)
+        try:
+            space = self.spaces[operator]
+        except KeyError:
+            raise ValueError(f"难度 {self.name!r} 没有设置 {operator!r} 的数值范围") from None
+        a, b = space.fact(int(rng.random() * space.size))
+        return {
+            'question': f"{a} {operator} {b} = ?",
+            'answer': apply_operator(operator, a, b),
+            'a': a,
+            'operator': operator,
+            'b': b,
+            'difficulty': self.name
+        }
+
+    def generate_batch(self, n, operators=None, seed=None):
+        """一次性生成 n 道题，返回列式的 QuestionBatch（需要 NumPy）
+
+        operators 为 None 时按配置的权重混合运算符，否则在给定的运算符中均匀混合；
+        seed 可以是整数或 numpy.random.Generator。
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("generate_batch 需要安装 NumPy: pip install numpy")
+        import numpy as np
+
+        if operators is None:
+            operators, weights = self.operators, np.diff(self._cumulative, prepend=0)
+            weights = weights / weights.sum()
+        else:
+            operators, weights = tuple(operators), None
+            if not operators:
+                raise ValueError("operators 不能为空")
+            for operator in operators:
+                if operator not in self.spaces:
+                    raise ValueError(f"难度 {self.name!r} 没有设置 {operator!r} 的数值范围")
+        rng = np.random.default_rng(seed)
+        choice = rng.choice(len(operators), n, p=weights)
+        op = np.empty(n, dtype=np.uint8)
+        a = np.empty(n, dtype=np.int64)
+        b = np.empty(n, dtype=np.int64)
+        answer = np.empty(n, dtype=np.int64)
+        for i, operator in enumerate(operators):
+            rows = np.nonzero(choice == i)[0]
+            space = self.spaces[operator]
+            a[rows], b[rows] = _facts(space, rng.integers(0, space.size, len(rows)))
+            op[rows] = OPERATORS.index(operator)
+            # 除法题目都能整除，整除结果就是精确的商
+            func = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.floor_divide}[operator]
+            answer[rows] = func(a[rows], b[rows])
+        return QuestionBatch(a, op, b, answer)
+
+
+def _facts(space, index):
+    """题目编号数组 -> (a 数组, b 数组)"""
+    import numpy as np
+
+    if isinstance(space, DivisionPairs):
+        return np.asarray(space.a)[index], np.asarray(space.b)[index]
+    if space.operator in ('+', '*'):
+        i, j = np.divmod(index, space.width)
+        return space.low + i, space.low + j
+    if space.operator == '-':
+        # 三角编号：i 为满足 i(i+1)/2 <= index 的最大整数，浮点开方后再修正一次
+        i = ((np.sqrt(8 * index + 1) - 1) // 2).astype(np.int64)
+        i -= i * (i + 1) // 2 > index
+        i += (i + 1) * (i + 2) // 2 <= index
+        return space.low + i, space.low + index - i * (i + 1) // 2
+    facts = np.array([space.fact(int(k)) for k in index], dtype=np.int64).reshape(-1, 2)
+    return facts[:, 0], facts[:, 1]
+
+
+def _range(name, operator, value):
+    try:
+        low, high = (int(x) for x in value)
+    except (TypeError, ValueError):
+        raise ValueError(f"难度 {name!r} 中 {operator!r} 的范围应为 [最小值, 最大值]: {value!r}") from None
+    if low > high or low < 0:
+        raise ValueError(f"难度 {name!r} 中 {operator!r} 的范围无效: {value!r}")
+    return low, high
+
+
+class ProfileSet:
+    """全部难度配置，按配置文件中的顺序排列"""
+
+    def __init__(self, profiles, default=None):
+        self.profiles = profiles
+        if not profiles:
+            raise ValueError("至少需要一个难度配置")
+        self.default = default if default in profiles else next(iter(profiles))
+
+    def __iter__(self):
+        return iter(self.profiles)
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __contains__(self, name):
+        return name in self.profiles
+
+    def __getitem__(self, name):
+        return self.profiles[name]
+
+    def get(self, name=None):
+        """按名称取难度，None 或未知名称返回默认难度"""
+        return self.profiles.get(name) or self.profiles[self.default]
+
+    def for_level(self, level):
+        """按整数等级 (1-3) 取难度，找不到时返回默认难度"""
+        for profile in self.profiles.values():
+            if profile.level == level:
+                return profile
+        return self.profiles[self.default]
+
+
+def load_profiles(path=DEFAULT_PATH):
+    """读取并编译难度配置文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    profiles = {name: DifficultyProfile(name, options) for name, options in config['profiles'].items()}
+    return ProfileSet(profiles, config.get('default'))
+
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def get_profiles(path=DEFAULT_PATH):
+    """返回编译好的难度配置；同一文件只编译一次，文件修改后重新编译"""
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = _CACHE[key] = (mtime, load_profiles(key))
+    return cached[1]
@@ -0,0 +1,142 @@
+"""二进制题库：预先生成某个难度配置中的全部合法题目，用 mmap 只读共享
+
+文件格式（小端）：
+    文件头 48 字节: 魔数 b'RJQB', 版本 (H), 记录长度 (H), 难度等级 (i), 4 字节填充,
+                    四个运算符各自的题目数 (4 x Q)
+    记录 16 字节:   a (i), b (i), 答案 (i), 运算符编号 (B), 3 字节填充
+记录按运算符 + - * / 分段，段内顺序与难度配置中题目空间的编号一致：
+减法只含 a >= b 的题目，除法只含能整除的题目；配置中没有的运算符题目数为 0。
+
+打开题库只读取文件头，抽题只读一条记录，耗时与题库大小无关；多个进程打开同一个
+文件时共用操作系统页缓存中的同一份数据。
+"""
+import mmap
+import os
+import random
+import struct
+
+from core.expression import apply_operator
+from core.generator import OPERATORS
+
+MAGIC = b'RJQB'
+VERSION = 2
+HEADER = struct.Struct('<4sHHi4x4Q')
+RECORD = struct.Struct('<iiiB3x')
+_CHUNK = 4096  # 每次写入的记录数
+
+
+def build_bank(path, profile):
+    """按难度配置 profile（core.profiles.DifficultyProfile）生成题库文件，返回题目总数
+
+    先写临时文件再原子替换，正在读取旧题库的进程不受影响。
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    counts = []
+    pack = RECORD.pack
+    with open(tmp_path, 'wb') as f:
+        f.write(bytes(HEADER.size))  # 写完记录后再回填文件头
+        for code, operator in enumerate(OPERATORS):
+            count = 0
+            chunk = []
+            for a, b in profile.spaces.get(operator, ()):
+                try:
+                    chunk.append(pack(a, b, apply_operator(operator, a, b), code))
+                except struct.error:
+                    raise ValueError(f"难度 {profile.name!r} 的数值超出 32 位整数: {a} {operator} {b}") from None
+                if len(chunk) == _CHUNK:
+                    f.write(b''.join(chunk))
+                    count += len(chunk)
+                    chunk = []
+            f.write(b''.join(chunk))
+            counts.append(count + len(chunk))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, profile.level, *counts))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return sum(counts)
+
+
+class QuestionBank:
+    """只读的 mmap 题库"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, record_size, level, *counts = HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+                raise ValueError(f"不是有效的题库文件或版本不兼容: {path}")
+            if len(self._mmap) != HEADER.size + sum(counts) * RECORD.size:
+                raise ValueError(f"题库文件不完整: {path}")
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise
+        self.level = level
+        self._counts = dict(zip(OPERATORS, counts))
+        self._starts = {}
+        start = 0
+        for operator in OPERATORS:
+            self._starts[operator] = start
+            start += self._counts[operator]
+        self._size = start
+
+    def __len__(self):
+        return self._size
+
+    def count(self, operator):
+        return self._counts[operator]
+
+    def record(self, index):
+        """第 index 条记录，返回 (a, 运算符, b, 答案)"""
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        a, b, answer, code = RECORD.unpack_from(self._mmap, HEADER.size + index * RECORD.size)
+        return a, OPERATORS[code], b, answer
+
+    def question(self, index):
+        a, operator, b, answer = self.record(index)
+        return {
+            'question': f"{a} {operator} {b} = ?",
+            'answer': answer,
+            'a': a,
+            'operator': operator,
+            'b': b
+        }
+
+    def sample(self, rng=random, operator=None):
+        """均匀抽取一道题；指定 operator 时只在该运算符的题目中抽取"""
+        if operator is None:
+            start, count = 0, self._size
+        else:
+            try:
+                start, count = self._starts[operator], self._counts[operator]
+            except KeyError:
+                raise ValueError(f"不支持的运算符: {operator!r}") from None
+        if not count:
+            raise ValueError(f"题库中没有 {operator or ''} 题目")
+        return self.question(start + int(rng.random() * count))
+
+    def as_array(self, operator=None):
+        """以 NumPy 结构化数组的形式返回记录（直接引用 mmap，不复制，只读）
+
+        数组还在使用时不能 close()，否则 mmap 会抛出 BufferError。
+        """
+        import numpy as np
+
+        dtype = np.dtype([('a', '<i4'), ('b', '<i4'), ('answer', '<i4'), ('op', 'u1'), ('pad', 'V3')])
+        start, count = (0, self._size) if operator is None else (self._starts[operator], self._counts[operator])
+        return np.frombuffer(self._mmap, dtype=dtype, count=count, offset=HEADER.size + start * RECORD.size)
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,82 @@
+"""限时冲刺模式的计时和计分
+
+冲刺按单调时钟计时，答对后立即出下一题，所以每道题的用时就是两次答对之间的间隔
+（第一题从开始时算起）。成绩是每分钟答对的题数；用时分位数用直方图随作答实时更新，
+结束时不需要重新统计。
+"""
+import time
+
+from core.instrumentation import Histogram
+
+# 题目用时的分桶上界（秒）：0.1 秒到约 60 秒，每档 1.1 倍，分位数误差不超过 10%
+SPRINT_BUCKETS = tuple(round(0.1 * 1.1 ** i, 4) for i in range(68))
+
+
+class Sprint:
+    """一次限时冲刺"""
+
+    def __init__(self, duration=60.0, clock=time.monotonic):
+        if duration <= 0:
+            raise ValueError(f"冲刺时长必须大于 0: {duration!r}")
+        self.duration = duration
+        self.clock = clock
+        self.latencies = Histogram(SPRINT_BUCKETS)
+        self.correct = 0
+        self.attempts = 0
+        self.started_at = None
+        self._question_started_at = None
+
+    def start(self):
+        self.started_at = self._question_started_at = self.clock()
+        self.correct = self.attempts = 0
+        self.latencies = Histogram(SPRINT_BUCKETS)
+
+    def elapsed(self):
+        """已用时间（秒），不超过冲刺时长"""
+        if self.started_at is None:
+            return 0.0
+        return min(self.clock() - self.started_at, self.duration)
+
+    def remaining(self):
+        return self.duration - self.elapsed()
+
+    @property
+    def finished(self):
+        return self.started_at is not None and self.clock() - self.started_at >= self.duration
+
+    def answer(self, is_correct):
+        """记录一次作答，返回当前题目已用的时间（秒）
+
+        答对时这道题计入用时统计，下一题从现在开始计时；答错时继续计时。
+        时间到了之后的作答不计入，抛出 RuntimeError。
+        """
+        if self.started_at is None:
+            raise RuntimeError("冲刺还没有开始")
+        now = self.clock()
+        if now - self.started_at >= self.duration:
+            raise RuntimeError("冲刺已经结束")
+        latency = now - self._question_started_at
+        self.attempts += 1
+        if is_correct:
+            self.correct += 1
+            self.latencies.observe(latency)
+            self._question_started_at = now
+        return latency
+
+    def questions_per_minute(self):
+        elapsed = self.elapsed()
+        return self.correct * 60 / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        """当前成绩：答对数、作答数、正确率、每分钟题数和用时分位数（秒）"""
+        latencies = self.latencies
+        return {
+            'correct': self.correct,
+            'attempts': self.attempts,
+            'accuracy': self.correct / self.attempts if self.attempts else 0.0,
+            'qpm': self.questions_per_minute(),
+            'mean': latencies.sum / latencies.count if latencies.count else 0.0,
+            'p50': latencies.percentile(0.50),
+            'p90': latencies.percentile(0.90),
+            'p99': latencies.percentile(0.99),
+        }
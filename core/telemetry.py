@@ -0,0 +1,87 @@
+import os
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from core.generator import OPERATORS
+
+# 每次作答一条定长记录（22 字节，小端、无填充）：
+# 时间戳(秒) | 操作数a | 运算符编码 | 操作数b | 答案 | 是否正确 | 用时(毫秒)
+RECORD = struct.Struct('<IiBiiBI')
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+Attempt = namedtuple('Attempt', 'timestamp a operator b answer correct latency')
+
+
+class AttemptRecorder:
+    """按次记录作答用时，攒够一批后交给后台线程写盘
+
+    record() 只把一条定长记录追加到内存缓冲区，不做任何 I/O；
+    缓冲区满 batch_size 条时整块交给写线程追加到文件末尾。
+    """
+
+    def __init__(self, path, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer = bytearray()
+        self._count = 0
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="telemetry-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, a, operator, b, answer, correct, latency):
+        """记录一次作答，latency 为秒（建议用 time.monotonic() 计算）
+
+        操作数或答案超出 32 位整数时跳过这条记录并返回 False，不影响答题流程。
+        """
+        a, b, answer = int(a), int(b), int(answer)
+        if not all(_INT32_MIN <= value <= _INT32_MAX for value in (a, b, answer)):
+            print(f"[警告] 数值超出 32 位整数，不记录本次作答: {a} {operator} {b} = {answer}")
+            return False
+        self._buffer += RECORD.pack(
+            int(time.time()), a, OPERATORS.index(operator), b, answer,
+            1 if correct else 0, min(max(int(latency * 1000), 0), 0xFFFFFFFF)
+        )
+        self._count += 1
+        if self._count >= self.batch_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        """把缓冲区交给写线程（不等待写完）"""
+        if self._buffer:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+            self._count = 0
+
+    def close(self):
+        """写出剩余记录并等待写线程结束"""
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+
+    def _write_loop(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, 'ab') as f:
+                    f.write(chunk)
+            except OSError as e:
+                print(f"[错误] 写入作答记录失败: {e}")
+
+
+def read_attempts(path):
+    """逐条读取作答记录文件，返回 Attempt"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    # 忽略末尾不完整的记录
+    usable = len(data) - len(data) % RECORD.size
+    for timestamp, a, op, b, answer, correct, latency in RECORD.iter_unpack(data[:usable]):
+        yield Attempt(timestamp, a, OPERATORS[op], b, answer, bool(correct), latency / 1000)
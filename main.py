@@ -1,30 +1,189 @@
-from core.generator import MathGenerator
+import argparse
+import os
+import random
+import sys
+
+from core.adaptive import AdaptiveSelector
 from core.evaluator import Evaluator
 from core.data_handler import DataHandler
-from ui.tkinter_ui import MathTrainerUI
+from core.permutation import NoRepeatSession
+from core.profiles import get_profiles
 
 class MathTrainerApp:
-    def __init__(self):
+    def __init__(self, no_repeat=False, metrics_path=None, config_dir=None):
         # 初始化核心组件
-        self.generator = MathGenerator(difficulty=1)  # 默认初级难度
+        # config_dir 为保存设置、练习记录、排行榜和作答记录的目录，默认使用 config/
+        # 难度配置 (config/difficulty_profiles.json) 只编译一次；每个难度的出题状态按需建立并缓存，
+        # 练习中切换难度不需要重新建表
+        self.profiles = get_profiles()
+        self.rng = random.Random()
+        self._selectors = {}  # 难度名 -> AdaptiveSelector，按掌握程度出题
+        # 不重复模式：每局练习按置换依次出题，同一局内不会出现重复的题目
+        self.no_repeat = no_repeat
+        self._sessions = {}   # 难度名 -> NoRepeatSession
         self.evaluator = Evaluator()
-        self.data_handler = DataHandler()
-        
-        # 创建UI
-        self.ui = MathTrainerUI(self)
-        
-    def generate_question(self, operator='+'):
-        """生成题目（供UI调用）"""
-        return self.generator.generate_question(operator)
-        
+        self.config_dir = config_dir
+        self.data_handler = DataHandler(os.path.join(config_dir, 'settings.json')) if config_dir else DataHandler()
+
+        # 性能统计默认关闭；关闭时不包装任何方法，没有额外开销
+        self.metrics = None
+        if metrics_path:
+            from core.instrumentation import Metrics, install_dump, instrument
+            self.metrics = Metrics()
+            instrument(self, ('generate_question', 'check_answer', 'record_attempt', 'save_score'),
+                       'app', self.metrics)
+            instrument(self.data_handler, ('save_score', 'rebuild_store'), 'data_handler', self.metrics)
+            install_dump(self.metrics, metrics_path)
+
+        # 创建UI（延迟导入，无界面模式不加载 tkinter）
+        from ui.tkinter_ui import EnhancedMathTrainerUI
+        self.ui = EnhancedMathTrainerUI(self)
+        if self.metrics is not None:
+            from core.instrumentation import watch_event_loop
+            watch_event_loop(self.ui.window, self.metrics)
+
+    def _selector(self, profile):
+        selector = self._selectors.get(profile.name)
+        if selector is None:
+            # 预生成线程和主线程可能同时第一次用到同一个难度
+            selector = self._selectors.setdefault(profile.name, AdaptiveSelector(spaces=profile.spaces))
+        return selector
+
+    def _session(self, profile):
+        session = self._sessions.get(profile.name)
+        if session is None:
+            session = self._sessions.setdefault(profile.name, NoRepeatSession(spaces=profile.spaces))
+        return session
+
+    def generate_question(self, operator=None, difficulty=None):
+        """生成题目（供UI调用）
+
+        difficulty 为难度名称（默认使用配置中的默认难度）；operator 为 None 时按难度配置的权重选择。
+        """
+        profile = self.profiles.get(difficulty)
+        operator = operator or profile.pick_operator(self.rng)
+        if self.no_repeat:
+            question = self._session(profile).next_question(operator)
+        else:
+            question = self._selector(profile).next_question(operator)
+        question['difficulty'] = profile.name
+        return question
+
+    def start_session(self):
+        """开始新一局练习（供UI调用）"""
+        if self.no_repeat:
+            self._sessions.clear()
+
     def check_answer(self, user_answer, correct_answer):
         """检查答案（供UI调用）"""
         return self.evaluator.check_answer(user_answer, correct_answer)
-        
+
+    def record_attempt(self, question, correct, latency):
+        """记录一次作答，更新自适应出题的权重（供UI调用）"""
+        profile = self.profiles.get(question.get('difficulty'))
+        self._selector(profile).record(question['a'], question['operator'], question['b'], correct, latency)
+
+    def save_score(self, total, correct, time_used, difficulty=None):
+        """保存一局练习的成绩（供UI调用），记录中的难度保存为难度配置中的整数等级（与教室服务器相同）"""
+        level = self.profiles.get(difficulty).level if difficulty is not None else None
+        self.data_handler.save_score(total, correct, time_used, difficulty=level)
+
     def run(self):
         """启动应用"""
         self.ui.run()
 
+def _export(args):
+    """无界面导出练习题"""
+    from core.exporter import export_questions
+
+    sections = [(difficulty, operators, args.count)
+                for difficulty in args.difficulty
+                for operators in args.operators]
+    total = export_questions(args.output, sections, fmt=args.format, seed=args.seed)
+    print(f"已导出 {total} 道题到 {args.output}")
+
+def _build_bank(args):
+    """生成 mmap 二进制题库，题目范围与界面中同等级的难度配置相同"""
+    from core.question_bank import build_bank
+
+    for difficulty in args.difficulty:
+        profile = get_profiles().for_level(difficulty)
+        path = os.path.join(args.output, f"level{profile.level}.qbank")
+        total = build_bank(path, profile)
+        print(f"难度 {profile.level} ({profile.name}): 已写入 {total} 道题到 {path}")
+
+def _check_export(args, parser):
+    """检查导出参数，不合法时由 argparse 报错退出，不抛出异常堆栈"""
+    from core.exporter import FORMATS
+
+    fmt = args.format or args.output.rsplit('.', 1)[-1].lower()
+    if fmt not in FORMATS:
+        parser.error(f"无法从 {args.output!r} 判断导出格式，请用 --format 指定 ({', '.join(FORMATS)})")
+    if args.count < 0:
+        parser.error(f"题目数不能为负数: {args.count}")
+    profiles = get_profiles()
+    for difficulty in args.difficulty:
+        profile = profiles.for_level(difficulty)
+        for operators in args.operators:
+            if not operators:
+                parser.error("运算符组合不能为空")
+            for operator in operators:
+                if operator not in profile.spaces:
+                    parser.error(f"难度 {difficulty} ({profile.name}) 不支持运算符 {operator!r}，"
+                                 f"可选 {''.join(profile.spaces)}")
+
+def _serve(args):
+    """以教室服务器模式运行"""
+    from server.classroom import run
+    run(args.host, args.port)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="小学生速算乐园")
+    # 可选的难度等级取自难度配置文件，新增的难度不需要改这里
+    levels = sorted({profile.level for profile in get_profiles().profiles.values()})
+    commands = parser.add_subparsers(dest='command')
+
+    export = commands.add_parser('export', help="不启动界面，导出练习题 (CSV / JSONL / HTML)")
+    export.add_argument('output', help="输出文件路径")
+    export.add_argument('--format', choices=('csv', 'jsonl', 'html'),
+                        help="导出格式，默认取输出文件的扩展名")
+    export.add_argument('-n', '--count', type=int, default=100,
+                        help="每种难度与运算符组合导出的题目数")
+    export.add_argument('-d', '--difficulty', type=int, nargs='+', choices=levels, default=[levels[0]],
+                        help="难度级别，可指定多个")
+    export.add_argument('-o', '--operators', nargs='+', default=['+-*/'],
+                        help="运算符组合，例如 +- 或 */，可指定多个")
+    export.add_argument('--seed', type=int, help="随机种子，相同种子导出相同题目")
+
+    bank = commands.add_parser('build-bank', help="预先生成全部合法题目的二进制题库 (mmap 读取)")
+    bank.add_argument('-o', '--output', default=os.path.join('config', 'banks'),
+                      help="输出目录，每个难度生成一个 level<难度>.qbank 文件")
+    bank.add_argument('-d', '--difficulty', type=int, nargs='+', choices=levels, default=levels,
+                      help="难度级别，可指定多个")
+
+    serve = commands.add_parser('serve', help="以教室服务器模式运行 (HTTP / WebSocket)")
+    serve.add_argument('--host', default='127.0.0.1', help="监听地址，机房使用时可设为 0.0.0.0")
+    serve.add_argument('--port', type=int, default=8765, help="监听端口")
+
+    parser.add_argument('--no-repeat', action='store_true', help="同一局练习中不出重复的题目")
+    parser.add_argument('--metrics', metavar='PATH', default=os.environ.get('RJGC_METRICS'),
+                        help="记录性能统计，退出时（或收到 SIGUSR1 时）写入 PATH；"
+                             ".prom/.txt 为 Prometheus 文本格式，其他为 JSON")
+
+    args = parser.parse_args(argv)
+    if args.command == 'export':
+        _check_export(args, export)
+        _export(args)
+        return
+    if args.command == 'build-bank':
+        _build_bank(args)
+        return
+    if args.command == 'serve':
+        _serve(args)
+        return
+
+    app = MathTrainerApp(no_repeat=args.no_repeat, metrics_path=args.metrics)
+    app.run()
+
 if __name__ == "__main__":
-    app = MathTrainerApp()
-    app.run()
\ No newline at end of file
+    sys.exit(main())
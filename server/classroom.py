@@ -0,0 +1,314 @@
+"""教室服务器模式：一个进程为整个机房提供出题、判题和成绩保存
+
+HTTP 接口（JSON，支持 keep-alive）：
+    POST /session   {"name": "小明", "difficulty": 1}   -> {"session": ID}，难度为难度配置中的等级
+    GET  /question?session=ID[&operator=+]             -> {"question": "3 + 4 = ?"}
+    POST /answer    {"session": ID, "answer": "7"}      -> {"correct": true, ...}
+    POST /score     {"session": ID}                     -> 保存成绩并结束会话
+    GET  /stats                                         -> 服务器状态
+WebSocket 接口：连接 /ws，发送 {"action": "session" | "question" | "answer" | "score", ...}，
+参数与对应的 HTTP 接口相同，同一连接上的 session 会自动记住。
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import secrets
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from core.data_handler import DataHandler
+from core.evaluator import Evaluator
+from core.profiles import get_profiles
+
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large"}
+_MAX_BODY = 64 * 1024
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Session:
+    """单个学生的练习状态"""
+    __slots__ = ('name', 'difficulty', 'question', 'total', 'correct', 'started_at', 'last_seen')
+
+    def __init__(self, name, difficulty):
+        self.name = name
+        self.difficulty = difficulty
+        self.question = None
+        self.total = 0
+        self.correct = 0
+        self.started_at = self.last_seen = time.monotonic()
+
+
+class ClassroomServer:
+    def __init__(self, data_handler=None, session_timeout=3600, profiles=None):
+        self.evaluator = Evaluator()
+        # 与桌面版共用难度配置，成绩记录中的难度等级含义相同
+        self.profiles = profiles or get_profiles()
+        self.levels = {self.profiles[name].level: self.profiles[name] for name in self.profiles}
+        self.rng = random.Random()
+        self.sessions = {}
+        self.session_timeout = session_timeout
+        self.requests = 0
+        # DataHandler 会 fsync 和写 SQLite，放到专用线程中执行，不阻塞事件循环；
+        # SQLite 连接只能在创建它的线程中使用，所以 DataHandler 也在该线程中创建
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="classroom-io")
+        self._data_handler = data_handler
+        self._server = None
+
+    # ---- 业务逻辑（HTTP 与 WebSocket 共用） ----
+
+    def _session(self, params):
+        session_id = params.get('session')
+        if session_id is not None and not isinstance(session_id, str):
+            raise RequestError(400, "session 必须是字符串")
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise RequestError(404, "会话不存在或已结束")
+        session.last_seen = time.monotonic()
+        return session
+
+    async def dispatch(self, action, params):
+        self.requests += 1
+        if action == 'session':
+            try:
+                difficulty = int(params.get('difficulty', 1))
+            except (TypeError, ValueError):
+                difficulty = 0
+            if difficulty not in self.levels:
+                raise RequestError(400, f"difficulty 必须是 {'、'.join(map(str, sorted(self.levels)))} 之一")
+            session_id = secrets.token_hex(8)
+            self.sessions[session_id] = Session(str(params.get('name', '')), difficulty)
+            return {'session': session_id}
+
+        if action == 'question':
+            session = self._session(params)
+            profile = self.levels[session.difficulty]
+            operator = params.get('operator') or profile.pick_operator(self.rng)
+            if not isinstance(operator, str):
+                raise RequestError(400, "operator 必须是字符串")
+            if operator not in profile.spaces:
+                raise RequestError(400, f"当前难度不支持的运算符: {operator}")
+            session.question = profile.sample(self.rng, operator)
+            return {'question': session.question['question']}
+
+        if action == 'answer':
+            session = self._session(params)
+            if session.question is None:
+                raise RequestError(400, "请先获取题目")
+            answer = session.question['answer']
+            correct = self.evaluator.check_answer(params.get('answer'), answer)
+            session.question = None
+            session.total += 1
+            session.correct += correct
+            return {'correct': correct, 'answer': answer,
+                    'total': session.total, 'score': session.correct}
+
+        if action == 'score':
+            session = self._session(params)
+            del self.sessions[params['session']]
+            time_used = round(time.monotonic() - session.started_at, 1)
+            await asyncio.get_running_loop().run_in_executor(
+                self._io, self._save_score, session, time_used)
+            return {'total': session.total, 'correct': session.correct, 'time_used': time_used}
+
+        if action == 'stats':
+            return {'sessions': len(self.sessions), 'requests': self.requests}
+
+        raise RequestError(404, f"未知的接口: {action}")
+
+    def _save_score(self, session, time_used):
+        if self._data_handler is None:
+            self._data_handler = DataHandler()
+        self._data_handler.save_score(session.total, session.correct, time_used,
+                                      user=session.name, difficulty=session.difficulty)
+
+    async def _expire_sessions(self):
+        while True:
+            await asyncio.sleep(60)
+            deadline = time.monotonic() - self.session_timeout
+            for session_id in [k for k, s in self.sessions.items() if s.last_seen < deadline]:
+                del self.sessions[session_id]
+
+    # ---- HTTP ----
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                method, target, headers = self._parse_head(head)
+                if target == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                    await self._handle_websocket(reader, writer, headers)
+                    return
+                length = headers.get('content-length', '').strip() or '0'
+                if not length.isdigit():
+                    # 无法确定请求体在哪里结束，回复 400 后关闭连接
+                    await self._write_response(writer, 400, {'error': "无效的 Content-Length"}, False)
+                    return
+                length = int(length)
+                if length > _MAX_BODY:
+                    # 不读取过大的请求体，回复 413 后关闭连接
+                    await self._write_response(writer, 413, {'error': f"请求体不能超过 {_MAX_BODY} 字节"}, False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self._handle_http(method, target, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write_response(writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+        await writer.drain()
+
+    @staticmethod
+    def _parse_head(head):
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            method, target = "GET", "/"
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return method, target, headers
+
+    async def _handle_http(self, method, target, body):
+        url = urlsplit(target)
+        action = url.path.strip('/')
+        params = dict(parse_qsl(url.query))
+        if method == 'POST':
+            try:
+                params.update(json.loads(body or b"{}"))
+            except (ValueError, TypeError):
+                return 400, {'error': "请求体不是有效的 JSON"}
+        elif method != 'GET':
+            return 405, {'error': f"不支持的方法: {method}"}
+        try:
+            return 200, await self.dispatch(action, params)
+        except RequestError as e:
+            return e.status, {'error': str(e)}
+
+    # ---- WebSocket ----
+
+    async def _handle_websocket(self, reader, writer, headers):
+        key = headers.get('sec-websocket-key', '').encode('latin-1')
+        accept = base64.b64encode(hashlib.sha1(key + _WS_GUID).digest()).decode('ascii')
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode('latin-1'))
+        await writer.drain()
+
+        session_id = None
+        while True:
+            opcode, payload = await _read_frame(reader)
+            if opcode == 0x8:  # close
+                writer.write(_encode_frame(0x8, payload[:2]))
+                await writer.drain()
+                return
+            if opcode == 0x9:  # ping
+                writer.write(_encode_frame(0xA, payload))
+                await writer.drain()
+                continue
+            if opcode != 0x1:
+                continue
+            try:
+                message = json.loads(payload)
+                if not isinstance(message, dict):
+                    raise RequestError(400, "消息不是有效的 JSON 对象")
+                action = message.pop('action', '')
+                if not isinstance(action, str):
+                    raise RequestError(400, "action 必须是字符串")
+                message.setdefault('session', session_id)
+                result = await self.dispatch(action, message)
+                if action == 'session':
+                    session_id = result['session']
+            except RequestError as e:
+                result = {'error': str(e)}
+            except ValueError:  # 包括 JSONDecodeError 和 UTF-8 解码错误
+                result = {'error': "消息不是有效的 JSON 对象"}
+            writer.write(_encode_frame(0x1, json.dumps(result, ensure_ascii=False).encode('utf-8')))
+            await writer.drain()
+
+    # ---- 启动 ----
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        self._server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        expiry = asyncio.create_task(self._expire_sessions())
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            expiry.cancel()
+            self._io.shutdown(wait=True)
+
+
+async def _read_frame(reader):
+    """读取一帧 WebSocket 数据，返回 (opcode, payload)；不支持分片帧"""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length, = struct.unpack('!H', await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack('!Q', await reader.readexactly(8))
+    if length > _MAX_BODY:
+        raise ConnectionError("WebSocket 帧过大")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def _encode_frame(opcode, payload, mask=False):
+    """编码一帧 WebSocket 数据；客户端发送时必须 mask"""
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack('!H', length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack('!Q', length)
+    if mask:
+        key = secrets.token_bytes(4)
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        header += key
+    return bytes(header) + payload
+
+
+def run(host='127.0.0.1', port=8765):
+    print(f"[调试信息] 教室服务器已启动: http://{host}:{port}")
+    try:
+        asyncio.run(ClassroomServer().serve(host, port))
+    except KeyboardInterrupt:
+        pass
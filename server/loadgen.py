@@ -0,0 +1,102 @@
+"""教室服务器压测客户端：模拟多名学生同时答题，统计吞吐量和延迟
+
+用法: python -m server.loadgen [--clients 500] [--duration 10] [--port 8765]
+每个客户端使用一条 keep-alive 连接，循环执行 取题 -> 作答。
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from core.expression import apply_operator
+
+
+class _Client:
+    def __init__(self, reader, writer, host):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        status = int(head.split(b" ", 2)[1])
+        data = json.loads(await self.reader.readexactly(length))
+        if status != 200:
+            raise RuntimeError(f"{path}: {status} {data}")
+        return data
+
+
+def _solve(question):
+    a, operator, b = question.split(" ")[0:3]
+    return apply_operator(operator, int(a), int(b))
+
+
+async def _student(host, port, deadline, latencies, index):
+    reader, writer = await asyncio.open_connection(host, port)
+    client = _Client(reader, writer, host)
+    try:
+        session = (await client.request('POST', '/session',
+                                        {'name': f"student{index}", 'difficulty': 1 + index % 3}))['session']
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            question = (await client.request('GET', f"/question?session={session}"))['question']
+            latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await client.request('POST', '/answer', {'session': session, 'answer': str(_solve(question))})
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_load(host='127.0.0.1', port=8765, clients=500, duration=10.0):
+    """运行压测，返回 {'requests', 'rps', 'p50_ms', 'p99_ms', 'errors'}"""
+    latencies = []
+    started = time.perf_counter()
+    deadline = started + duration
+    results = await asyncio.gather(
+        *(_student(host, port, deadline, latencies, i) for i in range(clients)),
+        return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    errors = [r for r in results if isinstance(r, Exception)]
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'errors': len(errors),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="教室服务器压测")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=500, help="并发学生数")
+    parser.add_argument('--duration', type=float, default=10.0, help="压测时长（秒）")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(run_load(args.host, args.port, args.clients, args.duration))
+    print(f"请求数 {stats['requests']}  吞吐 {stats['rps']:.0f} 请求/秒  "
+          f"p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms  失败连接 {stats['errors']}")
+
+
+if __name__ == '__main__':
+    main()
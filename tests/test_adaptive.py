@@ -0,0 +1,66 @@
+import random
+import unittest
+from collections import Counter
+
+from core.adaptive import AdaptiveSelector, FenwickTree
+from core.facts import FactSpace
+
+
+class TestFactSpace(unittest.TestCase):
+    def test_round_trip(self):
+        """测试编号与题目一一对应且都是合法题目"""
+        for op in ('+', '-', '*', '/'):
+            space = FactSpace(op, (0, 30))
+            seen = set()
+            for index in range(len(space)):
+                a, b = space.fact(index)
+                self.assertEqual(space.index(a, b), index)
+                seen.add((a, b))
+                if op == '-':
+                    self.assertGreaterEqual(a, b)
+                if op == '/':
+                    self.assertEqual(a % b, 0)
+            self.assertEqual(len(seen), len(space))
+
+        self.assertEqual(len(FactSpace('-', (0, 10))), 66)
+        # 0 ÷ b 只算一道题，不会占去大量除法题目
+        self.assertEqual(len(FactSpace('/', (0, 10))), 1 + 27)
+        self.assertEqual(FactSpace('/', (0, 10)).index(0, 3), FactSpace('/', (0, 10)).index(0, 10))
+        with self.assertRaises(ValueError):
+            FactSpace('/', (0, 10)).index(7, 2)
+
+
+class TestAdaptive(unittest.TestCase):
+    def test_fenwick_find(self):
+        """测试树状数组按前缀和定位"""
+        weights = [random.random() for _ in range(257)]
+        tree = FenwickTree(len(weights))
+        for i, w in enumerate(weights):
+            tree.add(i, w)
+        prefix = 0.0
+        for i, w in enumerate(weights):
+            self.assertEqual(tree.find(prefix + w / 2), i)
+            prefix += w
+        self.assertAlmostEqual(tree.total, sum(weights))
+
+    def test_missed_facts_come_back_more_often(self):
+        """测试答错且答得慢的题目被更频繁地抽到"""
+        selector = AdaptiveSelector((0, 10), seed=1)
+        for a in range(11):
+            for b in range(11):
+                correct = (a, b) != (7, 8)
+                for _ in range(5):
+                    selector.record(a, '*', b, correct, 1.0 if correct else 12.0)
+        self.assertEqual(selector.mastery(7, '*', 8), (5, 5, 12.0))
+
+        counts = Counter()
+        for _ in range(3000):
+            q = selector.next_question('*')
+            self.assertEqual(q['a'] * q['b'], q['answer'])
+            counts[(q['a'], q['b'])] += 1
+        self.assertEqual(counts.most_common(1)[0][0], (7, 8))
+        self.assertGreater(counts[(7, 8)], 3000 / 121 * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
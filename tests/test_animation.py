@@ -0,0 +1,123 @@
+import unittest
+
+from ui.animation import Animator
+
+
+class FakeMaster:
+    """模拟 Tk 的 after()，由测试手动推进时间"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.pending = {}
+        self._ids = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, callback):
+        self._ids += 1
+        self.pending[self._ids] = (self.now + ms / 1000, callback)
+        return self._ids
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def advance(self, seconds, lag=0.0):
+        """推进时间并执行到期的回调；lag 模拟事件循环被阻塞的时间"""
+        end = self.now + seconds
+        while True:
+            due = [(t, i) for i, (t, _) in self.pending.items() if t <= end]
+            if not due:
+                break
+            t, after_id = min(due)
+            _, callback = self.pending.pop(after_id)
+            self.now = max(self.now, t + lag)
+            callback()
+        self.now = max(self.now, end)
+
+
+class FakeWidget:
+    def __init__(self):
+        self.calls = []
+
+    def configure(self, **options):
+        self.calls.append(('config', options))
+
+    def place_configure(self, **options):
+        self.calls.append(('place', options))
+
+
+class TestAnimator(unittest.TestCase):
+    def setUp(self):
+        self.master = FakeMaster()
+        self.animator = Animator(self.master, fps=50, clock=self.master.clock)
+        self.widget = FakeWidget()
+
+    def test_frames_applied_in_order(self):
+        """测试关键帧按时间顺序应用，播完后节拍停止"""
+        self.animator.play('flash', [(0.0, self.widget, 'config', {'foreground': 'green'}),
+                                     (0.1, self.widget, 'config', {'foreground': 'black'})])
+        self.master.advance(0.05)
+        self.assertEqual(self.widget.calls, [('config', {'foreground': 'green'})])
+        self.master.advance(0.1)
+        self.assertEqual(self.widget.calls[-1], ('config', {'foreground': 'black'}))
+        self.assertFalse(self.animator.active('flash'))
+        self.assertEqual(self.master.pending, {})
+
+    def test_late_tick_merges_changes(self):
+        """测试节拍来晚时同一控件的多个改动合并成一次调用，只保留最新状态"""
+        frames = [(i * 0.01, self.widget, 'place', {'x': i}) for i in range(5)]
+        frames.append((0.0, self.widget, 'config', {'font': 'big'}))
+        self.animator.play('shake', frames)
+        self.master.advance(0.02, lag=0.1)
+        self.assertEqual(sorted(self.widget.calls),
+                         [('config', {'font': 'big'}), ('place', {'x': 4})])
+        self.assertGreaterEqual(self.animator.lag_stats()['max_ms'], 99)
+
+    def test_cancel_finish_restores_final_state(self):
+        """测试取消动画时可以直接跳到结束状态，且不执行回调"""
+        called = []
+        self.animator.play('shake', [(0.0, self.widget, 'place', {'x': 5}),
+                                     (0.3, self.widget, 'place', {'x': 0}),
+                                     (0.3, None, 'call', lambda: called.append(1))])
+        self.master.advance(0.05)
+        self.animator.cancel('shake', finish=True)
+        self.assertEqual(self.widget.calls[-1], ('place', {'x': 0}))
+        self.master.advance(1.0)
+        self.assertEqual(called, [])
+
+    def test_schedule_replaces_same_name(self):
+        """测试同名延时回调会替换旧的，只执行一次"""
+        called = []
+        self.animator.schedule('clear', 1.0, lambda: called.append('old'))
+        self.master.advance(0.5)
+        self.animator.schedule('clear', 1.0, lambda: called.append('new'))
+        self.master.advance(0.8)
+        self.assertEqual(called, [])
+        self.master.advance(0.3)
+        self.assertEqual(called, ['new'])
+
+    def test_delayed_callbacks_do_not_run_frame_tick(self):
+        """测试只有延时回调时只安排一次到期唤醒，动画播完后不再逐帧运行"""
+        called = []
+        self.animator.schedule('clear', 3.0, lambda: called.append('clear'))
+        self.assertEqual([due for due, _ in self.master.pending.values()], [3.0])
+        self.animator.schedule('next', 1.0, lambda: called.append('next'))
+        self.assertEqual([due for due, _ in self.master.pending.values()], [1.0])
+        self.animator.play('flash', [(0.0, self.widget, 'config', {'foreground': 'green'}),
+                                     (0.1, self.widget, 'config', {'foreground': 'black'})])
+        self.assertEqual([due for due, _ in self.master.pending.values()], [0.02])
+
+        ticks = len(self.animator.lags)
+        self.master.advance(0.2)
+        self.assertEqual(self.widget.calls[-1], ('config', {'foreground': 'black'}))
+        # 动画在 0.1 秒播完后只剩 1.0 秒的回调
+        self.assertEqual([due for due, _ in self.master.pending.values()], [1.0])
+        self.assertLessEqual(len(self.animator.lags) - ticks, 6)
+        self.master.advance(3.0)
+        self.assertEqual(called, ['next', 'clear'])
+        self.assertEqual(self.master.pending, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from benchmarks.suite import compare
+
+
+class TestBenchmarkCompare(unittest.TestCase):
+    def test_compare_flags_regressions(self):
+        """测试按耗时比与基线对比，I/O 项使用加倍的阈值"""
+        baseline = {'ratios': {'a': 1.0, 'b': 1.0, 'save_score/history=10': 1.0}}
+        results = {'a': (1e-6, 1.2), 'b': (1e-6, 1.3), 'c': (1e-6, 5.0),
+                   'save_score/history=10': (1e-4, 1.4)}
+        rows = {name: (change, regressed) for name, _, change, regressed in compare(results, baseline, 0.25)}
+        self.assertFalse(rows['a'][1])
+        self.assertTrue(rows['b'][1])
+        self.assertAlmostEqual(rows['b'][0], 0.3)
+        self.assertEqual(rows['c'], (None, False))  # 没有基线的新项不算回退
+        self.assertFalse(rows['save_score/history=10'][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
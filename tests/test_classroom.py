@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from core.data_handler import DataHandler
+from server.classroom import ClassroomServer, _encode_frame, _read_frame
+from server.loadgen import _Client, _solve, run_load
+
+
+class TestClassroomServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def _with_server(self, scenario):
+        config_path = os.path.join(self.tmp.name, 'settings.json')
+        classroom = ClassroomServer()
+        # DataHandler 必须在服务器的 I/O 线程中创建
+        await asyncio.get_running_loop().run_in_executor(
+            classroom._io, lambda: setattr(classroom, '_data_handler', DataHandler(config_path)))
+        server = await asyncio.start_server(classroom.handle_connection, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(classroom, port)
+        finally:
+            server.close()
+            await server.wait_closed()
+            classroom._io.shutdown(wait=True)
+
+    def test_http_flow(self):
+        """测试 HTTP 出题、判题、保存成绩"""
+        async def scenario(classroom, port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            client = _Client(reader, writer, 'localhost')
+            session = (await client.request('POST', '/session', {'name': '小明', 'difficulty': 2}))['session']
+            question = (await client.request('GET', f'/question?session={session}&operator=*'))['question']
+            result = await client.request('POST', '/answer', {'session': session, 'answer': str(_solve(question))})
+            self.assertTrue(result['correct'])
+            await client.request('GET', f'/question?session={session}')
+            result = await client.request('POST', '/answer', {'session': session, 'answer': 'abc'})
+            self.assertFalse(result['correct'])
+            score = await client.request('POST', '/score', {'session': session})
+            self.assertEqual((score['total'], score['correct']), (2, 1))
+            with self.assertRaises(RuntimeError):
+                await client.request('GET', f'/question?session={session}')
+            writer.close()
+            history = await asyncio.get_running_loop().run_in_executor(
+                classroom._io, lambda: classroom._data_handler.practice_history)
+            self.assertEqual(history[0]['user'], '小明')
+
+        asyncio.run(self._with_server(scenario))
+
+    def test_invalid_content_length(self):
+        """测试非数字或负数的 Content-Length 返回 400"""
+        async def scenario(classroom, port):
+            for value in (b"abc", b"-1"):
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(b"POST /session HTTP/1.1\r\nHost: localhost\r\nContent-Length: " + value + b"\r\n\r\n")
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.assertTrue(head.startswith(b"HTTP/1.1 400 "))
+                # 回复后服务器关闭连接，read() 读到结束
+                body = await asyncio.wait_for(reader.read(), 5)
+                self.assertIn('error', json.loads(body))
+                writer.close()
+
+        asyncio.run(self._with_server(scenario))
+
+    def test_invalid_field_types(self):
+        """测试 session / operator 不是字符串时返回 400，连接仍可继续使用"""
+        async def scenario(classroom, port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            client = _Client(reader, writer, 'localhost')
+            session = (await client.request('POST', '/session', {'difficulty': 1}))['session']
+            for payload in ({'session': []}, {'session': {'a': 1}}, {'session': session, 'operator': [1]}):
+                with self.assertRaisesRegex(RuntimeError, ': 400 '):
+                    await client.request('POST', '/question', payload)
+            self.assertIn('question', await client.request('POST', '/question', {'session': session}))
+            writer.close()
+
+        asyncio.run(self._with_server(scenario))
+
+    def test_body_too_large(self):
+        """测试过大的请求体返回 413 后关闭连接"""
+        async def scenario(classroom, port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b"POST /session HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10000000\r\n\r\n")
+            head = await reader.readuntil(b"\r\n\r\n")
+            self.assertTrue(head.startswith(b"HTTP/1.1 413 "))
+            self.assertIn('error', json.loads(await asyncio.wait_for(reader.read(), 5)))
+            writer.close()
+
+        asyncio.run(self._with_server(scenario))
+
+    def test_websocket_flow(self):
+        """测试 WebSocket 会话"""
+        async def scenario(classroom, port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b"GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n"
+                         b"Sec-WebSocket-Version: 13\r\n\r\n")
+            head = await reader.readuntil(b"\r\n\r\n")
+            self.assertIn(b"s3pPLMBiTxaQ9kYGzzhZRbK+xOo=", head)
+
+            async def send(message):
+                writer.write(_encode_frame(0x1, json.dumps(message).encode('utf-8'), mask=True))
+                opcode, payload = await _read_frame(reader)
+                return json.loads(payload)
+
+            await send({'action': 'session', 'difficulty': 1})
+            question = (await send({'action': 'question', 'operator': '+'}))['question']
+            self.assertTrue((await send({'action': 'answer', 'answer': _solve(question)}))['correct'])
+            # 格式不对的消息只回复错误，连接继续可用
+            for message in ([1, 2], {'action': 'question', 'session': [1]},
+                            {'action': 'question', 'operator': [1]}, {'action': ['question']}):
+                self.assertIn('error', await send(message))
+            self.assertIn('question', await send({'action': 'question'}))
+            writer.close()
+
+        asyncio.run(self._with_server(scenario))
+
+    def test_load_generator(self):
+        """测试压测客户端能跑完并统计延迟"""
+        async def scenario(classroom, port):
+            stats = await run_load('127.0.0.1', port, clients=20, duration=0.3)
+            self.assertEqual(stats['errors'], 0)
+            self.assertGreater(stats['requests'], 0)
+            self.assertGreaterEqual(stats['p99_ms'], stats['p50_ms'])
+
+        asyncio.run(self._with_server(scenario))
+
+
+if __name__ == '__main__':
+    unittest.main()
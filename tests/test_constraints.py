@@ -0,0 +1,77 @@
+import unittest
+
+from core.constraints import (BORROW, CARRY, NO_CARRY, ConstrainedGenerator, answer_between,
+                              borrows, carries, digits)
+from core.profiles import get_profiles
+
+
+def column_carries(a, b):
+    """逐位计算进位次数，用来核对 carries()"""
+    count = carry = 0
+    while a or b:
+        carry = a % 10 + b % 10 + carry >= 10
+        count += carry
+        a, b = a // 10, b // 10
+    return count
+
+
+class TestConstraints(unittest.TestCase):
+    def test_carries_and_borrows(self):
+        """测试进位、退位次数与竖式计算一致"""
+        for a in range(0, 300, 7):
+            for b in range(0, 300, 3):
+                self.assertEqual(carries(a, b), column_carries(a, b))
+        self.assertEqual(borrows(100, 1), 2)
+        self.assertEqual(borrows(54, 23), 0)
+        self.assertEqual(borrows(52, 27), 1)
+
+    def test_questions_satisfy_constraints(self):
+        """测试两位数进位加法、退位减法和积的范围"""
+        generator = ConstrainedGenerator(difficulty=2, seed=1)
+        for _ in range(200):
+            q = generator.generate_question('+', [digits(2), CARRY])
+            self.assertTrue(10 <= q['a'] <= 99 and 10 <= q['b'] <= 99)
+            self.assertGreater(carries(q['a'], q['b']), 0)
+            q = generator.generate_question('-', [BORROW])
+            self.assertGreater(borrows(q['a'], q['b']), 0)
+            self.assertEqual(q['answer'], q['a'] - q['b'])
+            q = generator.generate_question('*', [answer_between(0, 99)])
+            self.assertLessEqual(q['answer'], 99)
+
+    def test_count_matches_brute_force(self):
+        """测试预先计算的题目数与逐个检查的结果相同，组合与顺序无关"""
+        generator = ConstrainedGenerator(number_range=(0, 100))
+        expected = sum(1 for a in range(101) for b in range(101)
+                       if carries(a, b) and a + b <= 100)
+        self.assertEqual(generator.count('+', [CARRY, answer_between(0, 100)]), expected)
+        self.assertEqual(generator.count('+', [answer_between(0, 100), CARRY]), expected)
+        self.assertEqual(generator.count('+', [CARRY]) + generator.count('+', [NO_CARRY]), 101 * 101)
+
+    def test_rare_constraint(self):
+        """测试不到 1% 的稀有条件也能直接抽到（难度 3 的加法范围为 1-100）"""
+        generator = ConstrainedGenerator(difficulty=3, seed=2)
+        self.assertEqual(generator.count('+', [answer_between(0, 5)]), 10)
+        for _ in range(50):
+            self.assertLessEqual(generator.generate_question('+', [answer_between(0, 5)])['answer'], 5)
+
+    def test_division_uses_profile_space(self):
+        """测试按难度出题时除法条件作用于难度配置中的除法题目"""
+        generator = ConstrainedGenerator(difficulty=3, seed=4)
+        space = get_profiles().for_level(3).spaces['/']
+        self.assertEqual(generator.count('/', [answer_between(12, 12)]), 11)
+        for _ in range(20):
+            q = generator.generate_question('/', [answer_between(12, 12)])
+            space.index(q['a'], q['b'])
+
+    def test_invalid_constraints(self):
+        """测试不适用的条件和无解的组合报错，没有条件时按普通方式出题"""
+        generator = ConstrainedGenerator(difficulty=1, seed=3)
+        with self.assertRaises(ValueError):
+            generator.generate_question('*', [CARRY])
+        with self.assertRaises(ValueError):
+            generator.generate_question('+', [digits(2), CARRY])
+        self.assertEqual(generator.generate_question('-')['operator'], '-')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from core.data_handler import DataHandler
+from core.history_store import HistoryStore
+from core.journal import Journal
+
+
+class TestDataHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmp.name, 'settings.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_score_appends(self):
+        """测试练习记录追加到日志，不改写 settings.json"""
+        handler = DataHandler(self.config_path)
+        handler.save_score(10, 8, 60)
+        handler.save_score(20, 19, 95)
+        self.assertFalse(os.path.exists(self.config_path))
+        history = DataHandler(self.config_path).practice_history
+        self.assertEqual([r['correct'] for r in history], [8, 19])
+
+    def test_migrate_legacy_history(self):
+        """测试迁移旧版 settings.json 中的练习记录"""
+        legacy = {"current_user": "小明", "difficulty_level": 2,
+                  "practice_history": [{"date": "2024-01-01", "total": 5, "correct": 4, "time_used": 30}]}
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+        handler = DataHandler(self.config_path)
+        self.assertEqual(handler.data, {"current_user": "小明", "difficulty_level": 2})
+        self.assertEqual(handler.practice_history, legacy['practice_history'])
+        with open(self.config_path, encoding='utf-8') as f:
+            self.assertNotIn('practice_history', json.load(f))
+
+    def test_journal_repairs_torn_tail(self):
+        """测试截掉崩溃时写了一半的最后一行"""
+        path = os.path.join(self.tmp.name, 'history.jsonl')
+        journal = Journal(path)
+        journal.extend([{"n": 1}, {"n": 2}])
+        with open(path, 'ab') as f:
+            f.write(b'{"n": 3, "tor')
+        journal = Journal(path)
+        journal.append({"n": 4})
+        self.assertEqual([r['n'] for r in journal], [1, 2, 4])
+
+    def test_journal_compaction(self):
+        """测试追加时不整理，读到损坏的行后才整理"""
+        path = os.path.join(self.tmp.name, 'history.jsonl')
+        journal = Journal(path)
+        self.assertFalse(journal.compact_if_corrupt())
+        journal.append({"n": 1})
+        with open(path, 'ab') as f:
+            f.write(b'garbage\n')
+        journal.extend([{"n": 2}] * 5)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 7)
+        self.assertEqual([r['n'] for r in journal], [1, 2, 2, 2, 2, 2])
+        self.assertEqual(journal.corrupt_lines, 1)
+        self.assertTrue(journal.compact_if_corrupt())
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 6)
+        self.assertFalse(journal.compact_if_corrupt())
+
+    def test_compaction_keeps_concurrent_appends(self):
+        """测试整理持有锁文件，其他实例的追加要等整理完成，不会丢失"""
+        path = os.path.join(self.tmp.name, 'history.jsonl')
+        journal, other = Journal(path), Journal(path)
+        journal.extend([{"n": 1}, {"n": 2}])
+        with open(path, 'ab') as f:
+            f.write(b'garbage\n')
+        list(journal)
+        appended = threading.Event()
+        with journal.lock:
+            writer = threading.Thread(target=lambda: (other.append({"n": 3}), appended.set()))
+            writer.start()
+            self.assertFalse(appended.wait(0.2))
+            journal.compact()
+        writer.join()
+        self.assertEqual([r['n'] for r in Journal(path)], [1, 2, 3])
+
+    def test_startup_compacts_corrupt_journal(self):
+        """测试启动重建记录库时读到损坏的行就整理日志"""
+        path = os.path.join(self.tmp.name, 'practice_history.jsonl')
+        record = {"date": "2024-01-01", "user": "", "difficulty": 1, "total": 5, "correct": 4, "time_used": 30}
+        Journal(path).append(record)
+        with open(path, 'ab') as f:
+            f.write(b'garbage\n')
+        handler = DataHandler(self.config_path)
+        self.assertEqual(handler.store.count(), 1)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_history_store_rollups(self):
+        """测试汇总表随插入和删除增量更新"""
+        store = HistoryStore(':memory:')
+        store.add_sessions([
+            {'user': '小明', 'date': '2024-03-04', 'difficulty': 1, 'total': 10, 'correct': 8, 'time_used': 50},
+            {'user': '小明', 'date': '2024-03-04', 'difficulty': 2, 'total': 10, 'correct': 6, 'time_used': 70},
+            {'user': '小明', 'date': '2024-03-10', 'difficulty': 1, 'total': 20, 'correct': 20, 'time_used': 80},
+            {'user': '小红', 'date': '2024-03-04', 'difficulty': 1, 'total': 5, 'correct': 5, 'time_used': 10},
+        ])
+        daily = store.daily_stats('小明')
+        self.assertEqual([d['period'] for d in daily], ['2024-03-04', '2024-03-10'])
+        self.assertEqual(daily[0]['sessions'], 2)
+        self.assertAlmostEqual(daily[0]['accuracy'], 0.7)
+        self.assertAlmostEqual(daily[0]['avg_time'], 6.0)
+        self.assertEqual(len(store.daily_stats('小明', difficulty=2)), 1)
+        self.assertEqual(len(store.daily_stats('小明', since='2024-03-05')), 1)
+
+        # 2024-03-04 是周一，2024-03-10 是同一周的周日
+        weekly = store.weekly_stats('小明')
+        self.assertEqual(len(weekly), 1)
+        self.assertEqual(weekly[0]['period'], '2024-03-04')
+        self.assertEqual(weekly[0]['total'], 40)
+
+        store.conn.execute("DELETE FROM sessions WHERE date = '2024-03-10'")
+        self.assertEqual(store.weekly_stats('小明')[0]['total'], 20)
+
+    def test_weekly_stats_since_mid_week(self):
+        """测试 since 落在周中时仍包含该周（含 since 当天及之后的记录）"""
+        store = HistoryStore(':memory:')
+        store.add_sessions([
+            {'user': '', 'date': '2024-03-06', 'difficulty': 1, 'total': 10, 'correct': 8, 'time_used': 50},
+            {'user': '', 'date': '2024-03-13', 'difficulty': 1, 'total': 5, 'correct': 5, 'time_used': 20},
+        ])
+        weekly = store.weekly_stats(since='2024-03-06')
+        self.assertEqual([w['period'] for w in weekly], ['2024-03-04', '2024-03-11'])
+        weekly = store.weekly_stats(since='2024-03-10')  # 周日
+        self.assertEqual([w['period'] for w in weekly], ['2024-03-04', '2024-03-11'])
+        self.assertEqual([w['period'] for w in store.weekly_stats(since='2024-03-11')], ['2024-03-11'])
+
+    def test_history_store_paging(self):
+        """测试按页查询练习记录"""
+        store = HistoryStore(':memory:')
+        store.add_sessions([{'user': '', 'date': f'2024-03-{day:02d}', 'difficulty': 1,
+                             'total': day, 'correct': day, 'time_used': 1} for day in range(1, 11)])
+        page = store.sessions(limit=3, offset=2, newest_first=True)
+        self.assertEqual([r['total'] for r in page], [8, 7, 6])
+        self.assertEqual([r['total'] for r in store.sessions(offset=8)], [9, 10])
+
+    def test_data_handler_store(self):
+        """测试保存记录同时写入 SQLite，并可从日志重建"""
+        handler = DataHandler(self.config_path)
+        handler.save_score(10, 9, 40, user='小明', difficulty=2)
+        self.assertEqual(handler.daily_stats('小明')[0]['correct'], 9)
+        handler.store.close()
+        os.remove(handler.store_path)
+        handler = DataHandler(self.config_path)
+        self.assertEqual(handler.store.count(), 1)
+        handler.store.close()
+
+    def test_store_catches_up_after_crash(self):
+        """测试日志已追加、记录库未写入（中途崩溃）时，启动后补上缺少的记录"""
+        handler = DataHandler(self.config_path)
+        handler.save_score(10, 9, 40, user='小明')
+        handler.store.close()
+        # 模拟崩溃：只写了日志
+        Journal(handler.history_path).extend([
+            {"date": "2024-03-04", "user": "小明", "difficulty": 1, "total": 5, "correct": 5, "time_used": 20},
+            {"date": "2024-03-05", "user": "小红", "difficulty": 1, "total": 5, "correct": 3, "time_used": 25},
+        ])
+        handler = DataHandler(self.config_path)
+        self.assertEqual(handler.store.count(), 3)
+        self.assertEqual(handler.daily_stats('小红')[0]['correct'], 3)
+        handler.save_score(10, 8, 40, user='小红')
+        self.assertEqual(handler.store.count(), 4)
+        handler.store.close()
+
+    def test_store_resyncs_after_clear(self):
+        """测试清空记录库后下次启动从头导入日志"""
+        handler = DataHandler(self.config_path)
+        handler.save_score(10, 9, 40)
+        handler.save_score(10, 7, 40)
+        handler.store.clear()
+        self.assertEqual(handler.store.count(), 0)
+        self.assertEqual(handler.store.journal_offset(), 0)
+        handler.store.close()
+        handler = DataHandler(self.config_path)
+        self.assertEqual(handler.store.count(), 2)
+        handler.store.close()
+
+    def test_store_rebuilds_when_journal_replaced(self):
+        """测试日志比记录库中保存的位置短（被替换过）时整体重建"""
+        handler = DataHandler(self.config_path)
+        for _ in range(3):
+            handler.save_score(10, 9, 40)
+        handler.store.close()
+        with open(handler.history_path, encoding='utf-8') as f:
+            first = f.readline()
+        with open(handler.history_path, 'w', encoding='utf-8') as f:
+            f.write(first)
+        handler = DataHandler(self.config_path)
+        self.assertEqual(handler.store.count(), 1)
+        handler.store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
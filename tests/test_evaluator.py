@@ -0,0 +1,59 @@
+import unittest
+from fractions import Fraction
+
+from core.evaluator import Evaluator, parse_answer
+from core.generator import NUMPY_AVAILABLE
+
+
+class TestEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = Evaluator()
+
+    def test_parse_answer(self):
+        """测试整数、分数和小数的解析"""
+        self.assertEqual(parse_answer(" 12 "), 12)
+        self.assertEqual(parse_answer("6/8"), Fraction(3, 4))
+        self.assertIsInstance(parse_answer("0.75"), float)
+        for bad in ("abc", "1/0", "nan", "", True, None):
+            with self.assertRaises((TypeError, ValueError)):
+                parse_answer(bad)
+
+    def test_check_answer_exact(self):
+        """测试整数和分数精确比较，小数按容差比较"""
+        check = self.evaluator.check_answer
+        self.assertTrue(check("1/2", Fraction(1, 2)))
+        self.assertTrue(check("0.5", Fraction(1, 2)))
+        self.assertFalse(check("0.33", Fraction(1, 3)))
+        self.assertTrue(check(0.1 + 0.2, "0.3"))
+        self.assertTrue(check(7.0, 7))
+        self.assertFalse(check(10 ** 20 + 1, 10 ** 20))
+        self.assertTrue(Evaluator(tolerance=0.01).check_answer("0.33", Fraction(1, 3)))
+
+    def test_grade_batch(self):
+        """测试批量判题返回正确掩码和解析错误"""
+        result = self.evaluator.grade_batch(
+            ["7", "8", "abc", "2/4", "1/0", 3, "0.25"],
+            [7, 7, 7, Fraction(1, 2), Fraction(1, 2), 3, Fraction(1, 4)])
+        self.assertEqual(result.correct, [True, False, False, True, False, True, True])
+        self.assertEqual(sorted(result.errors), [2, 4])
+        with self.assertRaises(ValueError):
+            self.evaluator.grade_batch([1, 2], [1])
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "需要 NumPy")
+    def test_grade_batch_numpy(self):
+        """测试 NumPy 数组的向量化判题"""
+        import numpy as np
+
+        expected = np.array([1, 2, 3, 4])
+        result = self.evaluator.grade_batch(np.array(["1", "5", "3", "4"]), expected)
+        self.assertEqual(result.correct.tolist(), [True, False, True, True])
+        result = self.evaluator.grade_batch(np.array(["1", "x", "3", "4.0"]), expected)
+        self.assertEqual(result.correct.tolist(), [True, False, True, True])
+        self.assertEqual(list(result.errors), [1])
+        result = self.evaluator.grade_batch(np.array([1.0, np.nan, 3.0000000001, 4.5]), expected)
+        self.assertEqual(result.correct.tolist(), [True, False, True, False])
+        self.assertEqual(list(result.errors), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
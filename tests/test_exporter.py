@@ -0,0 +1,80 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from core.generator import NUMPY_AVAILABLE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "需要 NumPy")
+class TestExporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sections = [(1, '+-', 300), (3, '*/', 200)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_csv_and_jsonl(self):
+        """测试 CSV 与 JSONL 导出内容一致且可复现"""
+        from core.exporter import export_questions
+        self.assertEqual(export_questions(self._path('q.csv'), self.sections, seed=1), 500)
+        self.assertEqual(export_questions(self._path('q.jsonl'), self.sections, seed=1), 500)
+
+        with open(self._path('q.csv'), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "index,difficulty,a,operator,b,question,answer")
+        with open(self._path('q.jsonl'), encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(lines) - 1, len(records))
+        for line, record in zip(lines[1:], records):
+            self.assertEqual(line.split(',')[-1], str(record['answer']))
+            self.assertEqual(line.split(',')[-2], record['question'])
+        self.assertEqual({r['difficulty'] for r in records}, {1, 3})
+
+    def test_html_answer_key(self):
+        """测试 HTML 练习单的答案页与题目对应"""
+        from core.exporter import export_questions
+        export_questions(self._path('q.jsonl'), self.sections, seed=5)
+        export_questions(self._path('q.html'), self.sections, seed=5)
+        with open(self._path('q.jsonl'), encoding='utf-8') as f:
+            answers = [json.loads(line)['answer'] for line in f]
+        with open(self._path('q.html'), encoding='utf-8') as f:
+            page = f.read()
+        key = page.split('class="answers">')[1]
+        self.assertEqual(key.count('<li>'), len(answers))
+        self.assertIn(f"<li>{answers[-1]}</li>", key)
+
+    def test_cli_does_not_import_gui(self):
+        """测试无界面导出不会导入 tkinter / PIL"""
+        script = ("import sys, main; main.main(['export', sys.argv[1], '-n', '10']); "
+                  "print('tkinter' in sys.modules or 'PIL' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', script, self._path('q.csv')],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.splitlines()[-1], 'False')
+
+    def test_cli_rejects_bad_arguments(self):
+        """测试不合法的难度、运算符和格式由 argparse 报错，不抛出异常堆栈"""
+        import main
+        for argv in (['export', self._path('q.csv'), '-d', '9'],
+                     ['export', self._path('q.csv'), '-o', '+x'],
+                     ['export', self._path('q.txt')]):
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as cm:
+                main.main(argv)
+            self.assertEqual(cm.exception.code, 2)
+            self.assertNotIn('Traceback', stderr.getvalue())
+        self.assertFalse(os.path.exists(self._path('q.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from fractions import Fraction
+
+from core.expression import BinaryOp, Number, DISPLAY_SYMBOLS, apply_operator
+from core.generator import MathGenerator
+
+
+class TestExpression(unittest.TestCase):
+    def test_apply_operator(self):
+        """测试运算符计算结果精确"""
+        self.assertEqual(apply_operator('+', 3, 4), 7)
+        self.assertEqual(apply_operator('/', 12, 4), 3)
+        self.assertIsInstance(apply_operator('/', 12, 4), int)
+        self.assertEqual(apply_operator('/', 1, 3), Fraction(1, 3))
+
+    def test_render_precedence(self):
+        """测试按优先级渲染括号"""
+        expr = BinaryOp('+', Number(3), BinaryOp('*', Number(4), Number(5)))
+        self.assertEqual(expr.render(), "3 + 4 * 5")
+        self.assertEqual(expr.render(DISPLAY_SYMBOLS), "3 + 4 × 5")
+        self.assertEqual(expr.evaluate(), 23)
+
+        expr = BinaryOp('*', BinaryOp('+', Number(3), Number(4)), Number(5))
+        self.assertEqual(expr.render(), "(3 + 4) * 5")
+        self.assertEqual(expr.evaluate(), 35)
+
+        expr = BinaryOp('-', Number(9), BinaryOp('-', Number(5), Number(2)))
+        self.assertEqual(expr.render(), "9 - (5 - 2)")
+        self.assertEqual(expr.evaluate(), 6)
+
+        expr = BinaryOp('/', Number(2), BinaryOp('*', Number(3), Number(4)))
+        self.assertEqual(expr.render(), "2 / (3 * 4)")
+        self.assertEqual(expr.evaluate(), Fraction(1, 6))
+
+    def test_generate_expression(self):
+        """测试多步运算题：渲染结果与求值一致、整除、非负"""
+        gen = MathGenerator(difficulty=2)
+        for _ in range(500):
+            q = gen.generate_expression(operand_count=4)
+            text = q['question'][:-len(" = ?")]
+            self.assertEqual(eval(text), q['answer'])
+            self.assertIsInstance(q['answer'], int)
+            self.assertGreaterEqual(q['answer'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
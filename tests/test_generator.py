@@ -1,5 +1,7 @@
 import unittest
-from core.generator import MathGenerator
+from core.generator import MathGenerator, NUMPY_AVAILABLE
+from core.divisors import DivisorIndex
+from core.profiles import get_profiles
 
 class TestGenerator(unittest.TestCase):
     def setUp(self):
@@ -10,14 +12,14 @@ class TestGenerator(unittest.TestCase):
         """测试加法题目生成"""
         for _ in range(100):
             q = self.generator.generate_question('+')
-            a, b = map(int, q['question'].split(' ')[0::2])
+            a, b = map(int, q['question'].split(' ')[0:3:2])
             self.assertEqual(a + b, q['answer'])
 
     def test_subtraction(self):
         """测试减法题目生成"""
         for _ in range(100):
             q = self.generator.generate_question('-')
-            a, b = map(int, q['question'].split(' ')[0::2])
+            a, b = map(int, q['question'].split(' ')[0:3:2])
             self.assertGreaterEqual(a, b)  # 确保没有负数结果
             self.assertEqual(a - b, q['answer'])
 
@@ -25,39 +27,89 @@ class TestGenerator(unittest.TestCase):
         """测试乘法题目生成"""
         for _ in range(100):
             q = self.generator.generate_question('*')
-            a, b = map(int, q['question'].split(' ')[0::2])
+            a, b = map(int, q['question'].split(' ')[0:3:2])
             self.assertEqual(a * b, q['answer'])
 
     def test_division(self):
         """测试除法题目生成"""
         for _ in range(100):
             q = self.generator.generate_question('/')
-            a, b = map(int, q['question'].split(' ')[0::2])
+            a, b = map(int, q['question'].split(' ')[0:3:2])
             self.assertEqual(a % b, 0)  # 确保可以整除
             self.assertEqual(a / b, q['answer'])
 
     def test_difficulty_level(self):
-        """测试不同难度级别"""
-        # 测试初级难度
-        gen1 = MathGenerator(difficulty=1)
-        for _ in range(100):
-            q = gen1.generate_question()
-            a, b = map(int, q['question'].split(' ')[0::2])
-            self.assertTrue(0 <= a <= 10 and 0 <= b <= 10)
-            
-        # 测试中级难度
-        gen2 = MathGenerator(difficulty=2)
-        for _ in range(100):
-            q = gen2.generate_question()
-            a, b = map(int, q['question'].split(' ')[0::2])
-            self.assertTrue(0 <= a <= 100 and 0 <= b <= 100)
-            
-        # 测试高级难度
-        gen3 = MathGenerator(difficulty=3)
-        for _ in range(100):
-            q = gen3.generate_question()
-            a, b = map(int, q['question'].split(' ')[0::2])
-            self.assertTrue(0 <= a <= 1000 and 0 <= b <= 1000)
+        """测试整数难度等级使用难度配置文件中的题目范围"""
+        for level in (1, 2, 3):
+            generator = MathGenerator(difficulty=level, seed=level)
+            profile = get_profiles().for_level(level)
+            self.assertEqual(generator.number_range, profile.number_range)
+            for op in ('+', '-', '*', '/') * 50:
+                q = generator.generate_question(op)
+                # 不在该难度的题目空间中时 index() 会报错
+                profile.spaces[op].index(q['a'], q['b'])
+
+    def test_divisor_index(self):
+        """测试约数索引与暴力枚举一致"""
+        index = DivisorIndex(2000)
+        for n in range(1, 2001):
+            expected = [i for i in range(1, n + 1) if n % i == 0]
+            self.assertEqual(index.divisors(n), expected)
+            self.assertEqual(index.divisor_count(n), len(expected))
+            self.assertIn(index.random_divisor(n), expected)
+
+    def test_division_large_range(self):
+        """测试自定义大范围下的除法题目"""
+        gen = MathGenerator(number_range=(0, 10**6))
+        for _ in range(1000):
+            q = gen.generate_question('/')
+            a, b = map(int, q['question'].split(' ')[0:3:2])
+            self.assertTrue(0 <= a <= 10**6 and 1 <= b <= 10**6)
+            self.assertEqual(a % b, 0)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "需要 NumPy")
+    def test_generate_batch(self):
+        """测试批量生成题目"""
+        gen = MathGenerator(difficulty=2)
+        profile = get_profiles().for_level(2)
+        batch = gen.generate_batch(5000, operators=('+', '-', '*', '/'), seed=42)
+        self.assertEqual(len(batch), 5000)
+        for q in batch:
+            a, op, b = q['question'].split(' ')[0:3]
+            a, b = int(a), int(b)
+            profile.spaces[op].index(a, b)
+            if op == '-':
+                self.assertGreaterEqual(a, b)
+            if op == '/':
+                self.assertEqual(a % b, 0)
+                self.assertEqual(a // b, q['answer'])
+            else:
+                self.assertEqual({'+': a + b, '-': a - b, '*': a * b}[op], q['answer'])
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "需要 NumPy")
+    def test_generate_batch_seed(self):
+        """测试相同种子生成相同批次"""
+        gen = MathGenerator(difficulty=3)
+        first = gen.generate_batch(1000, operators=('+', '/'), seed=7)
+        second = gen.generate_batch(1000, operators=('+', '/'), seed=7)
+        self.assertEqual(list(first), list(second))
+
+    def test_seeded_generator(self):
+        """测试相同种子的逐题生成可以复现"""
+        first = MathGenerator(difficulty=3, seed=11)
+        second = MathGenerator(difficulty=3, seed=11)
+        for op in ('+', '-', '*', '/') * 50:
+            self.assertEqual(first.generate_question(op), second.generate_question(op))
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "需要 NumPy")
+    def test_generate_pool_matches_single_process(self):
+        """测试多进程分片生成与单进程结果逐位一致"""
+        from core.parallel import generate_pool
+        single = generate_pool(10000, difficulty=2, seed=3, workers=1, shard_size=1024)
+        pooled = generate_pool(10000, difficulty=2, seed=3, workers=3, shard_size=1024)
+        self.assertEqual(len(pooled), 10000)
+        for name in ('a', 'op', 'b', 'answer'):
+            self.assertTrue((getattr(single, name) == getattr(pooled, name)).all())
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import unittest
+
+from core.instrumentation import Histogram, Metrics, instrument, watch_event_loop
+
+
+class Service:
+    def work(self, value):
+        if value < 0:
+            raise ValueError("负数")
+        return value * 2
+
+
+class FakeMaster:
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_histogram_percentiles(self):
+        """测试直方图计数和分位数估算"""
+        histogram = Histogram(buckets=(1, 2, 4, 8))
+        for value in (0.5, 1.5, 1.5, 3, 100):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1, 0, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertTrue(1 <= histogram.percentile(0.5) <= 2)
+        self.assertEqual(histogram.percentile(1.0), 100)
+        self.assertEqual(Histogram().percentile(0.5), 0.0)
+
+    def test_instrument_wraps_instance(self):
+        """测试包装只作用于实例，并记录耗时和异常次数"""
+        metrics = Metrics()
+        service = Service()
+        instrument(service, ('work',), 'svc', metrics)
+        self.assertEqual(service.work(3), 6)
+        with self.assertRaises(ValueError):
+            service.work(-1)
+        self.assertEqual(metrics.histograms['svc_work_seconds'].count, 2)
+        self.assertEqual(metrics.counters['svc_work_errors_total'], 1)
+        self.assertNotIn('work', vars(Service()))
+
+    def test_dump_formats(self):
+        """测试 JSON 和 Prometheus 文本两种输出"""
+        metrics = Metrics()
+        metrics.inc('app_errors_total', 2)
+        metrics.histogram('app_call_seconds').observe(0.003)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, 'metrics.json')
+            metrics.dump(json_path)
+            with open(json_path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.assertEqual(data['counters']['app_errors_total'], 2)
+            self.assertEqual(data['histograms']['app_call_seconds']['count'], 1)
+
+            prom_path = os.path.join(directory, 'metrics.prom')
+            metrics.dump(prom_path)
+            with open(prom_path, encoding='utf-8') as f:
+                text = f.read()
+        self.assertIn('app_errors_total 2', text)
+        self.assertIn('app_call_seconds_bucket{le="0.005"} 1', text)
+        self.assertIn('app_call_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn('app_call_seconds_count 1', text)
+
+    def test_watch_event_loop(self):
+        """测试事件循环探测持续重新调度，停止后不再记录"""
+        metrics = Metrics()
+        master = FakeMaster()
+        stop = watch_event_loop(master, metrics, interval=0.01)
+        master.callbacks.pop()()
+        master.callbacks.pop()()
+        self.assertEqual(metrics.histograms['tk_event_loop_lag_seconds'].count, 2)
+        stop()
+        master.callbacks.pop()()
+        self.assertEqual(master.callbacks, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+
+from core.leaderboard import Leaderboard
+
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'leaderboard.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_top_and_rank(self):
+        """测试分难度榜单、前 K 名和名次查询"""
+        board = Leaderboard(self.path, top_k=3)
+        for i, score in enumerate([30, 80, 50, 80, 10, 90]):
+            board.add(score, name=f"p{i}", difficulty="中等", date="2024-03-05")
+        board.add(100, name="hard", difficulty="困难", date="2024-03-05")
+
+        top = board.top("中等")
+        self.assertEqual([e['score'] for e in top], [90, 80, 80])
+        self.assertEqual(top[1]['name'], "p1")  # 同分先上榜的在前
+        self.assertEqual(board.top()[0]['name'], "hard")
+        self.assertEqual(board.rank(80, "中等"), 2)
+        self.assertEqual(board.rank(85, "中等"), 2)
+        self.assertEqual(board.rank(5, "中等"), 7)
+        self.assertEqual(board.count(), 7)
+
+    def test_period_boards(self):
+        """测试日榜和周榜"""
+        board = Leaderboard(self.path)
+        board.add(40, difficulty="简单", date="2024-03-04")  # 周一
+        board.add(60, difficulty="简单", date="2024-03-10")  # 同一周的周日
+        board.add(90, difficulty="简单", date="2024-03-11")  # 下一周
+        self.assertEqual([e['score'] for e in board.top("简单", 'day', "2024-03-04")], [40])
+        self.assertEqual([e['score'] for e in board.top("简单", 'week', "2024-03-06")], [60, 40])
+        self.assertEqual([e['score'] for e in board.top("简单", 'week', "2024-03-11")], [90])
+
+    def test_ranked_full_board(self):
+        """测试完整榜单的排序、筛选和新成绩后的缓存失效"""
+        board = Leaderboard(self.path, top_k=2)
+        for i, score in enumerate([30, 80, 50, 80]):
+            board.add(score, name=f"p{i}", difficulty="中等", date="2024-03-05")
+        board.add(60, name="easy", difficulty="简单", date="2024-03-06")
+        self.assertEqual([e['name'] for e in board.ranked("中等")], ["p1", "p3", "p2", "p0"])
+        self.assertEqual(len(board.ranked()), 5)
+        self.assertEqual([e['name'] for e in board.ranked(period='day', day="2024-03-06")], ["easy"])
+        board.add(99, name="new", difficulty="中等", date="2024-03-05")
+        self.assertEqual(board.ranked("中等")[0]['name'], "new")
+
+    def test_shared_between_instances(self):
+        """测试多个实例共享同一个榜单文件"""
+        first = Leaderboard(self.path)
+        second = Leaderboard(self.path)
+        first.add(70, name="a")
+        second.add(20, name="b")
+        first.refresh()
+        self.assertEqual([e['name'] for e in first.top()], ["a", "b"])
+        self.assertEqual(Leaderboard(self.path).count(), 2)
+
+    def test_migrate_legacy(self):
+        """测试导入旧版只有分数的排行榜"""
+        legacy = os.path.join(self.tmp.name, 'leaderboard.json')
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump([50, 30, 20], f)
+        board = Leaderboard(self.path, legacy_path=legacy)
+        self.assertEqual([e['score'] for e in board.top()], [50, 30, 20])
+        self.assertEqual(board.top(period='day'), [])
+        self.assertEqual(Leaderboard(self.path, legacy_path=legacy).count(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from ui.leaderboard_view import PagedRows
+
+
+class TestPagedRows(unittest.TestCase):
+    def setUp(self):
+        self.fetches = []
+
+        def fetch(start, stop):
+            self.fetches.append((start, stop))
+            return [(str(i),) for i in range(start, stop)]
+
+        self.rows = PagedRows((("值", 50),), 1050, fetch, page_size=100, max_pages=2)
+
+    def test_rows_across_pages(self):
+        """测试跨页读取，只读取用到的页"""
+        self.assertEqual(self.rows.rows(95, 105), [(str(i),) for i in range(95, 105)])
+        self.assertEqual(self.fetches, [(0, 100), (100, 200)])
+        self.assertEqual(self.rows.rows(1045, 1100), [(str(i),) for i in range(1045, 1050)])
+        self.assertEqual(self.fetches[-1], (1000, 1050))
+
+    def test_page_cache_is_bounded(self):
+        """测试页缓存有上限，最近用过的页不会被淘汰"""
+        self.rows.rows(0, 1)
+        self.rows.rows(100, 101)
+        self.rows.rows(0, 1)
+        self.rows.rows(200, 201)   # 淘汰最久未用的第 1 页
+        self.rows.rows(0, 1)
+        self.assertEqual(self.fetches, [(0, 100), (100, 200), (200, 300)])
+        self.rows.rows(100, 101)
+        self.assertEqual(len(self.fetches), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from core.generator import MathGenerator
+from core.permutation import IndexPermutation
+
+
+class TestPermutation(unittest.TestCase):
+    def test_permutation_is_bijective(self):
+        """测试置换覆盖 [0, size) 中每个数恰好一次"""
+        for size in (1, 2, 3, 37, 1000, 4097):
+            permutation = IndexPermutation(size, seed=size)
+            self.assertEqual(sorted(permutation[i] for i in range(size)), list(range(size)))
+
+    def test_permutation_depends_on_seed(self):
+        """测试不同种子得到不同顺序"""
+        first = [IndexPermutation(1000, seed=1)[i] for i in range(20)]
+        second = [IndexPermutation(1000, seed=2)[i] for i in range(20)]
+        self.assertNotEqual(first, second)
+
+    def test_session_exhausts_level_without_repeats(self):
+        """测试一局练习出完全部题目前没有重复"""
+        session = MathGenerator(difficulty=1).no_repeat_session(seed=3)
+        for op in ('+', '-', '*', '/'):
+            total = session.remaining(op)
+            seen = set()
+            for _ in range(total):
+                q = session.next_question(op)
+                seen.add(q['question'])
+            self.assertEqual(len(seen), total)
+            self.assertEqual(session.remaining(op), 0)
+            session.next_question(op)
+            self.assertEqual(session.rounds(op), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import threading
+import time
+import unittest
+
+from core.prefetch import QuestionPrefetcher
+
+
+class TestPrefetcher(unittest.TestCase):
+    def _wait_for(self, prefetcher, key, count):
+        deadline = time.monotonic() + 2
+        while prefetcher.pending(key) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_prefetch_fills_queue(self):
+        """测试后台线程按上限补满队列"""
+        prefetcher = QuestionPrefetcher(lambda key: {'key': key}, depth=3)
+        try:
+            prefetcher.prime("简单")
+            self._wait_for(prefetcher, "简单", 3)
+            self.assertEqual(prefetcher.pending("简单"), 3)
+            self.assertEqual(prefetcher.get("简单"), {'key': "简单"})
+            self._wait_for(prefetcher, "简单", 3)
+            self.assertEqual(prefetcher.pending("简单"), 3)
+        finally:
+            prefetcher.close()
+
+    def test_flush_discards_in_flight(self):
+        """测试切换难度时丢弃正在生成的旧题"""
+        release = threading.Event()
+        started = threading.Event()
+
+        def factory(key):
+            if key == "简单":
+                started.set()
+                release.wait(2)
+            return {'key': key}
+
+        prefetcher = QuestionPrefetcher(factory, depth=2)
+        try:
+            prefetcher.prime("简单")
+            started.wait(2)
+            prefetcher.flush("困难")
+            release.set()
+            self._wait_for(prefetcher, "困难", 2)
+            self.assertEqual(prefetcher.pending("简单"), 0)
+            self.assertEqual(prefetcher.get("困难"), {'key': "困难"})
+        finally:
+            prefetcher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+
+from core.adaptive import AdaptiveSelector
+from core.generator import NUMPY_AVAILABLE
+from core.permutation import NoRepeatSession
+from core.profiles import DivisionPairs, get_profiles, load_profiles
+
+
+class TestProfiles(unittest.TestCase):
+    def setUp(self):
+        self.profiles = get_profiles()
+
+    def test_default_config(self):
+        """测试默认配置文件的难度、默认值和等级"""
+        self.assertEqual(list(self.profiles), ["简单", "中等", "困难"])
+        self.assertEqual(self.profiles.default, "中等")
+        self.assertEqual(self.profiles.get(None).name, "中等")
+        self.assertEqual(self.profiles.for_level(3).name, "困难")
+        self.assertIs(get_profiles(), self.profiles)  # 只编译一次
+
+    def test_sample_follows_profile(self):
+        """测试按权重选择运算符，数值在配置的范围内，除法都能整除"""
+        profile = self.profiles["困难"]
+        rng = random.Random(0)
+        counts = Counter()
+        for _ in range(4000):
+            q = profile.sample(rng)
+            counts[q['operator']] += 1
+            self.assertEqual(q['difficulty'], "困难")
+            if q['operator'] == '/':
+                self.assertTrue(2 <= q['b'] <= 12 and 1 <= q['answer'] <= 12)
+                self.assertEqual(q['a'], q['b'] * q['answer'])
+            elif q['operator'] == '*':
+                self.assertTrue(1 <= q['a'] <= 20 and 1 <= q['b'] <= 20)
+            else:
+                self.assertTrue(1 <= q['a'] <= 100 and 0 <= q['answer'])
+        self.assertEqual(set(counts), {'+', '-', '*', '/'})
+        self.assertTrue(all(800 < c < 1200 for c in counts.values()))
+        self.assertEqual({self.profiles["简单"].sample(rng)['operator'] for _ in range(200)}, {'+', '-'})
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "需要 NumPy")
+    def test_generate_batch_follows_profile(self):
+        """测试批量出题（导出使用）与逐题出题的范围一致"""
+        profile = self.profiles["困难"]
+        batch = profile.generate_batch(4000, seed=1)
+        self.assertEqual(set(batch.op.tolist()), {0, 1, 2, 3})
+        for q, a, b, op in zip(batch, batch.a.tolist(), batch.b.tolist(), batch.op.tolist()):
+            if op == 3:
+                self.assertTrue(2 <= b <= 12 and a == b * q['answer'])
+            elif op == 2:
+                self.assertTrue(1 <= a <= 20 and 1 <= b <= 20)
+            else:
+                self.assertTrue(1 <= a <= 100 and q['answer'] >= 0)
+        with self.assertRaises(ValueError):
+            self.profiles["简单"].generate_batch(10, '+%')
+
+    def test_division_pairs_space(self):
+        """测试除法题目空间可以被不重复出题和自适应出题使用"""
+        space = DivisionPairs((2, 4), (1, 3))
+        self.assertEqual(space.size, 9)
+        session = NoRepeatSession(spaces={'/': space}, seed=1)
+        facts = {(q['a'], q['b']) for q in (session.next_question('/') for _ in range(9))}
+        self.assertEqual(facts, {(d * q, d) for d in range(2, 5) for q in range(1, 4)})
+        selector = AdaptiveSelector(spaces={'/': space}, seed=1)
+        selector.record(6, '/', 3, False, 8.0)
+        self.assertEqual(selector.mastery(6, '/', 3)[:2], (1, 1))
+        with self.assertRaises(ValueError):
+            selector.next_question('+')
+
+    def test_invalid_config(self):
+        """测试配置错误时给出明确的 ValueError"""
+        bad_configs = (
+            {"x": {"operators": {"*": 1}, "ranges": {"+": [1, 10]}}},
+            {"x": {"operators": {"/": 1}, "division": {"divisor": [0, 5], "quotient": [1, 5]}}},
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profiles.json')
+            for bad in bad_configs:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump({"profiles": bad}, f)
+                with self.assertRaises(ValueError):
+                    load_profiles(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import random
+import tempfile
+import unittest
+
+from core.generator import NUMPY_AVAILABLE
+from core.profiles import get_profiles
+from core.question_bank import QuestionBank, build_bank
+
+
+class TestQuestionBank(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'level1.qbank')
+        self.profile = get_profiles().for_level(1)
+        self.total = build_bank(self.path, self.profile)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_bank_contains_every_valid_question(self):
+        """测试题库按难度配置中题目空间的编号顺序包含全部合法题目，答案正确"""
+        with QuestionBank(self.path) as bank:
+            self.assertEqual(len(bank), self.total)
+            self.assertEqual(bank.level, 1)
+            index = 0
+            for op in ('+', '-', '*', '/'):
+                space = self.profile.spaces[op]
+                self.assertEqual(bank.count(op), space.size)
+                for i in range(space.size):
+                    a, operator, b, answer = bank.record(index)
+                    self.assertEqual((a, b), space.fact(i))
+                    self.assertEqual(operator, op)
+                    if op == '-':
+                        self.assertGreaterEqual(answer, 0)
+                    if op == '/':
+                        self.assertEqual(answer * b, a)
+                    index += 1
+
+    def test_sample_respects_operator(self):
+        """测试指定运算符抽题，相同种子结果相同"""
+        with QuestionBank(self.path) as bank:
+            questions = [bank.sample(random.Random(5), '/') for _ in range(3)]
+            self.assertEqual(questions[0], questions[1])
+            rng = random.Random(0)
+            for _ in range(200):
+                q = bank.sample(rng, '-')
+                self.assertEqual(q['operator'], '-')
+                self.assertEqual(q['answer'], q['a'] - q['b'])
+            with self.assertRaises(ValueError):
+                bank.sample(rng, '%')
+
+    def test_rejects_invalid_files(self):
+        """测试损坏或不完整的文件无法打开"""
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        broken = os.path.join(self.directory.name, 'broken.qbank')
+        for content in (b'XXXX' + data[4:], data[:-1]):
+            with open(broken, 'wb') as f:
+                f.write(content)
+            with self.assertRaises(ValueError):
+                QuestionBank(broken)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "需要 NumPy")
+    def test_as_array_shares_memory(self):
+        """测试 NumPy 视图直接读取映射的记录"""
+        with QuestionBank(self.path) as bank:
+            records = bank.as_array('*')
+            self.assertEqual(len(records), bank.count('*'))
+            self.assertTrue((records['a'] * records['b'] == records['answer']).all())
+            self.assertFalse(records.flags.writeable)
+            del records
+
+
+if __name__ == '__main__':
+    unittest.main()
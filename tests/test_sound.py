@@ -0,0 +1,83 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import wave
+
+from ui.sound import NullBackend, SoundPlayer, load_wav, tone
+
+
+class RecordingBackend(NullBackend):
+    """记录每次播放开始和结束的空后端"""
+
+    def __init__(self):
+        self.events = []
+        self.finished = threading.Semaphore(0)
+
+    def play(self, clip, interrupt, started):
+        self.events.append(('start', clip.duration))
+        super().play(clip, interrupt, started)
+        self.events.append(('end', interrupt.is_set()))
+        self.finished.release()
+
+
+class TestSound(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sound_dir = self.directory.name
+        for name, frequency, duration in (('correct', 880, 0.05), ('wrong', 220, 5.0)):
+            clip = tone(frequency, duration)
+            with wave.open(os.path.join(self.sound_dir, f"{name}.wav"), 'wb') as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(clip.framerate)
+                f.writeframes(clip.frames)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_load_wav_decodes_once(self):
+        """测试 WAV 解码后时长和 WAV 字节正确"""
+        clip = load_wav(os.path.join(self.sound_dir, 'correct.wav'))
+        self.assertAlmostEqual(clip.duration, 0.05, places=3)
+        self.assertEqual(clip.wav[:4], b'RIFF')
+        self.assertIs(clip.wav, clip.wav)
+
+    def test_invalid_file_falls_back_to_tone(self):
+        """测试占位的无效音效文件改用合成提示音，未知名称不加载"""
+        with open(os.path.join(self.sound_dir, 'wrong.wav'), 'wb') as f:
+            f.write("此为错误提示音占位文件".encode('utf-8'))
+        player = SoundPlayer(self.sound_dir, names=('wrong', 'missing'), backend=NullBackend())
+        try:
+            self.assertGreater(player.clips['wrong'].duration, 0)
+            self.assertIsNone(player.clips['missing'])
+            player.play('missing')  # 忽略
+        finally:
+            player.close()
+
+    def test_new_sound_interrupts_old(self):
+        """测试新的音效打断正在播放的旧音效，play() 立即返回"""
+        backend = RecordingBackend()
+        player = SoundPlayer(self.sound_dir, backend=backend)
+        try:
+            player.play('wrong')  # 5 秒
+            time.sleep(0.05)
+            start = time.perf_counter()
+            player.play('correct')
+            self.assertLess(time.perf_counter() - start, 0.05)
+            for _ in range(2):
+                self.assertTrue(backend.finished.acquire(timeout=2))
+            self.assertEqual([event[0] for event in backend.events], ['start', 'end', 'start', 'end'])
+            self.assertTrue(backend.events[1][1])    # 旧音效被打断
+            self.assertFalse(backend.events[3][1])   # 新音效完整播放
+            stats = player.latency_stats()
+            self.assertEqual(stats['plays'], 2)
+            self.assertLess(stats['max_ms'], 1000)
+        finally:
+            player.close()
+        self.assertFalse(player._thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
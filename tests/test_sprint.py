@@ -0,0 +1,68 @@
+import unittest
+
+from core.sprint import Sprint
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSprint(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sprint = Sprint(60, clock=self.clock)
+
+    def test_latency_runs_from_previous_correct_answer(self):
+        """测试每题用时从上一次答对算起，答错时继续计时"""
+        self.sprint.start()
+        self.clock.now += 2.0
+        self.assertAlmostEqual(self.sprint.answer(True), 2.0)
+        self.clock.now += 1.0
+        self.assertAlmostEqual(self.sprint.answer(False), 1.0)
+        self.clock.now += 1.5
+        self.assertAlmostEqual(self.sprint.answer(True), 2.5)
+        stats = self.sprint.stats()
+        self.assertEqual((stats['correct'], stats['attempts']), (2, 3))
+        self.assertAlmostEqual(stats['mean'], 2.25)
+        self.assertAlmostEqual(stats['qpm'], 2 * 60 / 4.5)
+
+    def test_running_percentiles(self):
+        """测试用时分位数随作答更新，误差在分桶精度以内"""
+        self.sprint.start()
+        for i in range(50):
+            self.clock.now += 0.5 if i % 10 else 3.0
+            self.sprint.answer(True)
+            if i == 0:
+                self.assertAlmostEqual(self.sprint.stats()['p50'], 3.0, delta=0.3)
+        stats = self.sprint.stats()
+        self.assertAlmostEqual(stats['p50'], 0.5, delta=0.05)
+        self.assertAlmostEqual(stats['p99'], 3.0, delta=0.3)
+
+    def test_time_limit(self):
+        """测试时间到后不再接受作答，每分钟题数按冲刺时长计算"""
+        self.sprint.start()
+        for _ in range(30):
+            self.clock.now += 1.0
+            self.sprint.answer(True)
+        self.clock.now += 45.0
+        self.assertTrue(self.sprint.finished)
+        self.assertEqual(self.sprint.remaining(), 0)
+        self.assertAlmostEqual(self.sprint.questions_per_minute(), 30.0)
+        with self.assertRaises(RuntimeError):
+            self.sprint.answer(True)
+
+    def test_not_started(self):
+        """测试开始前作答报错，时长必须为正"""
+        self.assertFalse(self.sprint.finished)
+        with self.assertRaises(RuntimeError):
+            self.sprint.answer(True)
+        with self.assertRaises(ValueError):
+            Sprint(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
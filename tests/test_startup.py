@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from benchmarks.bench_startup import LAZY_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup(unittest.TestCase):
+    def _loaded_after(self, statement):
+        code = f"import sys\n{statement}\nprint(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+
+    def test_core_has_no_gui_dependencies(self):
+        """测试导入 core 不会加载 tkinter、PIL 和 NumPy"""
+        self.assertEqual(self._loaded_after(
+            "import core.generator, core.evaluator, core.adaptive, core.permutation, core.data_handler"), "")
+
+    def test_main_imports_ui_lazily(self):
+        """测试导入 main 和解析命令行参数时不加载界面"""
+        self.assertEqual(self._loaded_after("import main"), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from core.telemetry import RECORD, AttemptRecorder, read_attempts
+
+
+class TestTelemetry(unittest.TestCase):
+    def test_record_and_read(self):
+        """测试作答记录按批写盘并能完整读回"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'attempts.bin')
+            recorder = AttemptRecorder(path, batch_size=4)
+            for i in range(10):
+                recorder.record(i, '*', 7, i * 7, i % 3 != 0, 1.25 + i)
+            recorder.close()
+
+            self.assertEqual(os.path.getsize(path), 10 * RECORD.size)
+            attempts = list(read_attempts(path))
+            self.assertEqual(len(attempts), 10)
+            self.assertEqual(attempts[3].a, 3)
+            self.assertEqual(attempts[3].operator, '*')
+            self.assertEqual(attempts[3].answer, 21)
+            self.assertFalse(attempts[3].correct)
+            self.assertAlmostEqual(attempts[3].latency, 4.25)
+
+    def test_out_of_range_values_are_skipped(self):
+        """测试超出 32 位整数的题目不写入记录，也不抛出异常"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'attempts.bin')
+            recorder = AttemptRecorder(path)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                self.assertFalse(recorder.record(100000, '*', 100000, 10 ** 10, True, 2.0))
+            self.assertIn('[警告]', output.getvalue())
+            self.assertTrue(recorder.record(3, '+', 4, 7, True, -0.5))
+            recorder.close()
+            attempts = list(read_attempts(path))
+            self.assertEqual([(a.a, a.b, a.latency) for a in attempts], [(3, 4, 0.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
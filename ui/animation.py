@@ -0,0 +1,152 @@
+import math
+import time
+from collections import deque
+
+# 关键帧类型 -> 应用到控件上的方法名
+_APPLY = {
+    'config': 'configure',
+    'place': 'place_configure',
+}
+
+
+class _Track:
+    __slots__ = ('start', 'frames', 'next', 'visual')
+
+    def __init__(self, start, frames):
+        self.start = start
+        self.frames = sorted(frames, key=lambda frame: frame[0])
+        self.next = 0
+        # 只有回调的轨道（延时操作）不需要逐帧节拍
+        self.visual = any(frame[2] != 'call' for frame in self.frames)
+
+    def due(self):
+        """下一个关键帧的预定时间，没有剩余关键帧时为开始时间"""
+        if self.next < len(self.frames):
+            return self.start + self.frames[self.next][0]
+        return self.start
+
+
+class Animator:
+    """单一节拍驱动的动画调度器
+
+    所有动画和延时回调都由同一个 after() 节拍推进，没有动画时节拍停止；
+    只剩延时回调时不逐帧运行，只在最早的回调到期时唤醒一次。
+    动画是按时间排列的关键帧 (秒, 控件, 类型, 属性)，类型为 'config'、'place'
+    或 'call'（属性为回调函数）。每个节拍：
+      - 只应用已经到时间的关键帧，节拍来晚时直接跳到最新状态，不补画中间帧；
+      - 同一控件同一类型的属性改动合并成一次 configure 调用；
+      - 记录节拍实际到达时间比预定时间晚了多少（事件循环延迟）。
+    同名动画再次启动或 cancel() 时，未执行的关键帧被丢弃。
+    """
+
+    def __init__(self, master, fps=60, clock=time.monotonic, lag_window=512):
+        self.master = master
+        self.interval = max(1, round(1000 / fps))
+        self.clock = clock
+        self._tracks = {}
+        self._after_id = None
+        self._due = 0.0
+        self.lags = deque(maxlen=lag_window)  # 最近若干个节拍的延迟（秒）
+        self.max_lag = 0.0
+
+    def play(self, name, frames):
+        """启动名为 name 的动画，同名的旧动画直接丢弃"""
+        self._tracks[name] = _Track(self.clock(), frames)
+        self._ensure_tick()
+
+    def schedule(self, name, delay, callback):
+        """delay 秒后调用 callback，可以按名称取消"""
+        self.play(name, [(delay, None, 'call', callback)])
+
+    def active(self, name):
+        return name in self._tracks
+
+    def cancel(self, name, finish=False):
+        """取消动画；finish 为 True 时立即应用剩余的属性改动（不执行回调），
+        让控件回到动画结束时的状态"""
+        track = self._tracks.pop(name, None)
+        if track is not None and finish:
+            self._apply(self._merge(track.frames[track.next:], calls=None))
+
+    def cancel_all(self, finish=False):
+        for name in list(self._tracks):
+            self.cancel(name, finish)
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+    def lag_stats(self):
+        """返回 {'ticks', 'mean_ms', 'p99_ms', 'max_ms'}，统计最近的节拍延迟"""
+        lags = sorted(self.lags)
+        if not lags:
+            return {'ticks': 0, 'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'ticks': len(lags),
+            'mean_ms': sum(lags) / len(lags) * 1000,
+            'p99_ms': lags[min(len(lags) - 1, int(0.99 * len(lags)))] * 1000,
+            'max_ms': self.max_lag * 1000,
+        }
+
+    def _ensure_tick(self):
+        now = self.clock()
+        if any(track.visual for track in self._tracks.values()):
+            due, delay = now + self.interval / 1000, self.interval
+        else:
+            due = min(track.due() for track in self._tracks.values())
+            delay = max(0, math.ceil((due - now) * 1000))
+        if self._after_id is not None:
+            if self._due <= due:
+                return
+            # 新的动画或回调比已安排的唤醒更早
+            self.master.after_cancel(self._after_id)
+        self._due = due
+        self._after_id = self.master.after(delay, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        now = self.clock()
+        lag = max(0.0, now - self._due)
+        self.lags.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+
+        due, calls = [], []
+        for name, track in list(self._tracks.items()):
+            elapsed = now - track.start
+            frames = track.frames
+            end = track.next
+            while end < len(frames) and frames[end][0] <= elapsed:
+                end += 1
+            due.extend(frames[track.next:end])
+            track.next = end
+            if end == len(frames):
+                del self._tracks[name]
+        self._apply(self._merge(due, calls))
+        # 回调最后执行，它们可能启动新的动画
+        for callback in calls:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[错误] 动画回调出错: {e}")
+
+        if self._tracks:
+            self._ensure_tick()
+
+    @staticmethod
+    def _merge(frames, calls):
+        """把关键帧合并成 {(控件, 类型): 属性}，回调追加到 calls（为 None 时忽略）"""
+        merged = {}
+        for _, widget, kind, options in frames:
+            if kind == 'call':
+                if calls is not None:
+                    calls.append(options)
+            else:
+                merged.setdefault((widget, kind), {}).update(options)
+        return merged
+
+    @staticmethod
+    def _apply(merged):
+        for (widget, kind), options in merged.items():
+            try:
+                getattr(widget, _APPLY[kind])(**options)
+            except Exception as e:  # 控件可能已经销毁
+                print(f"[错误] 动画效果出错: {e}")
@@ -0,0 +1,91 @@
+import os
+import tkinter as tk
+from importlib.util import find_spec
+
+# Pillow 只在缓存未命中、需要缩放图片时才导入
+PIL_AVAILABLE = find_spec('PIL') is not None
+
+
+def _pil():
+    from PIL import Image, ImageTk
+    return Image, ImageTk
+
+
+class AssetCache:
+    """图片资源缓存
+
+    - 缩放后的图片按 (源文件修改时间, 目标尺寸) 保存到磁盘缓存目录，
+      命中时由 Tk 直接读取小尺寸 PNG，不需要 PIL 解码和 LANCZOS 缩放；
+    - 同一进程中每个源文件最多解码一次，不同尺寸共用解码结果；
+    - PhotoImage 在第一次 get() 时才创建。
+    """
+
+    def __init__(self, master, image_dir, cache_dir):
+        self.master = master
+        self.image_dir = image_dir
+        self.cache_dir = cache_dir
+        self._sources = {}  # 源文件名 -> 已解码的 PIL Image
+        self._photos = {}   # (源文件名, 尺寸) -> PhotoImage
+
+    def get(self, filename, size):
+        """返回 filename 缩放到 size 后的 PhotoImage，加载失败返回 None"""
+        key = (filename, size)
+        if key not in self._photos:
+            try:
+                self._photos[key] = self._load(filename, size)
+                print(f"[调试信息] 成功加载图片: {filename} {size[0]}x{size[1]}")
+            except Exception as e:
+                print(f"[错误] 加载图片失败 '{filename}': {e}")
+                self._photos[key] = None
+        return self._photos[key]
+
+    def _cache_path(self, filename, size):
+        mtime = os.stat(os.path.join(self.image_dir, filename)).st_mtime_ns
+        stem = os.path.splitext(filename)[0]
+        return os.path.join(self.cache_dir, f"{stem}-{size[0]}x{size[1]}-{mtime:x}.png")
+
+    def _load(self, filename, size):
+        cache_path = self._cache_path(filename, size)
+        if os.path.exists(cache_path):
+            try:
+                # Tk 8.6 可以直接读取 PNG
+                return tk.PhotoImage(master=self.master, file=cache_path)
+            except tk.TclError:
+                if PIL_AVAILABLE:
+                    Image, ImageTk = _pil()
+                    return ImageTk.PhotoImage(Image.open(cache_path), master=self.master)
+                raise
+
+        if not PIL_AVAILABLE:
+            raise RuntimeError("Pillow 未安装，无法缩放图片")
+        Image, ImageTk = _pil()
+        image = self._source(filename).resize(size, Image.Resampling.LANCZOS)
+        self._store(image, cache_path)
+        return ImageTk.PhotoImage(image, master=self.master)
+
+    def _source(self, filename):
+        image = self._sources.get(filename)
+        if image is None:
+            Image, _ = _pil()
+            image = Image.open(os.path.join(self.image_dir, filename))
+            image.load()
+            self._sources[filename] = image
+        return image
+
+    def _store(self, image, cache_path):
+        """写入磁盘缓存，并删除同一图片同一尺寸的旧版本"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            prefix = os.path.basename(cache_path).rsplit('-', 1)[0] + '-'
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(prefix):
+                    os.remove(os.path.join(self.cache_dir, name))
+            tmp_path = f"{cache_path}.tmp"
+            image.save(tmp_path, format='PNG', compress_level=1)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"[警告] 写入图片缓存失败: {e}")
+
+    def release_sources(self):
+        """释放已解码的源图片（全部尺寸都已生成后可调用以节省内存）"""
+        self._sources.clear()
@@ -0,0 +1,275 @@
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+
+# 名次前三的奖牌和底色
+MEDALS = {0: ("🥇", "#FFD700"), 1: ("🥈", "#C0C0C0"), 2: ("🥉", "#CD7F32")}
+
+LEADERBOARD_COLUMNS = (("名次", 90), ("名字", 150), ("分数", 80), ("日期", 110))
+HISTORY_COLUMNS = (("日期", 110), ("名字", 110), ("难度", 60), ("题数", 60), ("正确", 60), ("用时", 80))
+
+
+class PagedRows:
+    """按页读取并缓存的表格数据
+
+    fetch(start, stop) 返回这一段的行（每行是各列文本组成的元组）；
+    只缓存最近的 max_pages 页，滚动时不会一次读入全部数据。
+    """
+
+    def __init__(self, columns, count, fetch, page_size=200, max_pages=32,
+                 empty_text="没有记录", highlight_top=False):
+        self.columns = columns
+        self.empty_text = empty_text
+        self.highlight_top = highlight_top
+        self._count = count
+        self._fetch = fetch
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+
+    def __len__(self):
+        return self._count
+
+    def rows(self, start, stop):
+        stop = min(stop, self._count)
+        result = []
+        position = max(start, 0)
+        while position < stop:
+            page, skip = divmod(position, self.page_size)
+            rows = self._page(page)
+            take = min(stop - position, len(rows) - skip)
+            if take <= 0:
+                break
+            result.extend(rows[skip:skip + take])
+            position += take
+        return result
+
+    def _page(self, page):
+        rows = self._pages.get(page)
+        if rows is None:
+            start = page * self.page_size
+            rows = self._fetch(start, min(start + self.page_size, self._count))
+            self._pages[page] = rows
+            if len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page)
+        return rows
+
+
+def leaderboard_rows(leaderboard, difficulty=None, period='all'):
+    """排行榜的完整榜单"""
+    leaderboard.refresh()  # 读入其他实例写入的成绩
+    entries = leaderboard.ranked(difficulty, period)
+
+    def fetch(start, stop):
+        rows = []
+        for index in range(start, stop):
+            entry = entries[index]
+            medal = MEDALS.get(index, ("🎖️",))[0]
+            rows.append((f"{medal} 第 {index + 1} 名", entry['name'] or '匿名',
+                         f"{entry['score']}分", entry.get('date') or ''))
+        return rows
+
+    return PagedRows(LEADERBOARD_COLUMNS, len(entries), fetch, highlight_top=True,
+                     empty_text="排行榜为空！\n开始挑战以创造记录吧！")
+
+
+def history_rows(store, user=None):
+    """练习记录，最新的在前；每页单独查询 SQLite"""
+    def fetch(start, stop):
+        return [(r['date'], r['user'] or '匿名', str(r['difficulty']), str(r['total']),
+                 str(r['correct']), f"{r['time_used']:.1f}秒")
+                for r in store.sessions(user=user, limit=stop - start, offset=start, newest_first=True)]
+
+    return PagedRows(HISTORY_COLUMNS, store.count(), fetch, empty_text="还没有练习记录")
+
+
+class LeaderboardView:
+    """可复用的排行榜 / 练习记录窗口
+
+    窗口只创建一次，关闭时隐藏；表格画在 Canvas 上，只为可见的行创建图元，
+    滚动时复用这些图元并只读取可见范围的数据，一万行以上也能流畅滚动。
+    boards 是 {榜单名: factory(筛选项) -> PagedRows}，filters 是筛选项列表（例如难度）。
+    """
+
+    def __init__(self, master, boards, filters=("全部",), title="排行榜", row_height=32,
+                 bg_color="#F0F4C3", text_color="#33691E"):
+        self.master = master
+        self.boards = boards
+        self.filters = list(filters)
+        self.title = title
+        self.row_height = row_height
+        self.bg_color = bg_color
+        self.text_color = text_color
+        self.rows = None
+        self.offset = 0
+        self.window = None
+        self._slots = []
+        self._redraw_pending = False
+
+    # ---- 窗口 ----
+
+    def open(self, board=None, option=None):
+        """显示窗口（不是模态窗口，不会阻塞主界面）并刷新数据"""
+        if self.window is None:
+            self._build()
+        if board is not None:
+            self.board_var.set(board)
+        if option is not None and option in self.filters:
+            self.filter_var.set(option)
+        self.reload()
+        self.window.deiconify()
+        self.window.lift()
+        self.canvas.focus_set()
+
+    def close(self):
+        if self.window is not None:
+            self.window.withdraw()
+
+    def reload(self):
+        board = self.board_var.get()
+        self.rows = self.boards[board](self.filter_var.get())
+        self.window.title(f"{self.title} - {board} - {self.filter_var.get()}")
+        self.offset = 0
+        self._draw_header()
+        self._create_slots()
+        self._schedule_redraw()
+
+    def _build(self):
+        self.window = tk.Toplevel(self.master)
+        self.window.geometry("560x480")
+        self.window.minsize(420, 240)
+        self.window.configure(bg=self.bg_color)
+        self.window.transient(self.master)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = ttk.Frame(self.window, style="TFrame")
+        controls.pack(fill=tk.X, padx=10, pady=(10, 5))
+        self.board_var = tk.StringVar(value=next(iter(self.boards)))
+        self.filter_var = tk.StringVar(value=self.filters[0])
+        for variable, values in ((self.board_var, list(self.boards)), (self.filter_var, self.filters)):
+            box = ttk.Combobox(controls, textvariable=variable, values=values, state="readonly", width=10)
+            box.pack(side=tk.LEFT, padx=(0, 10))
+            box.bind("<<ComboboxSelected>>", lambda event: self.reload())
+        ttk.Button(controls, text="关闭", command=self.close, style="Primary.TButton").pack(side=tk.RIGHT)
+
+        body = tk.Frame(self.window, bg=self.bg_color)
+        body.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.header = tk.Canvas(body, height=self.row_height, bg=self.bg_color, highlightthickness=0)
+        self.header.pack(side=tk.TOP, fill=tk.X)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(body, bg=self.bg_color, highlightthickness=0, takefocus=1)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._empty_item = self.canvas.create_text(
+            0, 0, text="", font=("Segoe UI", 14, "bold"), fill=self.text_color, justify=tk.CENTER)
+
+        self.canvas.bind("<Configure>", lambda event: (self._create_slots(), self._schedule_redraw()))
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll_rows(-3 if event.delta > 0 else 3))
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_rows(3))
+        self.canvas.bind("<Up>", lambda event: self.scroll_rows(-1))
+        self.canvas.bind("<Down>", lambda event: self.scroll_rows(1))
+        self.canvas.bind("<Prior>", lambda event: self.scroll_pages(-1))
+        self.canvas.bind("<Next>", lambda event: self.scroll_pages(1))
+        self.canvas.bind("<Home>", lambda event: self.scroll_to(0))
+        self.canvas.bind("<End>", lambda event: self.scroll_to(self._content_height()))
+
+    # ---- 滚动 ----
+
+    def _content_height(self):
+        return len(self.rows) * self.row_height if self.rows is not None else 0
+
+    def scroll_to(self, offset):
+        visible = max(self.canvas.winfo_height(), 1)
+        self.offset = int(max(0, min(offset, self._content_height() - visible)))
+        self._schedule_redraw()
+
+    def scroll_rows(self, count):
+        self.scroll_to(self.offset + count * self.row_height)
+
+    def scroll_pages(self, count):
+        self.scroll_to(self.offset + count * (self.canvas.winfo_height() - self.row_height))
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self.scroll_to(float(value) * self._content_height())
+        elif unit == 'pages':
+            self.scroll_pages(int(value))
+        else:
+            self.scroll_rows(int(value))
+
+    # ---- 绘制 ----
+
+    def _column_positions(self):
+        x, positions = 10, []
+        for _, width in self.rows.columns:
+            positions.append(x)
+            x += width
+        return positions
+
+    def _draw_header(self):
+        self.header.delete("all")
+        for x, (title, _) in zip(self._column_positions(), self.rows.columns):
+            self.header.create_text(x, self.row_height // 2, text=title, anchor=tk.W,
+                                    font=("Segoe UI", 12, "bold"), fill=self.text_color)
+
+    def _create_slots(self):
+        """按可见高度准备一组行图元，滚动时只修改它们的文本和位置"""
+        if self.rows is None:
+            return
+        needed = self.canvas.winfo_height() // self.row_height + 2
+        columns = len(self.rows.columns)
+        if len(self._slots) == needed and self._slots and len(self._slots[0][1]) == columns:
+            return
+        for rect, texts in self._slots:
+            self.canvas.delete(rect, *texts)
+        self._slots = []
+        for _ in range(needed):
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, outline="", state=tk.HIDDEN)
+            texts = [self.canvas.create_text(0, 0, anchor=tk.W, font=("Segoe UI", 12),
+                                             fill=self.text_color, state=tk.HIDDEN)
+                     for _ in range(columns)]
+            self._slots.append((rect, texts))
+
+    def _schedule_redraw(self):
+        # 同一轮事件中的多次滚动只重绘一次
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.canvas.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        canvas, height = self.canvas, self.row_height
+        width = canvas.winfo_width()
+        total = self._content_height()
+        self.offset = max(0, min(self.offset, total - canvas.winfo_height()))
+        first, shift = divmod(self.offset, height)
+        data = self.rows.rows(first, first + len(self._slots))
+        positions = self._column_positions()
+
+        for i, (rect, texts) in enumerate(self._slots):
+            if i >= len(data):
+                canvas.itemconfigure(rect, state=tk.HIDDEN)
+                for item in texts:
+                    canvas.itemconfigure(item, state=tk.HIDDEN)
+                continue
+            index = first + i
+            top = i * height - shift
+            if self.rows.highlight_top and index in MEDALS:
+                fill = MEDALS[index][1]
+            else:
+                fill = self.bg_color if index % 2 else "#F9FBE7"
+            canvas.coords(rect, 0, top, width, top + height)
+            canvas.itemconfigure(rect, fill=fill, state=tk.NORMAL)
+            for item, x, value in zip(texts, positions, data[i]):
+                canvas.coords(item, x, top + height // 2)
+                canvas.itemconfigure(item, text=value, state=tk.NORMAL)
+
+        canvas.coords(self._empty_item, width // 2, canvas.winfo_height() // 2)
+        canvas.itemconfigure(self._empty_item, text="" if len(self.rows) else self.rows.empty_text)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + canvas.winfo_height()) / total)
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,249 @@
+"""答题反馈音效
+
+WAV 文件在启动时用 wave 模块解码一次，之后只在内存中播放；播放在专用的后台线程中
+进行，Tk 主循环从不等待音频。新的音效到来时立即打断正在播放的旧音效。
+
+输出后端可以替换：
+    null      不输出声音，只按音效时长模拟播放（没有声卡的机器、测试和延迟测量）
+    winsound  Windows 自带
+    aplay     Linux (alsa-utils)
+默认按 winsound -> aplay -> null 的顺序选择可用的后端，也可以用环境变量
+RJGC_SOUND 指定。
+"""
+import io
+import math
+import os
+import shutil
+import struct
+import subprocess
+import threading
+import time
+import wave
+from collections import deque
+from importlib.util import find_spec
+
+WINSOUND_AVAILABLE = find_spec('winsound') is not None
+APLAY_AVAILABLE = shutil.which('aplay') is not None
+
+# 音效文件无效时（例如占位文件）改用合成的提示音：(频率 Hz, 时长 秒)
+FALLBACK_TONES = {
+    'correct': (880.0, 0.12),
+    'wrong': (220.0, 0.25),
+}
+
+
+class Clip:
+    """解码后的 PCM 音频"""
+
+    def __init__(self, frames, channels, sampwidth, framerate):
+        self.frames = frames
+        self.channels = channels
+        self.sampwidth = sampwidth
+        self.framerate = framerate
+        self.duration = len(frames) / (channels * sampwidth * framerate)
+        self._wav = None
+
+    @property
+    def wav(self):
+        """完整的 WAV 文件字节，供需要 WAV 格式的后端使用"""
+        if self._wav is None:
+            buffer = io.BytesIO()
+            with wave.open(buffer, 'wb') as f:
+                f.setnchannels(self.channels)
+                f.setsampwidth(self.sampwidth)
+                f.setframerate(self.framerate)
+                f.writeframes(self.frames)
+            self._wav = buffer.getvalue()
+        return self._wav
+
+
+def load_wav(path):
+    """解码 WAV 文件，格式无效时抛出 wave.Error 或 EOFError"""
+    with wave.open(path, 'rb') as f:
+        return Clip(f.readframes(f.getnframes()), f.getnchannels(), f.getsampwidth(), f.getframerate())
+
+
+def tone(frequency, duration, framerate=22050, volume=0.3):
+    """合成 16 位单声道正弦提示音，首尾各 5 毫秒淡入淡出避免爆音"""
+    count = int(duration * framerate)
+    fade = max(1, int(0.005 * framerate))
+    amplitude = volume * 32767
+    samples = (int(amplitude * min(1.0, i / fade, (count - i) / fade)
+                   * math.sin(2 * math.pi * frequency * i / framerate)) for i in range(count))
+    return Clip(struct.pack(f'<{count}h', *samples), 1, 2, framerate)
+
+
+class NullBackend:
+    """不输出声音，等待音效时长后返回（可被打断）"""
+    name = 'null'
+
+    def play(self, clip, interrupt, started):
+        started()
+        interrupt.wait(clip.duration)
+
+    def stop(self):
+        pass
+
+
+class WinsoundBackend:
+    name = 'winsound'
+
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+
+    def play(self, clip, interrupt, started):
+        started()
+        # SND_MEMORY 只能同步播放，其他线程调用 stop() 时返回
+        self._winsound.PlaySound(clip.wav, self._winsound.SND_MEMORY | self._winsound.SND_NODEFAULT)
+
+    def stop(self):
+        self._winsound.PlaySound(None, 0)
+
+
+class AplayBackend:
+    name = 'aplay'
+
+    def play(self, clip, interrupt, started):
+        process = subprocess.Popen(['aplay', '-q', '-'], stdin=subprocess.PIPE,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        started()
+        # 由单独的线程写入数据，管道写满时不会卡住打断检查
+        threading.Thread(target=self._feed, args=(process, clip.wav), daemon=True).start()
+        while process.poll() is None:
+            if interrupt.wait(0.005):
+                process.kill()
+                break
+        process.wait()
+
+    @staticmethod
+    def _feed(process, data):
+        try:
+            process.stdin.write(data)
+            process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def stop(self):
+        pass
+
+
+BACKENDS = {
+    'null': NullBackend,
+    'winsound': WinsoundBackend,
+    'aplay': AplayBackend,
+}
+
+
+def default_backend():
+    """按环境变量 RJGC_SOUND 或可用性选择后端"""
+    name = os.environ.get('RJGC_SOUND')
+    if name:
+        try:
+            return BACKENDS[name]()
+        except KeyError:
+            print(f"[警告] 未知的音效后端 {name!r}，可选: {', '.join(BACKENDS)}")
+    if WINSOUND_AVAILABLE:
+        return WinsoundBackend()
+    if APLAY_AVAILABLE:
+        return AplayBackend()
+    return NullBackend()
+
+
+class SoundPlayer:
+    """在后台线程播放预先解码的音效
+
+    play() 只记录请求并打断正在播放的音效，立即返回；积压的请求只保留最新一个。
+    每次播放都记录从 play() 到后端开始输出的延迟。
+    """
+
+    def __init__(self, sound_dir, names=('correct', 'wrong'), backend=None,
+                 clock=time.monotonic, latency_window=512):
+        self.backend = backend or default_backend()
+        self.clock = clock
+        self.clips = {name: self._load(sound_dir, name) for name in names}
+        self.latencies = deque(maxlen=latency_window)  # 最近若干次播放的延迟（秒）
+        self.max_latency = 0.0
+        self.played = 0
+        self._pending = None
+        self._interrupt = threading.Event()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='sound', daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _load(sound_dir, name):
+        path = os.path.join(sound_dir, f"{name}.wav")
+        try:
+            return load_wav(path)
+        except (OSError, EOFError, wave.Error) as e:
+            if name not in FALLBACK_TONES:
+                print(f"[错误] 加载音效失败 '{path}': {e}")
+                return None
+            print(f"[警告] 音效文件无效 '{path}'，改用合成提示音: {e}")
+            return tone(*FALLBACK_TONES[name])
+
+    def play(self, name):
+        """播放音效 name，打断正在播放的音效；未知或加载失败的音效忽略"""
+        clip = self.clips.get(name)
+        if clip is None or self._closed:
+            return
+        with self._condition:
+            self._pending = (clip, self.clock())
+            self._interrupt.set()
+            # 持有锁时停止：后台线程拿到新请求之前旧音效已经停止，不会误停新音效
+            self.backend.stop()
+            self._condition.notify()
+
+    def stop(self):
+        """停止正在播放的音效，丢弃未开始的请求"""
+        with self._condition:
+            self._pending = None
+            self._interrupt.set()
+            self.backend.stop()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                clip, requested = self._pending
+                self._pending = None
+                # 新的打断标志：之后到来的 play() 只打断这一次播放
+                interrupt = self._interrupt = threading.Event()
+
+            def started(requested=requested):
+                latency = self.clock() - requested
+                self.latencies.append(latency)
+                self.max_latency = max(self.max_latency, latency)
+                self.played += 1
+
+            try:
+                self.backend.play(clip, interrupt, started)
+            except Exception as e:  # 音频设备出错不影响答题
+                print(f"[错误] 播放音效失败 ({self.backend.name}): {e}")
+
+    def latency_stats(self):
+        """返回 {'plays', 'mean_ms', 'p99_ms', 'max_ms'}，统计最近的播放延迟"""
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {'plays': 0, 'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'plays': self.played,
+            'mean_ms': sum(latencies) / len(latencies) * 1000,
+            'p99_ms': latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+            'max_ms': self.max_latency * 1000,
+        }
+
+    def close(self, timeout=1.0):
+        """停止播放并结束后台线程"""
+        with self._condition:
+            self._closed = True
+            self._pending = None
+            self._interrupt.set()
+            self.backend.stop()
+            self._condition.notify()
+        self._thread.join(timeout)
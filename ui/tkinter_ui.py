@@ -1,15 +1,38 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 import random
 import os
-import json  # Added for leaderboard
-
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    print("[警告] Pillow library not found. Images will not be loaded.")
+import time
+
+from core.evaluator import parse_answer
+from core.leaderboard import Leaderboard
+from core.prefetch import QuestionPrefetcher
+from core.profiles import get_profiles
+from core.sprint import Sprint
+from core.telemetry import AttemptRecorder
+
+from ui.animation import Animator
+from ui.assets import AssetCache, PIL_AVAILABLE
+from ui.sound import SoundPlayer
+from ui.leaderboard_view import LeaderboardView, history_rows, leaderboard_rows
+
+if not PIL_AVAILABLE:
+    print("[警告] Pillow library not found. Only cached images can be loaded.")
+
+# 答错时输入框左右抖动的幅度（像素）
+SHAKE_OFFSET = 5
+# 冲刺模式的时长（秒）和倒计时刷新间隔（秒）
+SPRINT_SECONDS = 60
+SPRINT_TICK = 0.1
+
+# 图片名称 -> (images 目录下的文件名, 显示尺寸)
+IMAGE_SPECS = {
+    "background": ("background.png", (800, 650)),
+    "start_button": ("btn_start.png", (40, 40)),
+    "submit_button": ("btn_submit.png", (40, 40)),
+    "correct_icon": ("btn_start.png", (50, 50)),    # 临时使用已有图片
+    "incorrect_icon": ("btn_submit.png", (50, 50))  # 临时使用已有图片
+}
 
 class EnhancedMathTrainerUI:
     def __init__(self, controller):
@@ -29,13 +52,37 @@ class EnhancedMathTrainerUI:
         self.input_bg_color = "#FFFFFF" # White for input field
 
         self.current_answer = None
+        self.current_question = None
+        self.question_shown_at = 0.0 # time.monotonic() when the current question appeared
         self.question_active = False # To track if a question is currently displayed
-        self.selected_difficulty = tk.StringVar(value="中等") # Default difficulty
+        # 难度名称和默认难度都来自难度配置文件
+        self.profiles = getattr(controller, 'profiles', None) or get_profiles()
+        self.selected_difficulty = tk.StringVar(value=self.profiles.default)
+        self.sprint_mode = tk.BooleanVar(value=False)
+        self.sprint = None  # 冲刺模式进行中时为 Sprint
 
         self.score = 0
         self.lives = 3
-        self.leaderboard_file = os.path.join(os.path.dirname(__file__), '..', 'config', 'leaderboard.json')
-        self.leaderboard_data = self._load_leaderboard()
+        self.attempts = 0
+        self.correct_count = 0
+        self.practice_started_at = 0.0
+        config_dir = (getattr(controller, 'config_dir', None)
+                      or os.path.join(os.path.dirname(__file__), '..', 'config'))
+        # 排行榜保存在共享的日志文件中，旧版 leaderboard.json 会在首次启动时导入
+        self.leaderboard = Leaderboard(os.path.join(config_dir, 'leaderboard.jsonl'),
+                                       legacy_path=os.path.join(config_dir, 'leaderboard.json'))
+        self.leaderboard_view = None  # 第一次打开排行榜时创建
+
+        # 后台预生成下一道题，答对后无需在主线程等待生成
+        self.prefetcher = QuestionPrefetcher(self._build_question, depth=3)
+        self.prefetcher.prime(self.selected_difficulty.get())
+        # 每次作答的用时记录，缓冲后由后台线程批量写盘
+        self.telemetry = AttemptRecorder(os.path.join(config_dir, 'attempts.bin'))
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+        # 反馈动画和延时操作共用一个节拍，新的作答到来时可以取消
+        self.animator = Animator(self.window)
+        # 反馈音效启动时解码一次，由后台线程播放，不阻塞主循环
+        self.sounds = SoundPlayer(os.path.join(os.path.dirname(__file__), 'sounds'))
 
         self._load_assets()
         self._setup_styles()
@@ -46,46 +93,32 @@ class EnhancedMathTrainerUI:
         self._create_feedback_area()
         # self._create_star_animation_canvas() # Keep the star animation # 去掉星星动画
 
+        # 启动时用到的图片都已生成，释放解码后的原尺寸图片（背景图 800x650 占用最多）；
+        # 反馈图标第一次显示时如果没有磁盘缓存，只需重新解码小的按钮图片
+        self.assets.release_sources()
+
         print("[调试信息] UI初始化完成")
         self.show_initial_message()
 
     def _load_assets(self):
-        self.images = {}
-        if not PIL_AVAILABLE:
-            messagebox.showwarning("Pillow缺失", "Python Pillow库未安装，无法加载图片资源。程序将不显示图片。")
-            return
-
         # 配置PIL日志级别以抑制libpng警告
         import logging
         pil_logger = logging.getLogger('PIL')
         pil_logger.setLevel(logging.WARNING)
 
-        # 修改图片文件名以匹配实际文件
-        # Paths are relative to the 'images' subdirectory
-        image_files = {
-            "background": "background.png", # 修改为实际存在的文件名
-            "start_button": "btn_start.png",    # 修改为实际存在的文件名
-            "submit_button": "btn_submit.png",  # 修改为实际存在的文件名
-            "correct_icon": "btn_start.png",   # 临时使用已有图片
-            "incorrect_icon": "btn_submit.png"    # 临时使用已有图片
-        }
+        # 缩放后的图片缓存在 ui/.cache 中，源图片未修改时直接读取缓存
         base_path = os.path.join(os.path.dirname(__file__), 'images')
+        cache_path = os.path.join(os.path.dirname(__file__), '.cache')
+        self.assets = AssetCache(self.window, base_path, cache_path)
+
+        # 启动时只加载马上要显示的背景和按钮图标，反馈图标第一次显示时再加载
+        if self._image("background") is None and not PIL_AVAILABLE:
+            messagebox.showwarning("Pillow缺失", "Python Pillow库未安装，无法加载图片资源。程序将不显示图片。")
 
-        for name, filename in image_files.items():
-            path = os.path.join(base_path, filename)
-            try:
-                if name == "background":
-                    img = Image.open(path)
-                    self.images[name] = ImageTk.PhotoImage(img.resize((800, 650), Image.Resampling.LANCZOS))
-                else: # Icons
-                    img = Image.open(path)
-                    # Standard icon size, adjust as needed
-                    icon_size = (40, 40) if "button" in name else (50, 50)
-                    self.images[name] = ImageTk.PhotoImage(img.resize(icon_size, Image.Resampling.LANCZOS))
-                print(f"[调试信息] 成功加载图片: {name} from {path}")
-            except Exception as e:
-                print(f"[错误] 加载图片失败 '{name}': {e}")
-                self.images[name] = None # Explicitly set to None if loading fails
+    def _image(self, name):
+        """按名称获取图片，首次使用时才加载"""
+        filename, size = IMAGE_SPECS[name]
+        return self.assets.get(filename, size)
 
     def _setup_styles(self):
         style = ttk.Style()
@@ -157,8 +190,9 @@ class EnhancedMathTrainerUI:
     def _create_main_layout(self):
         # Background Canvas (full window)
         self.background_canvas = tk.Canvas(self.window, highlightthickness=0)
-        if self.images.get("background"):
-            self.background_canvas.create_image(0, 0, image=self.images["background"], anchor='nw')
+        background = self._image("background")
+        if background:
+            self.background_canvas.create_image(0, 0, image=background, anchor='nw')
         else:
             self.background_canvas.config(bg=self.bg_color) # Fallback color
         self.background_canvas.place(x=0, y=0, relwidth=1, relheight=1)
@@ -204,7 +238,7 @@ class EnhancedMathTrainerUI:
         difficulty_frame.pack(pady=(0, 10)) # Space below difficulty selection
 
         ttk.Label(difficulty_frame, text="选择难度:", style="TLabel").pack(side=tk.LEFT, padx=(0, 5))
-        difficulty_options = ["简单", "中等", "困难"]
+        difficulty_options = list(self.profiles)
         self.difficulty_combobox = ttk.Combobox(
             difficulty_frame,
             textvariable=self.selected_difficulty,
@@ -215,10 +249,18 @@ class EnhancedMathTrainerUI:
         )
         self.difficulty_combobox.pack(side=tk.LEFT)
         self.difficulty_combobox.bind("<<ComboboxSelected>>", self._on_difficulty_change)
+        self.sprint_checkbutton = ttk.Checkbutton(difficulty_frame, text=f"冲刺模式 ({SPRINT_SECONDS}秒)",
+                                                  variable=self.sprint_mode)
+        self.sprint_checkbutton.pack(side=tk.LEFT, padx=(10, 0))
 
         # Entry field
-        self.answer_entry = ttk.Entry(input_controls_frame, width=10, style="TEntry", justify=tk.CENTER)
-        self.answer_entry.pack(pady=(0, 15)) # Space below entry
+        # 输入框放在固定大小的容器中用 place 定位，抖动时只移动输入框，不会重新布局整个界面
+        entry_holder = ttk.Frame(input_controls_frame, style="TFrame")
+        self.answer_entry = ttk.Entry(entry_holder, width=10, style="TEntry", justify=tk.CENTER)
+        entry_holder.config(width=self.answer_entry.winfo_reqwidth() + 2 * SHAKE_OFFSET,
+                            height=self.answer_entry.winfo_reqheight())
+        entry_holder.pack(pady=(0, 15)) # Space below entry
+        self.answer_entry.place(relx=0.5, x=0, y=0, anchor=tk.N)
         self.answer_entry.bind("<Return>", lambda event: self._check_answer()) # Submit on Enter
 
         # Buttons Frame (for side-by-side layout)
@@ -228,7 +270,7 @@ class EnhancedMathTrainerUI:
         self.start_btn = ttk.Button(
             buttons_frame,
             text=" 开始练习",
-            image=self.images.get("start_button"),
+            image=self._image("start_button"),
             compound=tk.LEFT,
             command=self._start_practice,
             style="Primary.TButton"
@@ -238,7 +280,7 @@ class EnhancedMathTrainerUI:
         self.submit_btn = ttk.Button(
             buttons_frame,
             text=" 提交答案",
-            image=self.images.get("submit_button"),
+            image=self._image("submit_button"),
             compound=tk.LEFT,
             command=self._check_answer,
             style="Accent.TButton"
@@ -265,142 +307,105 @@ class EnhancedMathTrainerUI:
         self.feedback_text_label.pack(fill=tk.X)
 
     def _on_difficulty_change(self, event=None):
-        print(f"[调试信息] 难度已更改为: {self.selected_difficulty.get()}")
+        difficulty = self.selected_difficulty.get()
+        print(f"[调试信息] 难度已更改为: {difficulty}")
+        self.prefetcher.flush(difficulty)
+
+    def _on_close(self):
+        lag = self.animator.lag_stats()
+        if lag['ticks']:
+            print(f"[调试信息] 事件循环延迟: 平均 {lag['mean_ms']:.1f} ms, p99 {lag['p99_ms']:.1f} ms, "
+                  f"最大 {lag['max_ms']:.1f} ms ({lag['ticks']} 个节拍)")
+        sound = self.sounds.latency_stats()
+        if sound['plays']:
+            print(f"[调试信息] 音效延迟 ({self.sounds.backend.name}): 平均 {sound['mean_ms']:.1f} ms, "
+                  f"p99 {sound['p99_ms']:.1f} ms, 最大 {sound['max_ms']:.1f} ms ({sound['plays']} 次)")
+        self.sprint = None
+        self.animator.cancel_all()
+        self.sounds.close()
+        self.prefetcher.close()
+        self.telemetry.close()
+        self.window.destroy()
 
     def _update_score_lives_labels(self):
+        if self.sprint is not None:
+            stats = self.sprint.stats()
+            self.score_label.config(text=f"答对: {stats['correct']}  每分钟: {stats['qpm']:.1f} 题")
+            self.lives_label.config(text=f"剩余: {self.sprint.remaining():.1f} 秒")
+            return
         self.score_label.config(text=f"分数: {self.score}")
         self.lives_label.config(text=f"生命: {self.lives * '❤️'}")
 
+    def _sprint_tick(self):
+        # 倒计时由动画节拍驱动，时间以 Sprint 的单调时钟为准，节拍来晚也不会多给时间
+        if self.sprint is None:
+            return
+        if self.sprint.finished:
+            self._game_over()
+            return
+        self.lives_label.config(text=f"剩余: {self.sprint.remaining():.1f} 秒")
+        self.animator.schedule('sprint_tick', SPRINT_TICK, self._sprint_tick)
+
     def _game_over(self):
         self.question_active = False
-        messagebox.showinfo("游戏结束", f"游戏结束！\n你的最终得分是: {self.score}")
-        self._add_score_to_leaderboard(self.score)
+        self.animator.cancel('sprint_tick')
+        self.telemetry.flush()
+        sprint, self.sprint = self.sprint, None
+        if hasattr(self.controller, 'save_score'):
+            if sprint is not None:
+                time_used = round(sprint.elapsed(), 1)
+            else:
+                time_used = round(time.monotonic() - self.practice_started_at, 1)
+            self.controller.save_score(self.attempts, self.correct_count, time_used,
+                                       difficulty=self.selected_difficulty.get())
+        if sprint is not None:
+            stats = sprint.stats()
+            print(f"[调试信息] 冲刺成绩: {stats}")
+            messagebox.showinfo("时间到", f"时间到！\n答对 {stats['correct']} 题，每分钟 {stats['qpm']:.1f} 题\n"
+                                          f"正确率 {stats['accuracy']:.0%}\n"
+                                          f"每题用时: 中位数 {stats['p50']:.1f} 秒，90% {stats['p90']:.1f} 秒")
+        else:
+            messagebox.showinfo("游戏结束", f"游戏结束！\n你的最终得分是: {self.score}")
+            self._add_score_to_leaderboard(self.score)
 
         # Reset UI for new game
         self.start_btn.config(state=tk.NORMAL)
         self.submit_btn.config(state=tk.DISABLED)
         self.difficulty_combobox.config(state="readonly")
+        self.sprint_checkbutton.config(state=tk.NORMAL)
+        self._update_score_lives_labels()
         self.question_label.config(text="点击开始按钮吧！")
         self.answer_entry.delete(0, tk.END)
         self.show_initial_message() # Clear feedback
 
         self._show_leaderboard_ui() # Show leaderboard after game over
 
-    def _load_leaderboard(self):
-        try:
-            if os.path.exists(self.leaderboard_file):
-                with open(self.leaderboard_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, list) and all(isinstance(x, (int, float)) for x in data):
-                        return data
-                    else:
-                        print("[警告] 排行榜文件格式不正确，将使用空排行榜。")
-                        return []
-            else:
-                os.makedirs(os.path.dirname(self.leaderboard_file), exist_ok=True)
-                return []
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"[错误] 加载排行榜失败: {e}")
-            return []
-
-    def _save_leaderboard(self):
-        try:
-            os.makedirs(os.path.dirname(self.leaderboard_file), exist_ok=True)
-            with open(self.leaderboard_file, 'w', encoding='utf-8') as f:
-                json.dump(self.leaderboard_data, f, indent=4)
-        except IOError as e:
-            print(f"[错误] 保存排行榜失败: {e}")
-
     def _add_score_to_leaderboard(self, new_score):
         if not isinstance(new_score, (int, float)):
             print(f"[警告] 无效的分数类型: {new_score}")
             return
 
-        self.leaderboard_data.append(new_score)
-        self.leaderboard_data.sort(reverse=True)
-        self.leaderboard_data = self.leaderboard_data[:3]
-        self._save_leaderboard()
+        name = (simpledialog.askstring("排行榜", "请输入你的名字：", parent=self.window) or "").strip() or "匿名"
+        try:
+            rank = self.leaderboard.add(new_score, name=name, difficulty=self.selected_difficulty.get())
+            print(f"[调试信息] {name} 的成绩 {new_score} 在当前难度排第 {rank} 名")
+        except OSError as e:
+            print(f"[错误] 保存排行榜失败: {e}")
 
     def _show_leaderboard_ui(self):
-        # 创建一个自定义的排行榜窗口，而不是使用messagebox
-        leaderboard_window = tk.Toplevel(self.window)
-        leaderboard_window.title("排行榜 - 前三名")
-        leaderboard_window.geometry("350x250")
-        leaderboard_window.resizable(False, False)
-        leaderboard_window.configure(bg="#F0F4C3")  # 淡黄色背景
-
-        # 窗口设置为模态，必须关闭此窗口才能操作主窗口
-        leaderboard_window.transient(self.window)
-        leaderboard_window.grab_set()
-
-        # 标题标签
-        title_label = ttk.Label(
-            leaderboard_window,
-            text="🏆 最高分记录 🏆",
-            style="Leaderboard.TLabel",
-            anchor=tk.CENTER
-        )
-        title_label.pack(pady=(20, 10), fill=tk.X)
-
-        # 排行榜内容
-        content_frame = ttk.Frame(leaderboard_window, style="TFrame")
-        content_frame.pack(pady=10, fill=tk.BOTH, expand=True)
-        content_frame.configure(style="TFrame")
-
-        if not self.leaderboard_data:
-            ttk.Label(
-                content_frame,
-                text="排行榜为空！\n开始挑战以创造记录吧！",
-                style="Leaderboard.TLabel",
-                anchor=tk.CENTER
-            ).pack(pady=20, fill=tk.X)
-        else:
-            for i, score in enumerate(self.leaderboard_data):
-                # 使用不同的颜色和图标来突出显示不同的排名
-                if i == 0:
-                    prefix = "🥇"  # 金牌
-                    frame_bg = "#FFD700"  # 金色
-                elif i == 1:
-                    prefix = "🥈"  # 银牌
-                    frame_bg = "#C0C0C0"  # 银色
-                elif i == 2:
-                    prefix = "🥉"  # 铜牌
-                    frame_bg = "#CD7F32"  # 铜色
-                else:
-                    prefix = "🎖️"  # 普通奖牌
-                    frame_bg = "#F0F4C3"  # 淡黄色
-
-                rank_frame = tk.Frame(content_frame, bg=frame_bg, bd=1, relief=tk.RAISED)
-                rank_frame.pack(fill=tk.X, padx=20, pady=5)
-
-                rank_label = tk.Label(
-                    rank_frame,
-                    text=f"{prefix} 第 {i+1} 名: {score}分",
-                    font=("Segoe UI", 14, "bold"),
-                    bg=frame_bg,
-                    fg="#33691E"  # 深绿色文字
-                )
-                rank_label.pack(pady=8, padx=5)
-
-        # 关闭按钮
-        close_button = ttk.Button(
-            leaderboard_window,
-            text="关闭",
-            command=leaderboard_window.destroy,
-            style="Primary.TButton"
-        )
-        close_button.pack(pady=(5, 20))
-
-        # 设置窗口在屏幕中央
-        leaderboard_window.update_idletasks()
-        width = leaderboard_window.winfo_width()
-        height = leaderboard_window.winfo_height()
-        x = (leaderboard_window.winfo_screenwidth() // 2) - (width // 2)
-        y = (leaderboard_window.winfo_screenheight() // 2) - (height // 2)
-        leaderboard_window.geometry('{}x{}+{}+{}'.format(width, height, x, y))
-
-        # 等待此窗口关闭
-        leaderboard_window.wait_window()
+        # 排行榜窗口只创建一次，之后每次打开只刷新数据；不是模态窗口，不阻塞主界面
+        if self.leaderboard_view is None:
+            def board(period):
+                return lambda option: leaderboard_rows(
+                    self.leaderboard, None if option == "全部" else option, period)
+
+            boards = {"总榜": board('all'), "本周": board('week'), "今日": board('day')}
+            data_handler = getattr(self.controller, 'data_handler', None)
+            if data_handler is not None:
+                boards["练习记录"] = lambda option: history_rows(data_handler.store)
+            self.leaderboard_view = LeaderboardView(
+                self.window, boards, filters=("全部", *self.profiles), title="🏆 排行榜")
+        self.leaderboard_view.open(option=self.selected_difficulty.get())
 
     def _clear_feedback(self):
         if self.question_active:
@@ -410,32 +415,47 @@ class EnhancedMathTrainerUI:
     def _start_practice(self):
         self.score = 0
         self.lives = 3
-        self._update_score_lives_labels()
+        self.attempts = 0
+        self.correct_count = 0
+        self.practice_started_at = time.monotonic()
+        self.animator.cancel('next_question')
+        if hasattr(self.controller, 'start_session'):
+            self.controller.start_session()
+            self.prefetcher.flush(self.selected_difficulty.get())
         self.question_active = True
         self._clear_feedback()
         self._generate_new_question()
+        if self.sprint_mode.get():
+            self.sprint = Sprint(SPRINT_SECONDS)
+            self.sprint.start()
+            self.animator.schedule('sprint_tick', SPRINT_TICK, self._sprint_tick)
+        self._update_score_lives_labels()
+        self.sprint_checkbutton.config(state=tk.DISABLED)
         self.answer_entry.delete(0, tk.END)
         self.answer_entry.focus()
         self.start_btn.config(state=tk.DISABLED)
         self.submit_btn.config(state=tk.NORMAL)
 
     def _generate_new_question(self):
-        difficulty = self.selected_difficulty.get()
-
-        if difficulty == "简单":
-            operators = ['+', '-']
-        elif difficulty == "中等":
-            operators = ['+', '-', '*']
-        else: # 困难
-            operators = ['+', '-', '*', '/']
-
-        selected_operator = random.choice(operators)
-        question_data = self.controller.generate_question(selected_operator, difficulty)
+        question_data = self.prefetcher.get(self.selected_difficulty.get())
         self.question_label.config(text=question_data['question'])
         self.current_answer = question_data['answer']
+        self.current_question = question_data
+        self.question_shown_at = time.monotonic()
+
+    def _build_question(self, difficulty):
+        # 在预生成线程中运行，不能访问任何 Tk 控件；运算符由难度配置的权重决定
+        return self.controller.generate_question(None, difficulty)
 
     def _check_answer(self):
-        if not self.question_active:
+        if not self.question_active or self.animator.active('next_question'):
+            return
+        # 上一次作答的动画还没播完时直接跳到结束状态
+        self.animator.cancel('flash', finish=True)
+        self.animator.cancel('shake', finish=True)
+        latency = time.monotonic() - self.question_shown_at
+        if self.sprint is not None and self.sprint.finished:
+            self._game_over()
             return
 
         user_input = self.answer_entry.get().strip()
@@ -445,17 +465,18 @@ class EnhancedMathTrainerUI:
             return
 
         try:
-            user_answer = float(user_input)
+            user_answer = parse_answer(user_input)  # 支持整数、分数 (3/4) 和小数
             is_correct = self.controller.check_answer(user_answer, self.current_answer)
+            if self.sprint is not None:
+                self._sprint_answer(is_correct)
+                return
+            self._record_attempt(is_correct, latency)
 
             if is_correct:
                 self.score += 10
                 self._update_score_lives_labels()
                 self.show_feedback(is_correct)
-                self.window.after(1500, lambda: [
-                    self.answer_entry.delete(0, tk.END),
-                    self._generate_new_question()
-                ])
+                self.animator.schedule('next_question', 1.5, self._advance_question)
             else:
                 self.lives -= 1
                 self._update_score_lives_labels()
@@ -468,106 +489,96 @@ class EnhancedMathTrainerUI:
 
         except ValueError:
             self.feedback_text_label.config(text="请输入有效的数字！", style="Error.Feedback.TLabel")
-            self.feedback_icon_label.config(image=self.images.get("incorrect_icon"))
+            self.feedback_icon_label.config(image=self._image("incorrect_icon"))
             self.answer_entry.delete(0, tk.END)
             self.answer_entry.focus()
-            self.window.after(3000, self._clear_feedback)
+            self.animator.schedule('clear_feedback', 3.0, self._clear_feedback)
+
+    def _sprint_answer(self, is_correct):
+        # 冲刺模式：答对立即出下一题，反馈只是不拦截输入的短动画；答错不扣生命，继续答这道题
+        try:
+            latency = self.sprint.answer(is_correct)
+        except RuntimeError:  # 解析和判题期间时间刚好到了
+            self._game_over()
+            return
+        self._record_attempt(is_correct, latency)
+        self.answer_entry.delete(0, tk.END)
+        if is_correct:
+            self.show_feedback(True, clear_after=0.8)
+            self._generate_new_question()
+        else:
+            # 不公布答案，让学生再试一次
+            self.feedback_text_label.config(text="不对哦，再试一次！", style="Error.Feedback.TLabel")
+            self.feedback_icon_label.config(image='')
+            self.sounds.play('wrong')
+            self._play_wrong_animation()
+            self.animator.schedule('clear_feedback', 0.8, self._clear_feedback)
+        self._update_score_lives_labels()
+
+    def _advance_question(self):
+        self.answer_entry.delete(0, tk.END)
+        self._generate_new_question()
+
+    def _record_attempt(self, is_correct, latency):
+        self.attempts += 1
+        if is_correct:
+            self.correct_count += 1
+        question = self.current_question
+        if question and 'a' in question:
+            self.telemetry.record(question['a'], question['operator'], question['b'],
+                                  question['answer'], is_correct, latency)
+            if hasattr(self.controller, 'record_attempt'):
+                self.controller.record_attempt(question, is_correct, latency)
 
     def show_initial_message(self):
         self.feedback_icon_label.config(image='') # Clear icon
         self.feedback_text_label.config(text="准备好了吗？点击开始按钮进行速算练习！", style="Feedback.TLabel")
 
-    def show_feedback(self, is_correct):
+    def show_feedback(self, is_correct, clear_after=3.0):
         icon = None
         if is_correct:
             self.feedback_text_label.config(text="太棒了，回答正确！", style="Correct.Feedback.TLabel")
-            icon = self.images.get("correct_icon")
+            icon = self._image("correct_icon")
+            self.sounds.play('correct')
             self._play_correct_animation()
         else:
             self.feedback_text_label.config(text=f"别灰心，正确答案是: {self.current_answer}", style="Error.Feedback.TLabel")
-            icon = self.images.get("incorrect_icon")
+            icon = self._image("incorrect_icon")
+            self.sounds.play('wrong')
             self._play_wrong_animation()
 
         if icon:
             self.feedback_icon_label.config(image=icon)
         else:
             self.feedback_icon_label.config(image='')
-            
-        self.window.update()
-        self.window.after(3000, self._clear_feedback)
+        self.animator.schedule('clear_feedback', clear_after, self._clear_feedback)
 
     def _play_correct_animation(self):
-        original_color = self.question_label_orig_fg
-        self.question_label.config(foreground=self.correct_color)
-        self.window.after(150, lambda: self.question_label.config(font=("Segoe UI", 40, "bold")))
-        self.window.after(300, lambda: self.question_label.config(font=("Segoe UI", 38, "bold")))
-        self.window.after(450, lambda: self.question_label.config(foreground=original_color))
+        label = self.question_label
+        self.animator.play('flash', [
+            (0.0, label, 'config', {'foreground': self.correct_color}),
+            (0.15, label, 'config', {'font': ("Segoe UI", 40, "bold")}),
+            (0.30, label, 'config', {'font': ("Segoe UI", 38, "bold")}),
+            (0.45, label, 'config', {'foreground': self.question_label_orig_fg}),
+        ])
 
     def _play_wrong_animation(self):
-        try:
-            has_focus = self.answer_entry == self.window.focus_get()
-            entry_x = self.answer_entry.winfo_x()
-            entry_y = self.answer_entry.winfo_y()
-            entry_width = self.answer_entry.winfo_width()
-            entry_height = self.answer_entry.winfo_height()
-
-            self.answer_entry.pack_forget()
-            self.answer_entry.place(x=entry_x, y=entry_y, width=entry_width, height=entry_height)
-
-            def animate_shake(count):
-                if count > 0:
-                    offset = 5 if count % 2 == 0 else -5
-                    self.answer_entry.place(x=entry_x + offset, y=entry_y)
-                    self.window.after(50, lambda: animate_shake(count - 1))
-                else:
-                    self.answer_entry.place_forget()
-                    self.answer_entry.pack(pady=(0,15))
-                    if has_focus:
-                        self.answer_entry.focus_set()
-
-            animate_shake(6)
-
-        except Exception as e:
-            print(f"[错误] 动画效果出错: {e}")
-            self.answer_entry.place_forget()
-            self.answer_entry.pack(pady=(0,15))
-            self.answer_entry.focus_set()
+        # 每 50 毫秒左右移动一次，最后回到原位；焦点和布局都不受影响
+        frames = [(i * 0.05, self.answer_entry, 'place', {'x': SHAKE_OFFSET if i % 2 == 0 else -SHAKE_OFFSET})
+                  for i in range(6)]
+        frames.append((0.30, self.answer_entry, 'place', {'x': 0}))
+        self.animator.play('shake', frames)
 
     def run(self):
         self.window.mainloop()
 
 # Dummy Controller for testing purposes
 class DummyController:
-    def generate_question(self, operator, difficulty="中等"): # Add difficulty parameter
-        num1, num2 = self._get_numbers_for_difficulty(operator, difficulty)
-
-        if operator == '/': # Basic division, ensure num1 is multiple of num2
-            if num2 == 0: num2 = 1
-            num1 = num2 * random.randint(1, difficulty_settings[difficulty]['div_multiplier_max'])
-        elif operator == '-': # Ensure positive result for simplicity
-            if num1 < num2:
-                num1, num2 = num2, num1
-
-        question = f"{num1} {operator} {num2} = ?"
-        answer = eval(str(num1) + operator + str(num2))
-        if operator == '/':
-            answer = int(answer)
-        return {'question': question, 'answer': answer}
-
-    def _get_numbers_for_difficulty(self, operator, difficulty):
-        config = difficulty_settings.get(difficulty, difficulty_settings["中等"])
-
-        if operator == '*':
-            num1 = random.randint(config['mult_min'], config['mult_max'])
-            num2 = random.randint(config['mult_min'], config['mult_max'])
-        elif operator == '/':
-            num1 = random.randint(config['add_sub_min'], config['add_sub_max'])
-            num2 = random.randint(config['div_divisor_min'], config['div_divisor_max'])
-            if num2 == 0: num2 = 1
-        else:
-            num1 = random.randint(config['add_sub_min'], config['add_sub_max'])
-            num2 = random.randint(config['add_sub_min'], config['add_sub_max'])
-        return num1, num2
+    def __init__(self):
+        self.profiles = get_profiles()
+
+    def generate_question(self, operator=None, difficulty=None):
+        return self.profiles.get(difficulty).sample(random, operator)
 
     def check_answer(self, user_answer, correct_answer):
         try:
@@ -575,28 +586,6 @@ class DummyController:
         except ValueError:
             return False
 
-# Difficulty settings
-difficulty_settings = {
-    "简单": {
-        "add_sub_min": 1, "add_sub_max": 10,
-        "mult_min": 1, "mult_max": 5,
-        "div_divisor_min": 1, "div_divisor_max": 5, "div_multiplier_max": 5,
-        "operators": ['+', '-']
-    },
-    "中等": {
-        "add_sub_min": 1, "add_sub_max": 50,
-        "mult_min": 1, "mult_max": 12,
-        "div_divisor_min": 1, "div_divisor_max": 10, "div_multiplier_max": 10,
-        "operators": ['+', '-', '*']
-    },
-    "困难": {
-        "add_sub_min": 1, "add_sub_max": 100,
-        "mult_min": 1, "mult_max": 20,
-        "div_divisor_min": 2, "div_divisor_max": 12, "div_multiplier_max": 12,
-        "operators": ['+', '-', '*', '/']
-    }
-}
-
 if __name__ == '__main__':
     if not PIL_AVAILABLE:
         print("---------------------------------------------------------")